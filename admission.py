@@ -0,0 +1,168 @@
+# admission.py (Request admission control shared by /agent and /mcp endpoints)
+
+import asyncio
+import math
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import HTTPException
+from config import settings
+
+
+class AdmissionRejected(HTTPException):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)})
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class AdmissionController:
+    """
+    Caps concurrent agent runs globally and per session. Requests over the cap wait
+    in a bounded FIFO queue up to `queue_timeout` seconds; when the queue is full or
+    the wait expires they are rejected right away with a Retry-After hint.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = settings.ADMISSION_MAX_CONCURRENT,
+        max_per_session: int = settings.ADMISSION_MAX_PER_SESSION,
+        max_queue: int = settings.ADMISSION_MAX_QUEUE,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_session = max_per_session
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters = deque()
+        self._sessions = Counter()
+        self._wait_times = deque(maxlen=1024)
+        self._service_time = 1.0  # EWMA of seconds a request holds its slot
+        self.counters = {
+            "admitted": 0, "queued": 0, "rejected_queue_full": 0,
+            "rejected_timeout": 0, "rejected_session": 0, "max_queue_depth": 0,
+        }
+
+    def _retry_after(self) -> int:
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(self._service_time * backlog / self.max_concurrent))
+
+    def check(self, session_id: Optional[str] = None):
+        """
+        Raises the rejection acquire() would raise right away, without taking a
+        slot: streaming endpoints call it before the response starts, then acquire
+        once the stream runs.
+        """
+        if session_id and self._sessions[session_id] >= self.max_per_session:
+            self.counters["rejected_session"] += 1
+            raise AdmissionRejected(429, "Too many concurrent requests for this session", self._retry_after())
+        if not self._free() and len(self._waiters) >= self.max_queue:
+            self.counters["rejected_queue_full"] += 1
+            raise AdmissionRejected(503, "Server is at capacity, please retry", self._retry_after())
+
+    def _free(self) -> bool:
+        return self._active < self.max_concurrent and not self._waiters
+
+    async def acquire(self, session_id: Optional[str] = None):
+        self.check(session_id)
+
+        if self._free():
+            self._active += 1
+            self._hold_session(session_id)
+            self._record_admission(0.0)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["queued"] += 1
+        self.counters["max_queue_depth"] = max(self.counters["max_queue_depth"], len(self._waiters))
+        # Queued requests count against the per-session cap too
+        self._hold_session(session_id)
+        start = time.monotonic()
+        try:
+            # release() hands its slot over by resolving the oldest waiter
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forget_waiter(waiter)
+            self._drop_session(session_id)
+            self.counters["rejected_timeout"] += 1
+            raise AdmissionRejected(503, "Timed out waiting for capacity, please retry", self._retry_after())
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as the client went away: pass it on
+                self._release_slot()
+            else:
+                self._forget_waiter(waiter)
+            self._drop_session(session_id)
+            raise
+        self._record_admission(time.monotonic() - start)
+
+    def _record_admission(self, waited: float):
+        self.counters["admitted"] += 1
+        self._wait_times.append(waited)
+
+    def _hold_session(self, session_id):
+        if session_id:
+            self._sessions[session_id] += 1
+
+    def _drop_session(self, session_id):
+        if session_id:
+            self._sessions[session_id] -= 1
+            if self._sessions[session_id] <= 0:
+                del self._sessions[session_id]
+
+    def _forget_waiter(self, waiter):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _release_slot(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def release(self, session_id: Optional[str] = None, held_for: float = None):
+        self._drop_session(session_id)
+        if held_for is not None:
+            self._service_time = 0.8 * self._service_time + 0.2 * held_for
+        self._release_slot()
+
+    @asynccontextmanager
+    async def slot(self, session_id: Optional[str] = None):
+        await self.acquire(session_id)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(session_id, time.monotonic() - start)
+
+    def stats(self) -> dict:
+        waits = list(self._wait_times)
+        return {
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active_sessions": len(self._sessions),
+            "wait_seconds_p50": round(_percentile(waits, 0.5), 4),
+            "wait_seconds_p95": round(_percentile(waits, 0.95), 4),
+            "wait_seconds_max": round(max(waits, default=0.0), 4),
+            "avg_service_seconds": round(self._service_time, 3),
+            **self.counters,
+        }
+
+
+# --- Shared controller for every agent entry point ---
+admission = AdmissionController()
@@ -13,6 +13,7 @@ load_dotenv()
 from apps.tools.tools import (
     extract_skills_from_text,
     search_for_jobs,
+    semantic_job_search,
     get_market_insights,
     analyze_resume_against_job,
 )
@@ -21,6 +22,7 @@ from apps.tools.tools import (
 tools = [
     extract_skills_from_text,
     search_for_jobs,
+    semantic_job_search,
     get_market_insights,
     analyze_resume_against_job,
 ]
@@ -44,6 +46,7 @@ You are a comprehensive, multi-tool job search assistant. Your goal is to help u
 
 **TOOL USAGE GUIDE:**
 -   **For simple job searches:** Use `search_for_jobs`.
+-   **For descriptive searches (skills, seniority, "roles like X"):** Try `semantic_job_search` first; it answers from jobs already collected. Fall back to `search_for_jobs` if it finds nothing relevant.
 -   **To compare a resume to a single job:** Use `analyze_resume_against_job`.
 -   **To get salary/skill trends:** Use `get_market_insights`.
 -   **To improve a resume for one specific job:** Use `optimize_resume_for_job`.
@@ -53,6 +56,7 @@ You are a comprehensive, multi-tool job search assistant. Your goal is to help u
 
 prompt = ChatPromptTemplate.from_messages([
     ("system", prompt_template),
+    ("placeholder", "{chat_history}"),
     ("human", "{input}"),
     ("placeholder", "{agent_scratchpad}"),
 ])
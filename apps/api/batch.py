@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from apps.services.batch_scoring import RESUME_VS_JOBS, RESUMES_VS_JOB, batch_scorer
+from apps.services.job_store import job_store
+from apps.text_utils import text_hash
+from config import settings
+
+router = APIRouter()
+
+
+def _saved_jobs() -> tuple[list, str]:
+    """Every stored job, plus a hash of them so a batch over a changed store gets a new id."""
+    jobs = [job for job, _ in job_store.all_jobs()]
+    return jobs, text_hash(json.dumps(jobs, sort_keys=True))
+
+
+def _parse_upload(body: bytes) -> tuple[dict, list]:
+    lines = [line for line in body.decode("utf-8").splitlines() if line.strip()]
+    if not lines:
+        raise HTTPException(status_code=400, detail="Empty upload")
+    parsed = []
+    for number, line in enumerate(lines, start=1):
+        try:
+            parsed.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Line {number} is not valid JSON: {e.msg}")
+    header, items = parsed[0], parsed[1:]
+    if not isinstance(header, dict) or not ("resume_text" in header or "job" in header):
+        raise HTTPException(status_code=400, detail="First line must be {\"resume_text\": ...} or {\"job\": {...}}")
+    return header, items
+
+
+@router.post("/batch/score", summary="Score one resume against many jobs, or many resumes against one job (JSONL in, JSONL out)")
+async def score_batch(request: Request, batch_id: str = None, semantic: bool = None):
+    """
+    The body is JSONL. The first line picks the mode:
+
+    - `{"resume_text": "..."}` then one job object per line; add `"saved_jobs": true`
+      to score against every stored job instead.
+    - `{"job": {"title": ..., "description": ...}}` then one resume per line, as a
+      string or `{"id": ..., "resume_text": ...}`.
+
+    Results stream back as JSONL, one line per input row, after a header line with
+    the batch id. Posting the same upload (or passing the same `batch_id`) again
+    resumes an interrupted batch: stored rows are replayed, the rest are scored.
+    A `saved_jobs` batch id also covers the stored jobs, so it changes with the store.
+    If the embedding model cannot load, rows are scored by ATS fit alone and carry
+    `"semantic_fallback": true` instead of a `match_score`.
+    """
+    body = await request.body()
+    header, items = _parse_upload(body)
+    snapshot = ""
+    semantic = settings.BATCH_SEMANTIC if semantic is None else semantic
+    if "resume_text" in header:
+        mode, anchor = RESUME_VS_JOBS, header["resume_text"]
+        if header.get("saved_jobs"):
+            items, snapshot = await asyncio.to_thread(_saved_jobs)
+        if not all(isinstance(item, dict) for item in items):
+            raise HTTPException(status_code=400, detail="Each job line must be a JSON object")
+    else:
+        mode, anchor = RESUMES_VS_JOB, header["job"]
+        if not isinstance(anchor, dict):
+            raise HTTPException(status_code=400, detail="\"job\" must be a JSON object")
+    if len(items) > settings.BATCH_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BATCH_MAX_ROWS} rows per batch")
+    batch_id = batch_id or text_hash(f"{mode}\0{semantic}\0{body.decode('utf-8')}\0{snapshot}")[:32]
+
+    async def lines():
+        yield json.dumps({"batch_id": batch_id, "mode": mode, "total": len(items)}) + "\n"
+        async for result in batch_scorer.run(batch_id, mode, anchor, items, semantic):
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"batch_id": batch_id, "status": "done"}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/batch/{batch_id}", summary="Progress of a batch")
+async def batch_status(batch_id: str):
+    run = await asyncio.to_thread(batch_scorer.store.run, batch_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return run
+
+
+@router.get("/batch/{batch_id}/results", summary="Stored results of a batch as JSONL, from row `after` + 1 on")
+async def batch_results(batch_id: str, after: int = -1):
+    if await asyncio.to_thread(batch_scorer.store.run, batch_id) is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    async def lines():
+        after_row = after
+        while True:
+            page = await asyncio.to_thread(batch_scorer.store.results_page, batch_id, after_row)
+            if not page:
+                return
+            for result in page:
+                yield json.dumps(result) + "\n"
+            after_row = page[-1]["row"]
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
-from app.schemas import ResumeRequest, JobMatchResult
-from app.services.match_engine import JobMatchResumeMCP
+from apps.schemas.schemas import ResumeRequest, JobMatchResult
+from apps.services.match_engine import JobMatchResumeMCP
 
 router = APIRouter()
 
@@ -8,4 +8,4 @@ router = APIRouter()
 async def match_jobs(payload: ResumeRequest):
     engine = JobMatchResumeMCP()
     result = await engine.find_and_optimize_jobs(payload.resume_text, payload.preferences)
-    return result
\ No newline at end of file
+    return result
@@ -0,0 +1,156 @@
+# browser_pool.py (Pooled headless Chrome sessions)
+
+import atexit
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import undetected_chromedriver as uc
+from config import settings
+
+
+def launch_chrome(profile_dir: str):
+    options = uc.ChromeOptions()
+    options.headless = True
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+
+    return uc.Chrome(options=options, user_data_dir=profile_dir)
+
+
+class BrowserSession:
+    """A warm browser checked out from the pool. Use `get` so page loads are counted."""
+
+    def __init__(self, driver, profile_dir: str):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    def get(self, url: str):
+        self.pages += 1
+        self.driver.get(url)
+
+    @property
+    def page_source(self) -> str:
+        return self.driver.page_source
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        size: int = settings.BROWSER_POOL_SIZE,
+        max_pages: int = settings.BROWSER_MAX_PAGES,
+        acquire_timeout: float = settings.BROWSER_ACQUIRE_TIMEOUT,
+        driver_factory=launch_chrome,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+        self._driver_factory = driver_factory
+        self._slots = threading.BoundedSemaphore(size)
+        # LIFO so the most recently used (warmest) browser is handed out first
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._sessions = set()
+        self._closed = False
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    def _launch(self) -> BrowserSession:
+        profile_dir = tempfile.mkdtemp(prefix="job-scraper-chrome-")
+        try:
+            driver = self._driver_factory(profile_dir)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        session = BrowserSession(driver, profile_dir)
+        with self._lock:
+            self._sessions.add(session)
+            self.stats["launched"] += 1
+        return session
+
+    def _retire(self, session: BrowserSession):
+        with self._lock:
+            self._sessions.discard(session)
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"Browser pool: error while quitting driver: {e}")
+        finally:
+            shutil.rmtree(session.profile_dir, ignore_errors=True)
+
+    def _is_healthy(self, session: BrowserSession) -> bool:
+        try:
+            session.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self) -> BrowserSession:
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No browser available within {self.acquire_timeout}s")
+        try:
+            while True:
+                try:
+                    session = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._launch()
+                if self._is_healthy(session):
+                    self.stats["reused"] += 1
+                    return session
+                self.stats["unhealthy"] += 1
+                self._retire(session)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, session: BrowserSession, discard: bool = False):
+        try:
+            if discard or self._closed:
+                self._retire(session)
+            elif session.pages >= self.max_pages:
+                self.stats["recycled"] += 1
+                self._retire(session)
+            else:
+                self._idle.put(session)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self):
+        browser = self.acquire()
+        try:
+            yield browser
+        except Exception:
+            # The driver may be in an unknown state after a failure, so never reuse it
+            self.release(browser, discard=True)
+            raise
+        else:
+            self.release(browser)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(session)
+
+    def status(self) -> dict:
+        return {
+            "size": self.size,
+            "open_sessions": len(self._sessions),
+            "idle_sessions": self._idle.qsize(),
+            **self.stats,
+        }
+
+
+# --- Shared pool used by every browser-backed scraper ---
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
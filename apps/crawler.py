@@ -0,0 +1,210 @@
+# crawler.py (Priority-queue crawl over result pages and job detail pages)
+
+import hashlib
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+from apps.http_client import fetch_deadline
+from config import settings
+
+RESULTS, DETAIL = 0, 1  # Kind order inside one page: its results before its details
+
+
+def job_key(job: dict) -> str:
+    """Source id, else URL, else a hash of title, company and location. An id that is
+    only the source prefix ("indeed_" from an empty data-jk) counts as missing."""
+    job_id = job.get("id") or ""
+    if job_id and not job_id.endswith("_"):
+        return job_id
+    if job.get("url"):
+        return job["url"]
+    return hashlib.md5(f"{job.get('title', '')}|{job.get('company', '')}|{job.get('location', '')}".encode()).hexdigest()
+
+
+class CrawlTask:
+    __slots__ = ("kind", "page", "url", "job")
+
+    def __init__(self, kind: int, page: int, url: str, job: dict = None):
+        self.kind = kind
+        self.page = page
+        self.url = url
+        self.job = job
+
+    @property
+    def domain(self) -> str:
+        return urlsplit(self.url).netloc
+
+
+class CrawlScheduler:
+    """
+    Walks a site's result pages and the detail page of every new job through one
+    priority queue: page N's details run before page N+1's, so the first enriched
+    jobs arrive early, but each next results page is queued ahead of the current
+    page's details so pagination is not starved by the host's request spacing.
+    Each domain gets at most `domain_concurrency` requests in flight and
+    `domain_max_requests` per crawl; per-request spacing comes from the HTTP
+    client's host rate limiter, which gives up on requests whose slot falls past
+    the deadline. When `deadline` passes, jobs still waiting for their detail page
+    are delivered with the snippet they have.
+
+    Pagination stops at the first page that adds no new job. Detail pages are
+    skipped for jobs `known_jobs` already has a stored copy of (the job store), so
+    a repeat crawl only pays for postings it has not seen.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = settings.CRAWL_MAX_PAGES,
+        fetch_details: bool = settings.CRAWL_FETCH_DETAILS,
+        max_workers: int = settings.CRAWL_MAX_WORKERS,
+        domain_concurrency: int = settings.CRAWL_DOMAIN_CONCURRENCY,
+        domain_max_requests: int = settings.CRAWL_DOMAIN_MAX_REQUESTS,
+        deadline: float = settings.CRAWL_DEADLINE,
+        known_jobs: Callable[[list[dict]], list] = None,
+    ):
+        self.max_pages = max_pages
+        self.fetch_details = fetch_details
+        self.domain_concurrency = domain_concurrency
+        self.domain_max_requests = domain_max_requests
+        self.deadline = deadline
+        self.known_jobs = known_jobs  # jobs -> stored copy of each, or None
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawl")
+        self._lock = threading.Lock()
+        self.stats = {"result_pages": 0, "detail_pages": 0, "known_skipped": 0, "budget_skipped": 0, "deadline_hits": 0}
+
+    def _count(self, key: str, value: int = 1):
+        with self._lock:
+            self.stats[key] += value
+
+    def _lookup_known(self, jobs: list[dict]) -> list:
+        if self.known_jobs is None:
+            return [None] * len(jobs)
+        try:
+            return self.known_jobs(jobs)
+        except Exception as e:
+            print(f"Known-job lookup failed: {e}")
+            return [None] * len(jobs)
+
+    def _run(self, site, task: CrawlTask, deadline_at: float):
+        # Requests that could not start before the deadline fail fast instead of sleeping in the host queue
+        with fetch_deadline(deadline_at):
+            if task.kind == RESULTS:
+                self._count("result_pages")
+                return site.fetch_jobs(task.url)
+            self._count("detail_pages")
+            return site.fetch_detail(task.url)
+
+    def crawl(self, site, keywords: str, location: str) -> Iterator[list[dict]]:
+        """
+        Yields batches of jobs as they become ready. `site` provides page_url,
+        fetch_jobs (a results page -> jobs) and fetch_detail (a detail page ->
+        full description or None).
+        """
+        deadline_at = time.monotonic() + self.deadline
+        order = itertools.count()
+        queue = []
+        in_flight, requests = {}, {}  # domain -> count
+        running = {}  # future -> task
+        seen, awaiting = set(), {}  # job keys found so far; job key -> job waiting on its detail page
+
+        def push(task: CrawlTask, priority: int = None):
+            heapq.heappush(queue, (task.page if priority is None else priority, task.kind, next(order), task))
+
+        def start_ready():
+            deferred = []
+            while queue and len(running) < self.max_workers:
+                entry = heapq.heappop(queue)
+                task = entry[3]
+                if in_flight.get(task.domain, 0) >= self.domain_concurrency:
+                    deferred.append(entry)
+                    continue
+                if requests.get(task.domain, 0) >= self.domain_max_requests:
+                    self._count("budget_skipped")
+                    continue  # Over budget: a detail job keeps its snippet, a results page is dropped
+                in_flight[task.domain] = in_flight.get(task.domain, 0) + 1
+                requests[task.domain] = requests.get(task.domain, 0) + 1
+                running[self._executor.submit(self._run, site, task, deadline_at)] = task
+            for entry in deferred:
+                heapq.heappush(queue, entry)
+
+        push(CrawlTask(RESULTS, 0, site.page_url(keywords, location, 0)))
+        try:
+            while queue or running:
+                start_ready()
+                # Tasks dropped for budget leave nothing waiting on them
+                if not running:
+                    break
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    self._count("deadline_hits")
+                    break
+                done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                ready = []
+                for future in done:
+                    task = running.pop(future)
+                    in_flight[task.domain] -= 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if task.kind == RESULTS and task.page == 0:
+                            raise  # Nothing fetched at all: the source itself failed
+                        print(f"Crawl of {task.url} failed: {e}")
+                        result = None
+                    if task.kind == DETAIL:
+                        job = awaiting.pop(job_key(task.job), task.job)
+                        if result:
+                            job["description"] = result
+                        ready.append(job)
+                    else:
+                        ready.extend(self._handle_results(site, keywords, location, task, result or [], seen, awaiting, push))
+                if ready:
+                    yield ready
+
+            # Deadline or budget: deliver what is still waiting, snippet only
+            leftovers = list(awaiting.values())
+            awaiting.clear()
+            if leftovers:
+                yield leftovers
+        finally:
+            for future in running:
+                future.cancel()
+
+    def _handle_results(self, site, keywords, location, task, jobs, seen, awaiting, push) -> list[dict]:
+        new_jobs = []
+        for job in jobs:
+            key = job_key(job)
+            if key and key not in seen:
+                seen.add(key)
+                new_jobs.append(job)
+        if not new_jobs:
+            return []  # Empty or repeated page: the results have run out
+        if task.page + 1 < self.max_pages:
+            # Queued at this page's priority, so the next results page goes ahead of this page's details
+            next_page = CrawlTask(RESULTS, task.page + 1, site.page_url(keywords, location, task.page + 1))
+            push(next_page, priority=task.page)
+
+        if not self.fetch_details:
+            return new_jobs
+        ready = []
+        for job, stored in zip(new_jobs, self._lookup_known(new_jobs)):
+            if stored is not None:
+                self._count("known_skipped")
+                if len(stored.get("description") or "") > len(job.get("description") or ""):
+                    job["description"] = stored["description"]
+                ready.append(job)
+            elif job.get("url"):
+                awaiting[job_key(job)] = job
+                push(CrawlTask(DETAIL, task.page, job["url"], job))
+            else:
+                ready.append(job)
+        return ready
+
+
+# --- Shared scheduler (the job store's lookup is attached by the search engine) ---
+crawl_scheduler = CrawlScheduler()
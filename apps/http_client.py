@@ -0,0 +1,116 @@
+# http_client.py (Pooled HTTP fetch path for server-rendered job pages)
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+from config import settings
+
+try:
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when the h2 package is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+}
+
+
+class DeadlineExceeded(Exception):
+    """The caller's deadline passes before its turn in the host's request queue."""
+
+
+# Per-thread time (monotonic) after which a fetch gives up instead of waiting for its slot
+_deadlines = threading.local()
+
+
+@contextmanager
+def fetch_deadline(at: float):
+    previous = getattr(_deadlines, "at", None)
+    _deadlines.at = at
+    try:
+        yield
+    finally:
+        _deadlines.at = previous
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least `min_interval` seconds apart."""
+
+    def __init__(self, min_interval: float = settings.HTTP_HOST_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str, deadline: float = None):
+        """Sleeps until the host's next slot; raises DeadlineExceeded (without taking the slot) if that is past `deadline`."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            if deadline is not None and slot >= deadline:
+                raise DeadlineExceeded(f"No request slot for {host} before the deadline")
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HttpFetcher:
+    """
+    One keep-alive connection pool shared by every scraper thread. `get_html`
+    returns None for anything that is not a successful HTML page, so callers can
+    fall back to a real browser.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: HostRateLimiter = None,
+        timeout: float = settings.HTTP_TIMEOUT,
+        max_connections: int = settings.HTTP_MAX_CONNECTIONS,
+        http2: bool = settings.HTTP2_ENABLED,
+        transport: httpx.BaseTransport = None,
+    ):
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.client = httpx.Client(
+            headers=DEFAULT_HEADERS,
+            timeout=timeout,
+            http2=http2 and HTTP2_AVAILABLE,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+        self.stats = {"requests": 0, "html": 0, "rejected": 0, "errors": 0}
+
+    def get_html(self, url: str) -> Optional[str]:
+        self.rate_limiter.wait(urlsplit(url).netloc, getattr(_deadlines, "at", None))
+        self.stats["requests"] += 1
+        try:
+            response = self.client.get(url)
+        except httpx.HTTPError as e:
+            self.stats["errors"] += 1
+            print(f"HTTP fetch failed for {url}: {e}")
+            return None
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", ""):
+            # 403/429/503 here is usually a bot challenge that only a browser gets through
+            self.stats["rejected"] += 1
+            return None
+        self.stats["html"] += 1
+        return response.text
+
+    def close(self):
+        self.client.close()
+
+
+# --- Shared fetcher ---
+http_fetcher = HttpFetcher()
+atexit.register(http_fetcher.close)
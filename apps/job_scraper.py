@@ -1,121 +1,198 @@
 # job_scraper.py (Selenium + Anti-blocking)
 
 import time
-import tempfile
 import random
 import os
-from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
+from lxml import etree, html as lxml_html
 from fake_useragent import UserAgent
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urljoin
+from apps.browser_pool import browser_pool
+from apps.crawler import crawl_scheduler
+from apps.http_client import http_fetcher
+from apps.scraper_cache import CachedScraper, scraper_cache
+from config import settings
 
 # Optional proxy
 PROXY = None  # Example: "username:password@proxy-ip:port"
 
-def get_driver():
-    temp_dir = tempfile.mkdtemp()
-    options = uc.ChromeOptions()
-    options.headless = True
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-
-    return uc.Chrome(options=options, user_data_dir=temp_dir)
+def page_delay():
+    time.sleep(random.uniform(settings.SCRAPER_MIN_DELAY, settings.SCRAPER_MAX_DELAY))
 
 def build_url(base_url, keywords, location):
     clean_keywords = keywords.replace(",", " ").replace(" or ", " ")
     return f"{base_url}?q={quote_plus(clean_keywords)}&l={quote_plus(location)}"
 
-class IndeedScraper:
+# --- Precompiled selectors ---
+def _xpath(tag: str, css_class: str, first: bool = False, scope: str = ".//") -> etree.XPath:
+    expr = f"{scope}{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+    return etree.XPath(f"({expr})[1]" if first else expr)
+
+_FIRST_LINK = etree.XPath("(.//a)[1]")
+
+def _first(xpath: etree.XPath, node):
+    found = xpath(node) if node is not None else None
+    return found[0] if found else None
+
+def _text(node) -> str:
+    # Same result as BeautifulSoup's get_text(strip=True); None raises AttributeError like bs4 did
+    return "".join(part.strip() for part in node.itertext())
+
+def parse_html(html: str):
+    return lxml_html.fromstring(html) if html and html.strip() else None
+
+class PageScraper:
+    """
+    Fetches result pages over the shared HTTP client first, and only renders them
+    in a pooled browser when the plain HTML has no job cards (a JavaScript-only
+    page or a bot challenge). Pagination and detail pages are driven by the crawl
+    scheduler; `stream` yields jobs as their full descriptions arrive.
+    """
+
+    def __init__(self, pool=None, fetcher=None, crawler=None):
+        self.pool = pool or browser_pool
+        self.fetcher = fetcher or http_fetcher
+        self.crawler = crawler or crawl_scheduler
+        self.stats = {"http_pages": 0, "browser_pages": 0}
+
     def search(self, keywords: str, location: str) -> list[dict]:
-        print(f"Scraping Indeed for '{keywords}' in '{location}'...")
+        return [job for batch in self.stream(keywords, location) for job in batch]
+
+    def stream(self, keywords: str, location: str):
+        print(f"Scraping {self.name} for '{keywords}' in '{location}'...")
+        found = 0
+        # Errors propagate so the search engine can retry and count them against the source
+        for jobs in self.crawler.crawl(self, keywords, location):
+            found += len(jobs)
+            yield jobs
+        print(f"Found {found} jobs on {self.name}.")
+
+    def page_url(self, keywords: str, location: str, page: int) -> str:
+        raise NotImplementedError
+
+    def fetch_detail(self, url: str):
+        """Full description from a job's own page, or None to keep the snippet."""
+        root = parse_html(self.fetcher.get_html(url))
+        node = _first(self._description, root)
+        if node is None:
+            return None
+        # Paragraphs and list items keep a space between them
+        return " ".join(" ".join(node.itertext()).split()) or None
+
+    def fetch_jobs(self, url: str) -> list[dict]:
+        jobs = self.parse(self.fetcher.get_html(url))
+        if jobs:
+            self.stats["http_pages"] += 1
+            return jobs
+        self.stats["browser_pages"] += 1
+        with self.pool.session() as browser:
+            browser.get(url)
+            page_delay()
+            html = browser.page_source
+        return self.parse(html)
+
+    def parse(self, html: str) -> list[dict]:
+        raise NotImplementedError
+
+class IndeedScraper(PageScraper):
+    name = "indeed"
+    base_url = "https://www.indeed.com/jobs"
+    site_url = "https://www.indeed.com"
+
+    _cards = _xpath("div", "job_seen_beacon", scope="//")
+    _title = _xpath("h2", "jobTitle", first=True)
+    _company = _xpath("span", "companyName", first=True)
+    _location = _xpath("div", "companyLocation", first=True)
+    _snippet = _xpath("div", "job-snippet", first=True)
+    _description = etree.XPath("(//div[@id='jobDescriptionText'])[1]")
+
+    def page_url(self, keywords: str, location: str, page: int) -> str:
+        url = build_url(self.base_url, keywords, location)
+        return f"{url}&start={page * 10}" if page else url
+
+    def parse(self, html: str) -> list[dict]:
         jobs = []
-        try:
-            driver = get_driver()
-            url = build_url("https://www.indeed.com/jobs", keywords, location)
-            driver.get(url)
-            time.sleep(random.uniform(2, 4))
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            job_cards = soup.find_all('div', class_='job_seen_beacon')
-
-            for card in job_cards[:10]:
-                try:
-                    title_element = card.find('h2', class_='jobTitle').find('a')
-                    title = title_element.get_text(strip=True)
-                    job_url = "https://www.indeed.com" + title_element['href']
-                    company = card.find('span', class_='companyName').get_text(strip=True)
-                    job_location = card.find('div', class_='companyLocation').get_text(strip=True)
-                    description_snippet = card.find('div', class_='job-snippet').get_text(strip=True)
-
-                    jobs.append({
-                        "id": f"indeed_{title_element.get('data-jk', '')}",
-                        "title": title,
-                        "company": company,
-                        "location": job_location,
-                        "description": description_snippet,
-                        "url": job_url
-                    })
-                except AttributeError:
-                    continue
-
-        except Exception as e:
-            print(f"Indeed scraping error: {e}")
-        finally:
-            driver.quit()
-
-        print(f"Found {len(jobs)} jobs on Indeed.")
+        root = parse_html(html)
+        job_cards = self._cards(root) if root is not None else []
+
+        for card in job_cards:
+            try:
+                title_element = _first(_FIRST_LINK, _first(self._title, card))
+                title = _text(title_element)
+                job_url = self.site_url + title_element.attrib['href']
+                company = _text(_first(self._company, card))
+                job_location = _text(_first(self._location, card))
+                description_snippet = _text(_first(self._snippet, card))
+
+                jobs.append({
+                    "id": f"indeed_{title_element.get('data-jk', '')}",
+                    "title": title,
+                    "company": company,
+                    "location": job_location,
+                    "description": description_snippet,
+                    "url": job_url
+                })
+            except AttributeError:
+                continue
         return jobs
 
-class ZipRecruiterScraper:
-    def search(self, keywords: str, location: str) -> list[dict]:
-        print(f"Scraping ZipRecruiter for '{keywords}' in '{location}'...")
+class ZipRecruiterScraper(PageScraper):
+    name = "ziprecruiter"
+    base_url = "https://www.ziprecruiter.com/jobs-search"
+
+    _cards = _xpath("div", "job_content", scope="//")
+    _title = _xpath("h2", "title", first=True)
+    _company = _xpath("a", "company_name", first=True)
+    _location = _xpath("p", "location", first=True)
+    _snippet = _xpath("p", "job_snippet", first=True)
+    _description = _xpath("div", "job_description", first=True, scope="//")
+
+    def page_url(self, keywords: str, location: str, page: int) -> str:
+        url = build_url(self.base_url, keywords, location)
+        return f"{url}&page={page + 1}" if page else url
+
+    def parse(self, html: str) -> list[dict]:
         jobs = []
-        try:
-            driver = get_driver()
-            url = build_url("https://www.ziprecruiter.com/jobs-search", keywords, location)
-            driver.get(url)
-            time.sleep(random.uniform(2, 4))
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            job_cards = soup.find_all('div', class_='job_content')
-
-            for card in job_cards[:10]:
-                try:
-                    title_element = card.find('h2', class_='title').find('a')
-                    title = title_element.get_text(strip=True)
-                    job_url = title_element['href']
-                    company = card.find('a', class_='company_name').get_text(strip=True)
-                    job_location = card.find('p', class_='location').get_text(strip=True)
-                    description_snippet = card.find('p', class_='job_snippet').get_text(strip=True)
-
-                    jobs.append({
-                        "id": f"zip_{card.get('data-job-id', '')}",
-                        "title": title,
-                        "company": company,
-                        "location": job_location,
-                        "description": description_snippet,
-                        "url": job_url
-                    })
-                except AttributeError:
-                    continue
-
-        except Exception as e:
-            print(f"ZipRecruiter scraping error: {e}")
-        finally:
-            driver.quit()
-
-        print(f"Found {len(jobs)} jobs on ZipRecruiter.")
+        root = parse_html(html)
+        job_cards = self._cards(root) if root is not None else []
+
+        for card in job_cards:
+            try:
+                title_element = _first(_FIRST_LINK, _first(self._title, card))
+                title = _text(title_element)
+                job_url = urljoin(self.base_url, title_element.attrib['href'])
+                company = _text(_first(self._company, card))
+                job_location = _text(_first(self._location, card))
+                description_snippet = _text(_first(self._snippet, card))
+
+                jobs.append({
+                    "id": f"zip_{card.get('data-job-id', '')}",
+                    "title": title,
+                    "company": company,
+                    "location": job_location,
+                    "description": description_snippet,
+                    "url": job_url
+                })
+            except AttributeError:
+                continue
         return jobs
 
 class LinkedInScraper:
+    name = "linkedin"
+
     def search(self, keywords: str, location: str) -> list[dict]:
         print("Skipping LinkedIn: Scraping restricted.")
         return []
 
 class GlassdoorScraper:
+    name = "glassdoor"
+
     def search(self, keywords: str, location: str) -> list[dict]:
         print("Skipping Glassdoor: Scraping restricted.")
         return []
 
 class GoogleJobsAPI:
+    name = "google_jobs"
+
     def search(self, keywords: str, location: str) -> list[dict]:
         api_key = os.getenv("SERPAPI_API_KEY")
         if not api_key:
@@ -124,6 +201,8 @@ class GoogleJobsAPI:
         return []
 
 class JSearchAPI:
+    name = "jsearch"
+
     def search(self, keywords: str, location: str) -> list[dict]:
         api_key = os.getenv("JSEARCH_API_KEY")
         if not api_key:
@@ -132,14 +211,17 @@ class JSearchAPI:
         return []
 
 class MonsterScraper:
+    name = "monster"
+
     def search(self, keywords: str, location: str) -> list[dict]:
         return []
 
-# --- Instantiate scrapers ---
-indeed_api = IndeedScraper()
-ziprecruiter_api = ZipRecruiterScraper()
-monster_api = MonsterScraper()
-google_jobs_api = GoogleJobsAPI()
-jsearch_api = JSearchAPI()
-linkedin_api = LinkedInScraper()
-glassdoor_api = GlassdoorScraper()
+# --- Instantiate scrapers (each behind the shared query cache) ---
+indeed_api = CachedScraper(IndeedScraper(), scraper_cache)
+ziprecruiter_api = CachedScraper(ZipRecruiterScraper(), scraper_cache)
+monster_api = CachedScraper(MonsterScraper(), scraper_cache)
+google_jobs_api = CachedScraper(GoogleJobsAPI(), scraper_cache)
+jsearch_api = CachedScraper(JSearchAPI(), scraper_cache)
+linkedin_api = CachedScraper(LinkedInScraper(), scraper_cache)
+glassdoor_api = CachedScraper(GlassdoorScraper(), scraper_cache)
+
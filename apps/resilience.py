@@ -0,0 +1,146 @@
+# resilience.py (Per-source circuit breakers + retry backoff)
+
+import random
+import threading
+import time
+from collections import deque
+
+from config import settings
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = settings.RETRY_BASE_DELAY,
+    max_delay: float = settings.RETRY_MAX_DELAY,
+) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(max_delay, base * 2**attempt)]."""
+    return random.uniform(0, min(max_delay, base * 2 ** attempt))
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class CircuitBreaker:
+    """
+    Trips open when, over the last `window` calls (and at least `min_calls`), the
+    error rate reaches `error_rate` or the share of calls slower than
+    `slow_call_seconds` reaches `slow_call_rate` (the search engine records a
+    streaming source's time to its first batch). An open breaker rejects calls
+    for `open_seconds`, then lets a single probe through (half-open): success
+    closes it, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        window: int = settings.BREAKER_WINDOW,
+        min_calls: int = settings.BREAKER_MIN_CALLS,
+        error_rate: float = settings.BREAKER_ERROR_RATE,
+        slow_call_seconds: float = settings.BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = settings.BREAKER_SLOW_CALL_RATE,
+        open_seconds: float = settings.BREAKER_OPEN_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._calls = deque(maxlen=window)  # (ok, seconds)
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.counters = {"calls": 0, "failures": 0, "short_circuited": 0, "opened": 0, "retries": 0, "hedges": 0}
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if self._clock() - self._opened_at < self.open_seconds:
+                    self.counters["short_circuited"] += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.counters["short_circuited"] += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record(self, ok: bool, seconds: float):
+        with self._lock:
+            self.counters["calls"] += 1
+            self.counters["failures"] += not ok
+            healthy = ok and seconds < self.slow_call_seconds
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if healthy:
+                    self.state = self.CLOSED
+                    self._calls.clear()
+                else:
+                    self._open()
+                self._calls.append((ok, seconds))
+                return
+
+            self._calls.append((ok, seconds))
+            if self.state == self.CLOSED and len(self._calls) >= self.min_calls:
+                errors = sum(not ok for ok, _ in self._calls) / len(self._calls)
+                slow = sum(s >= self.slow_call_seconds for _, s in self._calls) / len(self._calls)
+                if errors >= self.error_rate or slow >= self.slow_call_rate:
+                    self._open()
+
+    def count(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def _open(self):
+        # Called with the lock held
+        self.state = self.OPEN
+        self._opened_at = self._clock()
+        self.counters["opened"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = list(self._calls)
+            seconds = [s for _, s in calls]
+            return {
+                "state": self.state,
+                "window_calls": len(calls),
+                "error_rate": round(sum(not ok for ok, _ in calls) / len(calls), 3) if calls else 0.0,
+                "latency_p50_s": round(_percentile(seconds, 0.5), 3),
+                "latency_p95_s": round(_percentile(seconds, 0.95), 3),
+                "reopens_in_s": round(max(0.0, self.open_seconds - (self._clock() - self._opened_at)), 1)
+                if self.state == self.OPEN else None,
+                **self.counters,
+            }
+
+
+class SourceHealth:
+    """One circuit breaker per job source, created on first use."""
+
+    def __init__(self, breaker_factory=CircuitBreaker):
+        self._breaker_factory = breaker_factory
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, source: str) -> CircuitBreaker:
+        with self._lock:
+            if source not in self._breakers:
+                self._breakers[source] = self._breaker_factory()
+            return self._breakers[source]
+
+    def stats(self) -> dict:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {source: breaker.snapshot() for source, breaker in sorted(breakers.items())}
+
+
+# --- Shared health registry for every job source ---
+source_health = SourceHealth()
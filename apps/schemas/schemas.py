@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 class Preferences(BaseModel):
     location: str
@@ -14,6 +14,7 @@ class OptimizedResume(BaseModel):
     job: Dict[str, Any]
     optimized_resume: Dict[str, Any]
     match_score: float
+    ats_score: Optional[float] = None
     missing_skills: List[str]
     recommendations: List[str]
 
@@ -0,0 +1,213 @@
+# scraper_cache.py (TTL + LRU query cache with single-flight)
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+
+from apps.text_utils import query_key
+from config import settings
+
+
+class QueryCache:
+    """
+    LRU cache whose entries are fresh for `ttl` seconds and may then be served
+    stale for another `stale_ttl` seconds while a background refresh runs.
+    Concurrent misses for the same key share one fetch.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.SCRAPER_CACHE_TTL,
+        stale_ttl: float = settings.SCRAPER_CACHE_STALE_TTL,
+        max_entries: int = settings.SCRAPER_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._inflight = {}  # key -> Future shared by every caller waiting on that key
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0,
+            "evictions": 0, "refreshes": 0, "refresh_errors": 0,
+        }
+
+    def get_or_fetch(self, key, fetch):
+        value, future, owner = self.lookup(key, fetch)
+        if future is None:
+            return value
+        if owner:
+            self._fetch(key, fetch, future)
+        return future.result()
+
+    def lookup(self, key, fetch, join: bool = True):
+        """
+        Cache check plus single-flight claim, for callers that produce the value
+        themselves (streaming scrapers). Returns (value, None, False) for a fresh
+        entry, or for a stale one while `fetch` refreshes it in the background;
+        otherwise (None, future, owner). The owner must `settle` the future; every
+        other caller waits on it, except with `join=False` (a hedge racing the
+        owner), which fetches too and may settle the future first.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = time.monotonic() - stored_at
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value, None, False
+                if age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._counters["stale_hits"] += 1
+                    self._refresh_in_background(key, fetch)
+                    return value, None, False
+                del self._entries[key]
+
+            self._counters["misses"] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            elif join:
+                self._counters["coalesced"] += 1
+            return None, future, owner
+
+    def settle(self, key, future: Future, value=None, error: BaseException = None, store: bool = True):
+        """
+        Completes a fetch: waiters get `value` (or `error`), and the value is cached
+        when `store`. Only the first settle of a future counts.
+        """
+        with self._lock:
+            if future.done():
+                return
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if error is None and store:
+                self._store(key, value)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+    def _fetch(self, key, fetch, future: Future):
+        try:
+            value = fetch()
+        except BaseException as e:
+            self.settle(key, future, error=e)
+            return
+        self.settle(key, future, value)
+
+    def _refresh_in_background(self, key, fetch):
+        # Called with the lock held
+        if key in self._inflight:
+            return
+        future = self._inflight[key] = Future()
+        self._counters["refreshes"] += 1
+
+        def refresh():
+            self._fetch(key, fetch, future)
+            if future.exception() is not None:
+                with self._lock:
+                    self._counters["refresh_errors"] += 1
+                print(f"Cache refresh failed for {key}: {future.exception()}")
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _store(self, key, value):
+        # Empty results are usually a blocked or failed scrape, so don't pin them
+        if not value:
+            return
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "inflight": len(self._inflight),
+                "hit_rate": round((self._counters["hits"] + self._counters["stale_hits"]) / lookups, 4) if lookups else 0.0,
+            }
+
+
+class CachedScraper:
+    """Wraps a scraper so `search` is answered from the shared query cache."""
+
+    def __init__(self, scraper, cache: QueryCache):
+        self.scraper = scraper
+        self.cache = cache
+        self.name = getattr(scraper, "name", scraper.__class__.__name__)
+        self._running = Counter()  # key -> streams fetching it (an owner plus its hedges)
+        self._lock = threading.Lock()
+
+    def search(self, keywords: str, location: str) -> list[dict]:
+        key = (self.name, query_key(keywords, location))
+        return list(self.cache.get_or_fetch(key, lambda: self.scraper.search(keywords, location)))
+
+    def stream(self, keywords: str, location: str, coalesce: bool = True):
+        """
+        On a miss, batches from the scraper's own `stream` as they arrive; identical
+        searches running at the same time wait for this one and get its full list.
+        Fresh and stale hits come back as one batch (a stale hit also starts a refresh).
+
+        `coalesce=False` is for hedges: the search runs even if an identical one is
+        in flight, and whichever finishes first answers the waiters and the cache.
+        """
+        key = (self.name, query_key(keywords, location))
+        cached, future, owner = self.cache.lookup(key, lambda: self.scraper.search(keywords, location), join=coalesce)
+        if future is None:
+            yield list(cached)
+            return
+        if not owner and coalesce:
+            yield list(future.result())
+            return
+
+        with self._lock:
+            self._running[key] += 1
+        jobs = []
+        try:
+            for batch in self._batches(keywords, location):
+                jobs.extend(batch)
+                yield batch
+        except GeneratorExit:
+            # The consumer stopped early (deadline, or a lost hedge race): unless another
+            # attempt is still running, waiters get what arrived, but it is not cached
+            if self._leave(key):
+                self.cache.settle(key, future, list(jobs), store=False)
+            raise
+        except BaseException as e:
+            if self._leave(key):
+                self.cache.settle(key, future, error=e)
+            raise
+        self._leave(key)
+        self.cache.settle(key, future, jobs)
+
+    def _batches(self, keywords, location):
+        if hasattr(self.scraper, "stream"):
+            yield from self.scraper.stream(keywords, location)
+        else:
+            yield self.scraper.search(keywords, location)
+
+    def _leave(self, key) -> bool:
+        """Marks one stream of `key` finished; True when it was the last one."""
+        with self._lock:
+            self._running[key] -= 1
+            if self._running[key] > 0:
+                return False
+            del self._running[key]
+            return True
+
+
+# --- Shared cache for every scraper source ---
+scraper_cache = QueryCache()
@@ -1,25 +1,334 @@
+# alert_system.py (Central scheduler for saved-search job alerts)
+
 import asyncio
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from apps.services.embeddings import job_text, normalize_rows
+from apps.services.job_store import job_identity
+from apps.text_utils import query_key, tokenize
+from config import settings
+
+
+class AlertStore:
+    """Saved searches plus, per distinct query, the jobs already diffed in."""
+
+    def __init__(self, path: str = settings.ALERT_DB_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS saved_searches (
+                    search_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    keywords TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    query_key TEXT NOT NULL,
+                    resume_text TEXT NOT NULL,
+                    min_score REAL NOT NULL,
+                    interval REAL NOT NULL,
+                    next_due REAL NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS saved_searches_query ON saved_searches(query_key);
+                CREATE TABLE IF NOT EXISTS alert_seen (
+                    query_key TEXT NOT NULL,
+                    job_key TEXT NOT NULL,
+                    seen_at REAL NOT NULL,
+                    PRIMARY KEY (query_key, job_key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS alert_seen_at ON alert_seen(seen_at);
+            """)
+            self._conn = conn
+        return self._conn
+
+    def add(self, user_id, email, keywords, location, resume_text, min_score, interval, next_due) -> int:
+        with self._lock, self.conn:
+            return self.conn.execute(
+                """INSERT INTO saved_searches
+                   (user_id, email, keywords, location, query_key, resume_text, min_score, interval, next_due, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (user_id, email, keywords, location, query_key(keywords, location),
+                 resume_text, min_score, interval, next_due, time.time()),
+            ).lastrowid
+
+    def remove(self, search_id: int) -> bool:
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM saved_searches WHERE search_id = ?", (search_id,)).rowcount > 0
+
+    def schedule(self) -> list[tuple]:
+        """(next_due, query_key, interval) per distinct query, for rebuilding the heap."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT MIN(next_due), query_key, MIN(interval) FROM saved_searches GROUP BY query_key"
+            ).fetchall()
+
+    def subscribers(self, key: str) -> list[dict]:
+        with self._lock:
+            cursor = self.conn.execute("SELECT * FROM saved_searches WHERE query_key = ?", (key,))
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def set_next_due(self, key: str, next_due: float):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE saved_searches SET next_due = ? WHERE query_key = ?", (next_due, key))
+
+    def diff_new(self, key: str, jobs: list[dict]) -> list[dict]:
+        """Records the jobs as seen for this query and returns the ones that were not."""
+        by_key = {job_identity(job): job for job in jobs}
+        if not by_key:
+            return []
+        now = time.time()
+        with self._lock, self.conn:
+            seen = set()
+            keys = list(by_key)
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                seen.update(row[0] for row in self.conn.execute(
+                    f"SELECT job_key FROM alert_seen WHERE query_key = ? AND job_key IN ({','.join('?' * len(chunk))})",
+                    [key, *chunk],
+                ))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO alert_seen (query_key, job_key, seen_at) VALUES (?, ?, ?)",
+                [(key, job_key, now) for job_key in keys],
+            )
+        return [job for job_key, job in by_key.items() if job_key not in seen]
+
+    def prune_seen(self, older_than: float) -> int:
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM alert_seen WHERE seen_at < ?", (older_than,)).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM saved_searches").fetchone()[0]
+
+
+class LogNotifier:
+    """Delivers one digest per recipient per cycle; swap in an email/webhook sender."""
+
+    async def send_batch(self, digests: dict[str, list[dict]]):
+        for email, alerts in digests.items():
+            print(f"Alert sent to {email}: {len(alerts)} new matching jobs")
+
+
+def explain_match(resume_text: str, job: dict) -> str:
+    shared = sorted(set(tokenize(resume_text)) & set(tokenize(job_text(job))), key=len, reverse=True)
+    if not shared:
+        return "Strong semantic similarity to your resume"
+    return "Shared keywords: " + ", ".join(shared[:5])
+
 
 class JobAlertSystem:
-    async def setup_job_monitoring(self, user_profile, search_criteria):
+    """
+    One scheduler for every saved search. Searches with the same normalized
+    (keywords, location) share a single scrape per cycle; a heap keyed by due time
+    decides which distinct queries run next. Only jobs not seen before for a query
+    are scored, in one matrix product against every subscriber's cached resume
+    embedding, and each recipient gets a single digest per cycle. Cost per cycle
+    follows distinct queries and new jobs, not the number of users.
+    """
+
+    def __init__(
+        self,
+        store: AlertStore = None,
+        search_engine=None,
+        matcher=None,
+        notifier=None,
+        max_concurrent_queries: int = settings.ALERT_MAX_CONCURRENT_QUERIES,
+    ):
+        self.store = store or AlertStore()
+        self._search_engine = search_engine
+        self._matcher = matcher
+        self.notifier = notifier or LogNotifier()
+        self.max_concurrent_queries = max_concurrent_queries
+        self._heap = []  # (next_due, query_key)
+        self._due = {}   # query_key -> next_due; heap entries that disagree are stale
+        self._loaded = False
+        self._wakeup = None
+        self.stats = {"cycles": 0, "queries_run": 0, "new_jobs": 0, "alerts": 0, "digests": 0}
+
+    # Built on first use so importing this module stays cheap
+    @property
+    def matcher(self):
+        if self._matcher is None:
+            from apps.services.match_engine import JobMatchResumeMCP
+            self._matcher = JobMatchResumeMCP()
+        return self._matcher
+
+    @property
+    def search_engine(self):
+        return self._search_engine or self.matcher.job_engine
+
+    async def _load(self):
+        if not self._loaded:
+            for next_due, key, _ in await asyncio.to_thread(self.store.schedule):
+                self._push(key, next_due)
+            self._loaded = True
+
+    def _push(self, key: str, next_due: float):
+        current = self._due.get(key)
+        if current is not None and current <= next_due:
+            return
+        self._due[key] = next_due
+        heapq.heappush(self._heap, (next_due, key))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # --- Saved searches ---
+    async def subscribe(
+        self,
+        user_id: str,
+        email: str,
+        keywords: str,
+        location: str,
+        resume_text: str,
+        min_score: float = settings.ALERT_MIN_SCORE,
+        interval: float = settings.ALERT_INTERVAL,
+    ) -> int:
+        """Saves the search off the loop, then schedules its query on it (waking the scheduler task)."""
+        await self._load()
+        now = time.time()
+        search_id = await asyncio.to_thread(
+            self.store.add, user_id, email, keywords, location, resume_text, min_score, interval, now
+        )
+        self._push(query_key(keywords, location), now)
+        return search_id
+
+    async def unsubscribe(self, search_id: int) -> bool:
+        # The query's heap entry stays; a cycle with no subscribers left just drops it
+        return await asyncio.to_thread(self.store.remove, search_id)
+
+    async def setup_job_monitoring(self, user_profile, search_criteria) -> int:
+        """Registers a saved search with the shared scheduler instead of looping per user."""
+        return await self.subscribe(
+            user_id=getattr(user_profile, "user_id", None) or user_profile.email,
+            email=user_profile.email,
+            keywords=search_criteria["keywords"],
+            location=search_criteria.get("location", ""),
+            resume_text=user_profile.resume,
+        )
+
+    # --- Cycles ---
+    def _pop_due(self, now: float) -> list[str]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_due, key = heapq.heappop(self._heap)
+            if self._due.get(key) == next_due:
+                del self._due[key]
+                due.append(key)
+        return due
+
+    async def run_due(self, now: float = None) -> dict:
+        await self._load()
+        now = now or time.time()
+        keys = self._pop_due(now)
+        self.stats["cycles"] += 1
+        if not keys:
+            return {}
+
+        limit = asyncio.Semaphore(self.max_concurrent_queries)
+
+        async def run_query(key):
+            async with limit:
+                try:
+                    return await self._run_query(key, now)
+                except Exception as e:
+                    print(f"Alert query '{key}' failed: {e}")
+                    subscribers = await asyncio.to_thread(self.store.subscribers, key)
+                    if subscribers:
+                        await self._reschedule(key, subscribers, now)
+                    return {}
+
+        digests = defaultdict(list)
+        for result in await asyncio.gather(*(run_query(key) for key in keys)):
+            for email, alerts in result.items():
+                digests[email].extend(alerts)
+
+        batch_size = settings.ALERT_NOTIFY_BATCH
+        emails = list(digests)
+        for start in range(0, len(emails), batch_size):
+            await self.notifier.send_batch({email: digests[email] for email in emails[start:start + batch_size]})
+        self.stats["digests"] += len(digests)
+        await asyncio.to_thread(self.store.prune_seen, time.time() - settings.ALERT_SEEN_TTL)
+        return dict(digests)
+
+    async def _reschedule(self, key: str, subscribers: list[dict], now: float):
+        next_due = now + min(s["interval"] for s in subscribers)
+        await asyncio.to_thread(self.store.set_next_due, key, next_due)
+        self._push(key, next_due)
+
+    async def _run_query(self, key: str, now: float) -> dict[str, list[dict]]:
+        subscribers = await asyncio.to_thread(self.store.subscribers, key)
+        if not subscribers:
+            return {}
+        await self._reschedule(key, subscribers, now)
+        self.stats["queries_run"] += 1
+
+        # Subscribers share a query key, so any one's criteria stand for all of them
+        criteria = subscribers[0]
+        jobs = await self.search_engine.search_all_platforms(criteria["keywords"], criteria["location"])
+        new_jobs = await asyncio.to_thread(self.store.diff_new, key, jobs)
+        self.stats["new_jobs"] += len(new_jobs)
+        if not new_jobs:
+            return {}
+
+        scores = await asyncio.to_thread(self._score, subscribers, new_jobs)
+        digests = defaultdict(list)
+        for subscriber, row in zip(subscribers, scores):
+            for job, score in zip(new_jobs, row):
+                if score >= subscriber["min_score"]:
+                    digests[subscriber["email"]].append({
+                        "search_id": subscriber["search_id"],
+                        "job": job,
+                        "match_score": round(float(score), 4),
+                        "why_good_match": explain_match(subscriber["resume_text"], job),
+                    })
+        self.stats["alerts"] += sum(len(alerts) for alerts in digests.values())
+        return digests
+
+    def _score(self, subscribers: list[dict], jobs: list[dict]):
+        # Resume vectors come from the embedding cache after a subscriber's first cycle
+        resumes = normalize_rows(self.matcher.embed([s["resume_text"] for s in subscribers]))
+        job_matrix = normalize_rows(self.matcher.embed([job_text(job) for job in jobs]))
+        return resumes @ job_matrix.T
+
+    def stats_snapshot(self) -> dict:
+        return {
+            "saved_searches": self.store.count(),
+            "scheduled_queries": len(self._due),
+            "next_due_in_s": round(max(0.0, min(self._due.values()) - time.time()), 1) if self._due else None,
+            **self.stats,
+        }
+
+    async def run(self, poll_interval: float = settings.ALERT_POLL_INTERVAL):
+        """Sleeps until the earliest due query (or a new subscription), then runs a cycle."""
+        await self._load()
+        self._wakeup = asyncio.Event()
         while True:
-            new_jobs = await self.search_new_jobs(search_criteria)
-            if new_jobs:
-                for job in new_jobs:
-                    match_score = await self.calculate_match_score(user_profile, job)
-                    if match_score > 0.8:
-                        optimized_resume = await self.optimize_resume_for_job(user_profile.resume, job)
-                        await self.send_job_alert(user_profile.email, {
-                            "job": job,
-                            "match_score": match_score,
-                            "optimized_resume": optimized_resume,
-                            "why_good_match": await self.explain_match(user_profile, job)
-                        })
-            await asyncio.sleep(3600)
-
-    # Placeholder methods
-    async def search_new_jobs(self, criteria): return []
-    async def calculate_match_score(self, user_profile, job): return 0.9
-    async def optimize_resume_for_job(self, resume, job): return resume
-    async def send_job_alert(self, email, alert_data): print(f"Alert sent to {email}")
-    async def explain_match(self, user_profile, job): return "Strong keyword and skill overlap"
+            delay = poll_interval if not self._heap else max(0.0, min(poll_interval, self._heap[0][0] - time.time()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.run_due()
+            except Exception as e:
+                print(f"Alert cycle failed: {e}")
+
+
+# --- Shared scheduler ---
+job_alerts = JobAlertSystem()
@@ -1,15 +1,220 @@
+# ats_checker.py (Model-free ATS scoring: keyword automaton + structure and formatting heuristics)
+
+import re
+import threading
+from collections import OrderedDict
+
+from apps.services.skill_dictionary import SkillAutomaton, skill_automaton
+from apps.text_utils import text_hash
+from config import settings
+
+# Heading -> section; a line counts as a heading when it is short and starts with one of these
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "objective", "about me", "professional summary"),
+    "experience": ("experience", "work experience", "employment", "work history", "professional experience"),
+    "education": ("education", "academic", "qualifications"),
+    "skills": ("skills", "technical skills", "core competencies", "technologies"),
+    "projects": ("projects", "personal projects"),
+    "certifications": ("certifications", "certificates", "licenses"),
+}
+REQUIRED_SECTIONS = ("experience", "education", "skills")
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{8,}\d")
+_DATE_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_TABLE_RE = re.compile(r"\|.*\||\t.*\t")
+_FANCY_BULLETS = "•●▪■◆►✓✔➢➤★☆◦"
+_FANCY_BULLET_RE = re.compile(f"[{_FANCY_BULLETS}]")
+_HEADING_RE = re.compile(r"^[\W_]*([A-Za-z][A-Za-z &/]{1,40}?)[\s:]*$")
+
+
+class ResumeProfile:
+    """Everything about a resume the scorer needs, computed once per resume."""
+
+    __slots__ = ("skills", "sections", "formatting", "format_issues", "has_contact")
+
+    def __init__(self, text: str, automaton: SkillAutomaton):
+        self.skills = automaton.find(text)
+        self.sections = detect_sections(text)
+        self.has_contact = bool(_EMAIL_RE.search(text) or _PHONE_RE.search(text))
+        self.formatting, self.format_issues = formatting_score(text)
+
+
+class JobProfile:
+    """Job keywords weighted by mentions in the description (capped at 3), plus 2 for skills in the title."""
+
+    __slots__ = ("weights", "total")
+
+    def __init__(self, job: dict, automaton: SkillAutomaton):
+        self.weights = {skill: min(count, 3) for skill, count in automaton.counts(job.get("description", "")).items()}
+        for skill in automaton.find(job.get("title", "")):
+            self.weights[skill] = self.weights.get(skill, 0) + 2
+        self.total = sum(self.weights.values())
+
+
+def detect_sections(text: str) -> set[str]:
+    found = set()
+    for line in (text or "").splitlines():
+        match = _HEADING_RE.match(line.strip())
+        if not match:
+            continue
+        heading = match.group(1).strip().lower()
+        for section, names in SECTION_HEADINGS.items():
+            if heading.startswith(names):
+                found.add(section)
+    return found
+
+
+def formatting_score(text: str) -> tuple[float, list[str]]:
+    """Starts at 1.0 and subtracts a penalty for each layout ATS parsers tend to mangle."""
+    lines = [line for line in (text or "").splitlines() if line.strip()]
+    words = len((text or "").split())
+    score, issues = 1.0, []
+    if sum(bool(_TABLE_RE.search(line)) for line in lines) >= 3:
+        score -= 0.3
+        issues.append("Avoid tables and multi-column layouts; ATS parsers read them out of order")
+    if _FANCY_BULLET_RE.search(text or ""):
+        score -= 0.1
+        issues.append("Use plain '-' bullets instead of symbols")
+    if words < 150:
+        score -= 0.2
+        issues.append("Resume is very short; describe your experience in more detail")
+    elif words > 1200:
+        score -= 0.1
+        issues.append("Resume is long; keep it to the most relevant two pages")
+    letters = [c for c in text or "" if c.isalpha()]
+    if letters and sum(c.isupper() for c in letters) / len(letters) > 0.3:
+        score -= 0.1
+        issues.append("Avoid writing whole paragraphs in capitals")
+    if not _DATE_RE.search(text or ""):
+        score -= 0.1
+        issues.append("Add dates (years) to your roles and education")
+    return max(score, 0.0), issues
+
+
+def ats_friendly(text: str) -> str:
+    """Plain bullets, no table pipes or tabs, single spaces, no blank-line runs."""
+    lines = []
+    for line in (text or "").splitlines():
+        line = _FANCY_BULLET_RE.sub("-", line).replace("|", " ").replace("\t", " ")
+        line = " ".join(line.split())
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
 class ATSChecker:
-    async def analyze_ats_compatibility(self, resume_text, job_description):
+    """
+    Scores a resume against a job with no model: the job's skills (found by the
+    shared Aho–Corasick skill automaton, weighted by how often the job mentions
+    them) are checked against the resume's, and section and formatting
+    heuristics are added with ATS_WEIGHTS. Job profiles are cached by text hash,
+    so scoring one resume against many jobs costs set lookups per pair.
+    """
+
+    def __init__(self, weights: dict = None, automaton: SkillAutomaton = None,
+                 max_entries: int = settings.ATS_JOB_CACHE_MAX_ENTRIES):
+        self.weights = weights or settings.ATS_WEIGHTS
+        self._automaton = automaton
+        self.max_entries = max_entries
+        self._jobs = OrderedDict()  # job text hash -> JobProfile
+        self._lock = threading.Lock()
+
+    @property
+    def automaton(self) -> SkillAutomaton:
+        return self._automaton or skill_automaton()
+
+    def resume_profile(self, resume_text: str) -> ResumeProfile:
+        return ResumeProfile(resume_text or "", self.automaton)
+
+    @staticmethod
+    def _job_key(job: dict) -> str:
+        return text_hash(f"{job.get('title', '')}\n{job.get('description', '')}")
+
+    def cached_job_profiles(self, jobs: list[dict]) -> list:
+        """Cached profile per job, None where there is none yet."""
+        with self._lock:
+            profiles = []
+            for job in jobs:
+                key = self._job_key(job)
+                profile = self._jobs.get(key)
+                if profile is not None:
+                    self._jobs.move_to_end(key)
+                profiles.append(profile)
+            return profiles
+
+    def store_job_profiles(self, jobs: list[dict], profiles: list):
+        with self._lock:
+            for job, profile in zip(jobs, profiles):
+                self._jobs[self._job_key(job)] = profile
+            while len(self._jobs) > self.max_entries:
+                self._jobs.popitem(last=False)
+
+    def job_profile(self, job: dict) -> JobProfile:
+        profile = self.cached_job_profiles([job])[0]
+        if profile is None:
+            profile = JobProfile(job, self.automaton)
+            self.store_job_profiles([job], [profile])
+        return profile
+
+    @staticmethod
+    def structure_score(resume: ResumeProfile) -> float:
+        """Share of the required sections present (80%) plus contact details (20%)."""
+        return (
+            sum(section in resume.sections for section in REQUIRED_SECTIONS) / len(REQUIRED_SECTIONS) * 0.8
+            + 0.2 * resume.has_contact
+        )
+
+    def _components(self, resume: ResumeProfile, job: JobProfile) -> dict:
+        matched = sum(weight for skill, weight in job.weights.items() if skill in resume.skills)
+        return {
+            "keywords": matched / job.total if job.total else 1.0,
+            "structure": self.structure_score(resume),
+            "formatting": resume.formatting,
+        }
+
+    def combine(self, detailed: dict):
+        """ATS_WEIGHTS-weighted mean of the component scores; works on floats and NumPy arrays alike."""
+        return sum(self.weights[name] * value for name, value in detailed.items()) / sum(self.weights.values())
+
+    def fit(self, resume: ResumeProfile, job: JobProfile) -> float:
+        """Weighted overall score in [0, 1]."""
+        return self.combine(self._components(resume, job))
+
+    def score(self, resume: ResumeProfile, job: JobProfile) -> dict:
+        detailed = self._components(resume, job)
+        matched = [skill for skill in job.weights if skill in resume.skills]
         return {
-            "overall_score": 0.8,
-            "detailed_scores": {
-                "formatting": 0.9,
-                "keywords": 0.7,
-                "structure": 0.8
-            },
-            "improvements": [
-                "Use simpler formatting",
-                "Add more relevant keywords"
-            ],
-            "ats_friendly_version": "Sanitized resume text"
-        }
\ No newline at end of file
+            "overall_score": round(self.fit(resume, job), 3),
+            "detailed_scores": {name: round(value, 3) for name, value in detailed.items()},
+            "matched_keywords": sorted(matched, key=lambda skill: -job.weights[skill]),
+            "missing_keywords": sorted((s for s in job.weights if s not in resume.skills), key=lambda s: -job.weights[s]),
+        }
+
+    def rank_jobs(self, resume_text: str, jobs: list[dict], top_k: int = None) -> list[tuple[dict, float]]:
+        """Jobs ordered by ATS fit for one resume, best first."""
+        resume = self.resume_profile(resume_text)
+        scored = [(job, self.fit(resume, self.job_profile(job))) for job in jobs]
+        scored.sort(key=lambda pair: -pair[1])
+        return scored[:top_k] if top_k else scored
+
+    async def analyze_ats_compatibility(self, resume_text, job_description):
+        job = job_description if isinstance(job_description, dict) else {"description": job_description}
+        resume = self.resume_profile(resume_text)
+        result = self.score(resume, self.job_profile(job))
+
+        improvements = [f"Add '{skill}' if you have used it; the job asks for it" for skill in result["missing_keywords"][:5]]
+        improvements += [
+            f"Add a clearly labelled '{section.title()}' section"
+            for section in REQUIRED_SECTIONS if section not in resume.sections
+        ]
+        if not resume.has_contact:
+            improvements.append("Include an email address or phone number")
+        improvements += resume.format_issues
+        result["improvements"] = improvements
+        result["ats_friendly_version"] = ats_friendly(resume_text)
+        return result
+
+
+# --- Shared checker (its job-profile cache serves every caller) ---
+ats_checker = ATSChecker()
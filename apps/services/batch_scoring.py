@@ -0,0 +1,359 @@
+# batch_scoring.py (Bulk resume-vs-jobs / resumes-vs-job scoring with resumable, checkpointed batches)
+
+import asyncio
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from apps.services.ats_checker import ATSChecker, ats_checker
+from apps.services.embeddings import job_text, normalize_rows
+from config import settings
+
+RESUME_VS_JOBS = "resume_vs_jobs"
+RESUMES_VS_JOB = "resumes_vs_job"
+
+
+def _build_profiles(kind: str, items: list) -> list:
+    """Runs in a pool worker: ATS profiles for a chunk of resume texts or job dicts."""
+    if kind == "resume":
+        return [ats_checker.resume_profile(text) for text in items]
+    return [ats_checker.job_profile(job) for job in items]
+
+
+class BatchStore:
+    """Batch runs and their per-row results, so an interrupted batch resumes where it stopped."""
+
+    def __init__(self, path: str = settings.BATCH_DB_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS batch_runs (
+                    batch_id TEXT PRIMARY KEY,
+                    mode TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS batch_results (
+                    batch_id TEXT NOT NULL,
+                    row INTEGER NOT NULL,
+                    result TEXT NOT NULL,
+                    PRIMARY KEY (batch_id, row)
+                ) WITHOUT ROWID;
+            """)
+            self._conn = conn
+        return self._conn
+
+    def start(self, batch_id: str, mode: str, total: int) -> set[int]:
+        """Registers the run (or reopens it) and returns the rows already scored."""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                """INSERT INTO batch_runs (batch_id, mode, total, status, created_at, updated_at)
+                   VALUES (?, ?, ?, 'running', ?, ?)
+                   ON CONFLICT(batch_id) DO UPDATE SET
+                   status = 'running', total = excluded.total, updated_at = excluded.updated_at""",
+                (batch_id, mode, total, now, now),
+            )
+            return {row for row, in self.conn.execute("SELECT row FROM batch_results WHERE batch_id = ?", (batch_id,))}
+
+    def save(self, batch_id: str, results: list[dict]):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO batch_results (batch_id, row, result) VALUES (?, ?, ?)",
+                [(batch_id, result["row"], json.dumps(result)) for result in results],
+            )
+            self.conn.execute(
+                """UPDATE batch_runs SET updated_at = ?,
+                   done = (SELECT COUNT(*) FROM batch_results WHERE batch_id = ?) WHERE batch_id = ?""",
+                (time.time(), batch_id, batch_id),
+            )
+
+    def finish(self, batch_id: str, status: str):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE batch_runs SET status = ?, updated_at = ? WHERE batch_id = ?", (status, time.time(), batch_id)
+            )
+
+    def run(self, batch_id: str) -> dict | None:
+        with self._lock:
+            cursor = self.conn.execute("SELECT * FROM batch_runs WHERE batch_id = ?", (batch_id,))
+            row = cursor.fetchone()
+            return dict(zip([c[0] for c in cursor.description], row)) if row else None
+
+    def results_page(self, batch_id: str, after_row: int = -1, limit: int = 1000) -> list[dict]:
+        """Stored results with row > after_row, in row order."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT result FROM batch_results WHERE batch_id = ? AND row > ? ORDER BY row LIMIT ?",
+                (batch_id, after_row, limit),
+            ).fetchall()
+        return [json.loads(result) for result, in rows]
+
+    def prune(self, older_than: float) -> int:
+        with self._lock, self.conn:
+            stale = [batch_id for batch_id, in self.conn.execute(
+                "SELECT batch_id FROM batch_runs WHERE status != 'running' AND updated_at < ?", (older_than,)
+            )]
+            for batch_id in stale:
+                self.conn.execute("DELETE FROM batch_results WHERE batch_id = ?", (batch_id,))
+                self.conn.execute("DELETE FROM batch_runs WHERE batch_id = ?", (batch_id,))
+            return len(stale)
+
+
+class BatchScorer:
+    """
+    Scores one resume against many jobs, or many resumes against one job, without
+    the agent. Rows are handled in chunks: ATS profiles are built in a process pool
+    (job profiles already in the shared checker's cache are reused), each chunk is
+    scored as matrix products - a skill-weight matrix against a skill indicator
+    vector, and optionally embeddings (through the embedding cache) against the
+    anchor's vector - and the chunk's results are checkpointed before they are
+    streamed. Re-running a batch id replays stored rows and scores only the rest;
+    runs of the same batch id take turns, so a duplicate post replays instead of
+    scoring every row again.
+    """
+
+    def __init__(
+        self,
+        checker: ATSChecker = None,
+        store: BatchStore = None,
+        matcher=None,
+        workers: int = settings.BATCH_WORKERS,
+        chunk_size: int = settings.BATCH_CHUNK_SIZE,
+        pool_min_rows: int = settings.BATCH_POOL_MIN_ROWS,
+    ):
+        self.checker = checker or ats_checker
+        self.store = store or BatchStore()
+        self._matcher = matcher
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.pool_min_rows = pool_min_rows
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._running = {}  # batch id -> (lock, runs using it)
+        self.stats = {"batches": 0, "resumed": 0, "rows_scored": 0, "rows_replayed": 0, "job_profile_hits": 0,
+                      "semantic_fallbacks": 0}
+
+    # Built on first use so importing this module stays cheap
+    @property
+    def matcher(self):
+        if self._matcher is None:
+            from apps.services.match_engine import JobMatchResumeMCP
+            self._matcher = JobMatchResumeMCP()
+        return self._matcher
+
+    @property
+    def pool(self) -> ProcessPoolExecutor | None:
+        # On a single core the workers only add pickling and process switches
+        if self.workers <= 0 or (os.cpu_count() or 1) < 2:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    # --- Profiles ---
+    async def _profiles(self, kind: str, items: list) -> list:
+        if not items:
+            return []
+        # A job profile costs less to build than to pickle to a worker and back, and so
+        # does a small chunk of resumes (benchmarks/bench_batch_profiles.py)
+        if kind == "resume" and len(items) >= self.pool_min_rows:
+            pool = self.pool
+            if pool is not None:
+                return await self._pooled(pool, kind, items)
+        return await asyncio.to_thread(_build_profiles, kind, items)
+
+    async def _pooled(self, pool: ProcessPoolExecutor, kind: str, items: list) -> list:
+        # One slice per worker, so every process works on the chunk at once
+        loop = asyncio.get_running_loop()
+        size = -(-len(items) // self.workers)
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(pool, _build_profiles, kind, items[start:start + size])
+            for start in range(0, len(items), size)
+        ))
+        return [profile for part in parts for profile in part]
+
+    async def _job_profiles(self, jobs: list[dict]) -> list:
+        profiles = self.checker.cached_job_profiles(jobs)
+        missing = [i for i, profile in enumerate(profiles) if profile is None]
+        self.stats["job_profile_hits"] += len(jobs) - len(missing)
+        if missing:
+            built = await self._profiles("job", [jobs[i] for i in missing])
+            self.checker.store_job_profiles([jobs[i] for i in missing], built)
+            for i, profile in zip(missing, built):
+                profiles[i] = profile
+        return profiles
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        return normalize_rows(np.asarray(self.matcher.embed(texts), dtype=np.float32))
+
+    # --- Scoring ---
+    def _rows(self, rows, ids, resumes, jobs, keywords, structure, formatting, semantic) -> list[dict]:
+        overall = self.checker.combine({"keywords": keywords, "structure": structure, "formatting": formatting})
+        limit = settings.BATCH_MISSING_KEYWORDS
+        results = []
+        for i, (row, item_id, resume, job) in enumerate(zip(rows, ids, resumes, jobs)):
+            ranked = sorted(job.weights, key=lambda skill: -job.weights[skill])
+            result = {
+                "row": row,
+                "id": item_id,
+                "ats_score": round(float(overall[i]), 4),
+                "keyword_score": round(float(keywords[i]), 4),
+                "matched_keywords": [skill for skill in ranked if skill in resume.skills],
+                "missing_keywords": [skill for skill in ranked if skill not in resume.skills][:limit],
+            }
+            if semantic is not None:
+                result["match_score"] = round(float(semantic[i]), 4)
+            results.append(result)
+        return results
+
+    def _score_jobs(self, resume, resume_vector, rows, jobs, profiles) -> list[dict]:
+        # Jobs x skills weight matrix against the resume's skill indicator vector
+        skills = sorted({skill for profile in profiles for skill in profile.weights})
+        column = {skill: j for j, skill in enumerate(skills)}
+        weights = np.zeros((len(jobs), len(skills)), dtype=np.float32)
+        for i, profile in enumerate(profiles):
+            for skill, weight in profile.weights.items():
+                weights[i, column[skill]] = weight
+        indicator = np.array([skill in resume.skills for skill in skills], dtype=np.float32)
+        totals = weights.sum(axis=1)
+        keywords = np.where(totals > 0, (weights @ indicator) / np.maximum(totals, 1e-12), 1.0)
+        semantic = self._embed([job_text(job) for job in jobs]) @ resume_vector if resume_vector is not None else None
+
+        ids = [job.get("id", row) for row, job in zip(rows, jobs)]
+        results = self._rows(
+            rows, ids, [resume] * len(jobs), profiles, keywords,
+            np.full(len(jobs), self.checker.structure_score(resume)), np.full(len(jobs), resume.formatting), semantic,
+        )
+        for result, job in zip(results, jobs):
+            result["title"], result["company"] = job.get("title", ""), job.get("company", "")
+        return results
+
+    def _score_resumes(self, job, job_vector, rows, items, texts, profiles) -> list[dict]:
+        # Resumes x skills indicator matrix against the job's skill weight vector
+        skills = list(job.weights)
+        weights = np.array([job.weights[skill] for skill in skills], dtype=np.float32)
+        indicator = np.zeros((len(profiles), len(skills)), dtype=np.float32)
+        for i, profile in enumerate(profiles):
+            indicator[i] = [skill in profile.skills for skill in skills]
+        keywords = (indicator @ weights) / job.total if job.total else np.ones(len(profiles))
+        semantic = self._embed(texts) @ job_vector if job_vector is not None else None
+
+        ids = [item.get("id", row) if isinstance(item, dict) else row for row, item in zip(rows, items)]
+        return self._rows(
+            rows, ids, profiles, [job] * len(profiles), keywords,
+            np.array([self.checker.structure_score(p) for p in profiles]),
+            np.array([p.formatting for p in profiles]), semantic,
+        )
+
+    # --- Runs ---
+    async def run(self, batch_id: str, mode: str, anchor, items: list, semantic: bool = settings.BATCH_SEMANTIC):
+        """
+        Async generator of result rows (dicts with "row" = position in `items`).
+        `anchor` is the resume text (RESUME_VS_JOBS, items are job dicts) or the job
+        dict (RESUMES_VS_JOB, items are resume texts or {"id", "resume_text"} dicts).
+        """
+        lock, users = self._running.get(batch_id, (asyncio.Lock(), 0))
+        self._running[batch_id] = (lock, users + 1)
+        try:
+            async with lock:
+                results = self._run(batch_id, mode, anchor, items, semantic)
+                try:
+                    async for result in results:
+                        yield result
+                finally:
+                    # Close an abandoned run now, so it is marked interrupted before the next one starts
+                    await results.aclose()
+        finally:
+            lock, users = self._running[batch_id]
+            if users == 1:
+                del self._running[batch_id]
+            else:
+                self._running[batch_id] = (lock, users - 1)
+
+    async def _run(self, batch_id, mode, anchor, items, semantic):
+        done = await asyncio.to_thread(self.store.start, batch_id, mode, len(items))
+        self.stats["batches"] += 1
+        if done:
+            self.stats["resumed"] += 1
+            async for result in self._replay(batch_id):
+                yield result
+
+        pending = [row for row in range(len(items)) if row not in done]
+        try:
+            if mode == RESUME_VS_JOBS:
+                resume, anchor_text = self.checker.resume_profile(anchor), anchor
+            else:
+                job, anchor_text = self.checker.job_profile(anchor), job_text(anchor)
+            vector = None
+            if semantic and pending:
+                try:
+                    vector = (await asyncio.to_thread(self._embed, [anchor_text]))[0]
+                except Exception as e:
+                    # The embedding model failed to load or run: score ATS fit alone and flag the rows
+                    print(f"Batch {batch_id} falls back to ATS-only scoring: {e}")
+                    self.stats["semantic_fallbacks"] += 1
+            fallback = semantic and vector is None
+
+            for start in range(0, len(pending), self.chunk_size):
+                rows = pending[start:start + self.chunk_size]
+                chunk = [items[row] for row in rows]
+                if mode == RESUME_VS_JOBS:
+                    profiles = await self._job_profiles(chunk)
+                    results = await asyncio.to_thread(self._score_jobs, resume, vector, rows, chunk, profiles)
+                else:
+                    texts = [item.get("resume_text", "") if isinstance(item, dict) else item for item in chunk]
+                    profiles = await self._profiles("resume", texts)
+                    results = await asyncio.to_thread(self._score_resumes, job, vector, rows, chunk, texts, profiles)
+                if fallback:
+                    for result in results:
+                        result["semantic_fallback"] = True
+                await asyncio.to_thread(self.store.save, batch_id, results)
+                self.stats["rows_scored"] += len(results)
+                for result in results:
+                    yield result
+        except BaseException:
+            # Disconnects land here too; scored chunks are already stored for the next attempt
+            await asyncio.shield(asyncio.to_thread(self.store.finish, batch_id, "interrupted"))
+            raise
+        await asyncio.to_thread(self.store.finish, batch_id, "done")
+        await asyncio.to_thread(self.store.prune, time.time() - settings.BATCH_RESULT_TTL)
+
+    async def _replay(self, batch_id: str):
+        after_row = -1
+        while True:
+            page = await asyncio.to_thread(self.store.results_page, batch_id, after_row, self.chunk_size)
+            if not page:
+                return
+            self.stats["rows_replayed"] += len(page)
+            for result in page:
+                yield result
+            after_row = page[-1]["row"]
+
+
+# --- Shared scorer ---
+batch_scorer = BatchScorer()
+atexit.register(batch_scorer.close)
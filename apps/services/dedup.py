@@ -0,0 +1,154 @@
+# dedup.py (Near-duplicate job detection with MinHash + LSH)
+
+import re
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from apps.text_utils import tokenize
+from config import settings
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "pvt", "private", "plc", "gmbh"}
+_LOCATION_NOISE = {"us", "usa", "united", "states", "india", "uk", "hybrid", "onsite", "on-site"}
+_PROVENANCE_FIELDS = ("source", "id", "url")
+
+
+def normalize_company(company: str) -> str:
+    return " ".join(t for t in tokenize(company) if t not in _COMPANY_SUFFIXES)
+
+
+def normalize_location(location: str) -> str:
+    """'Remote - US', 'Remote (USA)' -> 'remote'; 'Pune, Maharashtra' -> 'pune'."""
+    tokens = tokenize(location)
+    if "remote" in tokens:
+        return "remote"
+    city = re.split(r"\s[-|]\s|[,(]", location or "", maxsplit=1)[0]
+    return " ".join(t for t in tokenize(city) if t not in _LOCATION_NOISE)
+
+
+def shingles(job: dict) -> set[str]:
+    """Title unigrams and bigrams, plus word 3-shingles of the description."""
+    title = tokenize(job.get("title", ""))
+    words = tokenize(job.get("description", ""))
+    found = {f"t:{t}" for t in title}
+    found.update(f"t:{a} {b}" for a, b in zip(title, title[1:]))
+    found.update(f"d:{a} {b} {c}" for a, b, c in zip(words, words[1:], words[2:]))
+    return found
+
+
+def provenance(job: dict, source: str = None) -> dict:
+    entry = {key: job.get(key) for key in _PROVENANCE_FIELDS}
+    entry["source"] = entry["source"] or source
+    return entry
+
+
+class DedupIndex:
+    """
+    Incremental near-duplicate index. Each job gets a MinHash signature over its
+    shingles; signatures are split into `bands` LSH buckets so only jobs sharing a
+    bucket are compared, which keeps insertion close to constant time. A candidate
+    is a duplicate when its estimated Jaccard similarity reaches `threshold` and its
+    normalized company and location agree.
+
+    Duplicates are merged into the first record seen, which collects every
+    (source, id, url) it was found under in `record["sources"]`.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = settings.DEDUP_NUM_PERM,
+        bands: int = settings.DEDUP_BANDS,
+        threshold: float = settings.DEDUP_THRESHOLD,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._buckets = [{} for _ in range(bands)]  # band -> {band signature bytes: [record index]}
+        self.records: list[dict] = []
+        self._signatures: list[np.ndarray] = []
+        self._keys: list[tuple] = []
+        self.stats = {"added": 0, "merged": 0, "candidates": 0}
+
+    def signature(self, job: dict) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) for s in shingles(job)), dtype=np.int64
+        ) % _MERSENNE_PRIME
+        if not len(hashes):
+            hashes = np.zeros(1, dtype=np.int64)
+        # (a*x + b) mod p stays below 2**62, so int64 never overflows
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _find_duplicate(self, signature: np.ndarray, band_keys: list[bytes], key: tuple) -> Optional[int]:
+        candidates = set()
+        for band, band_key in enumerate(band_keys):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        self.stats["candidates"] += len(candidates)
+        for index in sorted(candidates):
+            company, location = self._keys[index]
+            if company and key[0] and company != key[0]:
+                continue
+            if location and key[1] and location != key[1]:
+                continue
+            if np.mean(self._signatures[index] == signature) >= self.threshold:
+                return index
+        return None
+
+    def add(self, job: dict, source: str = None) -> tuple[dict, bool]:
+        """Returns (record, is_new); a duplicate is merged into the existing record."""
+        self.stats["added"] += 1
+        signature = self.signature(job)
+        band_keys = self._band_keys(signature)
+        key = (normalize_company(job.get("company", "")), normalize_location(job.get("location", "")))
+
+        index = self._find_duplicate(signature, band_keys, key)
+        if index is not None:
+            self.stats["merged"] += 1
+            record = self.records[index]
+            _merge(record, job, source)
+            return record, False
+
+        record = {**job, "sources": [provenance(job, source)]}
+        index = len(self.records)
+        self.records.append(record)
+        self._signatures.append(signature)
+        self._keys.append(key)
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band].setdefault(band_key, []).append(index)
+        return record, True
+
+    def add_many(self, jobs: list[dict], source: str = None) -> list[dict]:
+        """Adds jobs and returns the records that were new."""
+        new_records = []
+        for job in jobs:
+            record, is_new = self.add(job, source)
+            if is_new:
+                new_records.append(record)
+        return new_records
+
+
+def _merge(record: dict, job: dict, source: str = None):
+    entry = provenance(job, source)
+    if entry not in record["sources"]:
+        record["sources"].append(entry)
+    for field, value in job.items():
+        if field == "sources":
+            continue
+        if not record.get(field):
+            record[field] = value
+    if len(job.get("description") or "") > len(record.get("description") or ""):
+        record["description"] = job["description"]
+
+
+def deduplicate_jobs(jobs: list[dict], **options) -> list[dict]:
+    return DedupIndex(**options).add_many(jobs)
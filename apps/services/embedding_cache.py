@@ -0,0 +1,181 @@
+# embedding_cache.py (Content-addressed cache for embeddings and extracted skills)
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from config import settings
+
+
+def text_key(text: str, model_name: str) -> str:
+    normalized = " ".join((text or "").split())
+    return hashlib.sha256(f"{model_name}\0{normalized}".encode()).hexdigest()
+
+
+def _connect(directory: str) -> sqlite3.Connection:
+    os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class EmbeddingCache:
+    """
+    Vectors live in a memory-mapped float32 matrix on disk (one file per model);
+    a SQLite table maps text keys to matrix rows. Reads come straight from the map.
+    """
+
+    def __init__(self, model_name: str, directory: str = settings.EMBEDDING_CACHE_DIR, initial_rows: int = 1024):
+        self.model_name = model_name
+        self.directory = directory
+        self.initial_rows = initial_rows
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.path = os.path.join(directory, f"{slug}.f32")
+        self._lock = threading.Lock()
+        self._conn = None
+        self._matrix = None
+        self.dim = None
+        self.count = 0
+
+    def _open(self):
+        if self._conn is not None:
+            return
+        self._conn = _connect(self.directory)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS vectors (model TEXT, key TEXT, row INTEGER, PRIMARY KEY (model, key));
+            CREATE TABLE IF NOT EXISTS vector_meta (model TEXT PRIMARY KEY, dim INTEGER, count INTEGER);
+        """)
+        meta = self._conn.execute("SELECT dim, count FROM vector_meta WHERE model = ?", (self.model_name,)).fetchone()
+        if meta and os.path.exists(self.path) and os.path.getsize(self.path) >= 4 * meta[0] * meta[1]:
+            self.dim, self.count = meta
+            capacity = os.path.getsize(self.path) // (4 * self.dim)
+            self._matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        elif meta:
+            # The matrix file is gone or cut short, so the indexed rows are lost: start over
+            with self._conn:
+                self._conn.execute("DELETE FROM vectors WHERE model = ?", (self.model_name,))
+                self._conn.execute("DELETE FROM vector_meta WHERE model = ?", (self.model_name,))
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _ensure_capacity(self, rows_needed: int):
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows_needed <= capacity:
+            return
+        new_capacity = max(self.initial_rows, capacity * 2, rows_needed)
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+        with open(self.path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self._matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim))
+
+    def _lookup(self, keys: list[str]) -> dict:
+        rows = {}
+        unique = list(set(keys))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows.update(self._conn.execute(
+                f"SELECT key, row FROM vectors WHERE model = ? AND key IN ({','.join('?' * len(chunk))})",
+                [self.model_name, *chunk],
+            ).fetchall())
+        return rows
+
+    def _append(self, keys: list[str], vectors: np.ndarray) -> dict:
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        self._ensure_capacity(self.count + len(keys))
+        start = self.count
+        self._matrix[start:start + len(keys)] = vectors
+        self._matrix.flush()
+        self.count += len(keys)
+        rows = {key: start + i for i, key in enumerate(keys)}
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (model, key, row) VALUES (?, ?, ?)",
+                [(self.model_name, key, row) for key, row in rows.items()],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vector_meta (model, dim, count) VALUES (?, ?, ?)",
+                (self.model_name, self.dim, self.count),
+            )
+        return rows
+
+    def get_or_compute(self, texts: list[str], compute) -> np.ndarray:
+        """
+        Returns one row per text, calling `compute(missing_texts) -> np.ndarray`
+        only for texts whose vectors are not cached yet.
+        """
+        keys = [text_key(text, self.model_name) for text in texts]
+        with self._lock:
+            self._open()
+            rows = self._lookup(keys)
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in rows:
+                    missing.setdefault(key, text)
+
+        # The model runs outside the lock so cache hits are never stuck behind it
+        vectors = np.asarray(compute(list(missing.values())), dtype=np.float32) if missing else None
+
+        with self._lock:
+            if missing:
+                # Another caller may have stored some of these while the model ran
+                missing_keys = list(missing)
+                stored = self._lookup(missing_keys)
+                rows.update(stored)
+                new = [i for i, key in enumerate(missing_keys) if key not in stored]
+                if new:
+                    rows.update(self._append([missing_keys[i] for i in new], vectors[new]))
+            if not keys:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            return np.asarray(self._matrix[[rows[key] for key in keys]])
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._open()
+            return {"model": self.model_name, "vectors": self.count, "dim": self.dim}
+
+
+class SkillCache:
+    """Extracted skill sets keyed by text hash, persisted next to the embedding index."""
+
+    def __init__(self, model_name: str, directory: str = settings.EMBEDDING_CACHE_DIR):
+        self.model_name = model_name
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _open(self):
+        if self._conn is None:
+            self._conn = _connect(self.directory)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS skills (key TEXT PRIMARY KEY, skills TEXT NOT NULL)"
+            )
+
+    def get(self, text: str):
+        with self._lock:
+            self._open()
+            row = self._conn.execute(
+                "SELECT skills FROM skills WHERE key = ?", (text_key(text, self.model_name),)
+            ).fetchone()
+        return set(json.loads(row[0])) if row else None
+
+    def put(self, text: str, skills: set[str]):
+        with self._lock:
+            self._open()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO skills (key, skills) VALUES (?, ?)",
+                    (text_key(text, self.model_name), json.dumps(sorted(skills))),
+                )
+
+
+# --- Shared caches ---
+embedding_cache = EmbeddingCache(settings.TEXT_SIMILARITY_MODEL)
+skill_cache = SkillCache(settings.SKILL_EXTRACTION_MODEL)
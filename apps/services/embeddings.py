@@ -0,0 +1,58 @@
+# embeddings.py (Batched sentence embeddings + vectorized cosine scoring)
+
+import numpy as np
+import torch
+
+from config import settings
+
+
+def job_text(job: dict) -> str:
+    return " ".join(filter(None, (job.get("title"), job.get("company"), job.get("description"))))
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def embed_texts(
+    extractor,
+    texts: list[str],
+    batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+    max_length: int = settings.EMBEDDING_MAX_LENGTH,
+) -> np.ndarray:
+    """
+    Mean-pooled, L2-normalized embeddings from a feature-extraction pipeline's
+    model, run in padded batches. Texts are batched by length to keep padding low;
+    rows come back in input order.
+    """
+    tokenizer, model = extractor.tokenizer, extractor.model
+    matrix = np.zeros((len(texts), model.config.hidden_size), dtype=np.float32)
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            batch = tokenizer(
+                [texts[i] for i in rows],
+                padding=True, truncation=True, max_length=max_length, return_tensors="pt",
+            ).to(model.device)
+            hidden = model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            matrix[rows] = pooled.float().cpu().numpy()
+
+    return normalize_rows(matrix)
+
+
+def cosine_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine similarity of one normalized vector against every normalized row."""
+    return matrix @ query
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
@@ -0,0 +1,196 @@
+# generation.py (Tiered, budgeted and cached resume-tailoring text generation)
+
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+
+from apps.services.embeddings import job_text
+from apps.services.model_registry import ModelRegistry, model_registry
+from apps.text_utils import text_hash, tokenize
+from apps.tracing import traced
+from config import settings
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def clip_tokens(text: str, budget: int) -> str:
+    """Cuts text to roughly `budget` tokens (whitespace words) so prompt size stays bounded."""
+    words = (text or "").split()
+    return " ".join(words[:budget])
+
+
+def rank_sentences(resume_text: str, job: dict, limit: int) -> list[str]:
+    """Resume sentences ordered by how many of the job's terms they mention, best first."""
+    job_terms = set(tokenize(job_text(job)))
+    sentences = [s.strip(" -•*\t") for s in _SENTENCE_RE.split(resume_text or "")]
+    scored = [
+        (len(job_terms & set(tokenize(sentence))), -i, sentence)
+        for i, sentence in enumerate(sentences) if len(sentence.split()) >= 3
+    ]
+    scored.sort(reverse=True)
+    return [sentence for overlap, _, sentence in scored[:limit] if overlap]
+
+
+def build_prompt(resume_text: str, job: dict, matched_skills: list[str], max_input_tokens: int) -> str:
+    return (
+        "Rewrite the candidate's professional summary in 2-3 sentences for the job below. "
+        "Only use facts from the resume; lead with the matching skills.\n\n"
+        f"Job: {clip_tokens(job_text(job), max_input_tokens // 2)}\n\n"
+        f"Matching skills: {', '.join(matched_skills) or 'none'}\n\n"
+        f"Resume: {clip_tokens(resume_text, max_input_tokens // 2)}\n\n"
+        "Summary:"
+    )
+
+
+class TemplateGenerator:
+    """Extractive rewrite: no model, just the resume's own sentences reordered for the job."""
+
+    name = "template"
+
+    def __init__(self, max_sentences: int = settings.GENERATION_MAX_SENTENCES):
+        self.max_sentences = max_sentences
+
+    async def summary(self, resume_text: str, job: dict, matched_skills: list[str]) -> str:
+        role = job.get("title") or "this role"
+        company = f" at {job['company']}" if job.get("company") else ""
+        lead = f"Candidate for {role}{company}"
+        if matched_skills:
+            lead += f" with hands-on experience in {', '.join(matched_skills[:5])}"
+        best = rank_sentences(resume_text, job, 1)
+        return f"{lead}. {best[0]}" if best else f"{lead}."
+
+    def experience(self, resume_text: str, job: dict) -> list[str]:
+        return rank_sentences(resume_text, job, self.max_sentences)
+
+
+class LocalModelGenerator(TemplateGenerator):
+    """
+    Summary from a small local instruction model (TEXT_GENERATION_MODEL through the
+    model registry), dynamically quantized to int8 on CPU when GENERATION_QUANTIZE
+    is set. Calls are serialized: one forward pass at a time keeps memory flat.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        registry: ModelRegistry = model_registry,
+        max_input_tokens: int = settings.GENERATION_MAX_INPUT_TOKENS,
+        max_new_tokens: int = settings.GENERATION_MAX_NEW_TOKENS,
+        quantize: bool = settings.GENERATION_QUANTIZE,
+    ):
+        super().__init__()
+        self.registry = registry
+        self.max_input_tokens = max_input_tokens
+        self.max_new_tokens = max_new_tokens
+        self.quantize = quantize
+        self._quantized = False
+        self._lock = threading.Lock()
+
+    def _model(self):
+        generator = self.registry.get("text_generator")
+        if self.quantize and not self._quantized:
+            import torch
+            generator.model = torch.quantization.quantize_dynamic(generator.model, {torch.nn.Linear}, dtype=torch.qint8)
+            self._quantized = True
+        return generator
+
+    def _generate(self, prompt: str) -> str:
+        with self._lock:
+            generator = self._model()
+            with traced("model", "text_generator", input_size=len(prompt)):
+                output = generator(
+                    prompt, max_new_tokens=self.max_new_tokens, do_sample=False, return_full_text=False,
+                )
+        return output[0]["generated_text"].strip()
+
+    async def summary(self, resume_text: str, job: dict, matched_skills: list[str]) -> str:
+        prompt = build_prompt(resume_text, job, matched_skills, self.max_input_tokens)
+        return await asyncio.to_thread(self._generate, prompt)
+
+
+class AgentLLMGenerator(TemplateGenerator):
+    """Summary written by the agent's own chat model, capped at `max_new_tokens` output tokens."""
+
+    name = "llm"
+
+    def __init__(
+        self,
+        max_input_tokens: int = settings.GENERATION_MAX_INPUT_TOKENS,
+        max_new_tokens: int = settings.GENERATION_MAX_NEW_TOKENS,
+    ):
+        super().__init__()
+        self.max_input_tokens = max_input_tokens
+        self.max_new_tokens = max_new_tokens
+        self._llm = None
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            # Imported late: agent_executor imports the tools, which import this package
+            from agent_executor import llm
+            self._llm = llm.model_copy(update={"max_output_tokens": self.max_new_tokens})
+        return self._llm
+
+    async def summary(self, resume_text: str, job: dict, matched_skills: list[str]) -> str:
+        prompt = build_prompt(resume_text, job, matched_skills, self.max_input_tokens)
+        with traced("llm", "resume_summary", input_size=len(prompt)):
+            message = await self.llm.ainvoke(prompt)
+        return str(message.content).strip()
+
+
+BACKENDS = {
+    "template": TemplateGenerator,
+    "local": LocalModelGenerator,
+    "llm": AgentLLMGenerator,
+}
+
+
+class ResumeGenerator:
+    """
+    Tailored resume sections from the configured backend (GENERATION_BACKEND). Any
+    backend failure falls back to the template tier, and results are cached per
+    (backend, resume hash, job hash) in a bounded LRU, so re-optimizing the same
+    top matches costs a dictionary lookup.
+    """
+
+    def __init__(self, backend: str = settings.GENERATION_BACKEND, max_entries: int = settings.GENERATION_CACHE_MAX_ENTRIES):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown generation backend '{backend}'; expected one of {sorted(BACKENDS)}")
+        self.backend = BACKENDS[backend]()
+        self.fallback = self.backend if backend == "template" else TemplateGenerator()
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "fallbacks": 0, "evictions": 0}
+
+    async def tailor(self, resume_text: str, job: dict, matched_skills: list[str]) -> dict:
+        key = (self.backend.name, text_hash(resume_text), text_hash(job_text(job)))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._cache[key]
+            self.stats["misses"] += 1
+
+        try:
+            summary = await self.backend.summary(resume_text, job, matched_skills)
+        except Exception as e:
+            print(f"Warning: {self.backend.name} generation failed, using template. Error: {e}")
+            self.stats["fallbacks"] += 1
+            summary = ""
+        if not summary:
+            summary = await self.fallback.summary(resume_text, job, matched_skills)
+
+        result = {"summary": summary, "experience": self.backend.experience(resume_text, job)}
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self.stats["evictions"] += 1
+        return result
+
+
+# --- Shared generator ---
+resume_generator = ResumeGenerator()
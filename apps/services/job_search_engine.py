@@ -2,11 +2,44 @@ from apps.job_scraper import (
     indeed_api, ziprecruiter_api, monster_api,
     google_jobs_api, jsearch_api, linkedin_api, glassdoor_api
 )
+from apps.scraper_cache import CachedScraper
+from apps.services.dedup import DedupIndex, deduplicate_jobs
+from apps.services.job_store import JobStore, job_store
+from apps.services.market_insight import MarketAggregates, market_aggregates
+from apps.services.vector_index import JobIndexer, job_indexer
+from apps.tracing import traced
+from apps.crawler import crawl_scheduler
+from apps.resilience import SourceHealth, backoff_delay, source_health
+from concurrent.futures import ThreadPoolExecutor
+from config import settings
 import asyncio
-import hashlib
+import threading
+
+# Scrapers are blocking (Selenium / HTTP), so they run here instead of on the event loop
+_source_executor = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_MAX_WORKERS, thread_name_prefix="job-source"
+)
+
+# Let the crawler skip detail pages for jobs the store already holds
+crawl_scheduler.known_jobs = job_store.known_jobs
+
+def source_name(scraper) -> str:
+    return getattr(scraper, "name", scraper.__class__.__name__)
 
 class JobSearchEngine:
-    def __init__(self):
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor = None,
+        store: JobStore = None,
+        health: SourceHealth = None,
+        indexer: JobIndexer = None,
+        market: MarketAggregates = None,
+    ):
+        self.executor = executor or _source_executor
+        self.store = store or job_store
+        self.health = health or source_health
+        self.indexer = indexer or job_indexer
+        self.market = market or market_aggregates
         self.scrapers = [
             indeed_api,
             ziprecruiter_api,
@@ -19,31 +52,176 @@ class JobSearchEngine:
 
     async def search_all_platforms(self, keywords: str, location: str) -> list[dict]:
         print("Starting aggregated job search...")
-        results = await asyncio.gather(
-            *[self._run_scraper(scraper, keywords, location) for scraper in self.scrapers],
-            return_exceptions=True
-        )
-
         jobs = []
-        for result in results:
-            if isinstance(result, list):
-                jobs.extend(result)
+        async for _, source_jobs in self.stream_all_platforms(keywords, location):
+            jobs.extend(source_jobs)
+        return jobs
+
+    async def stream_all_platforms(self, keywords: str, location: str):
+        """
+        Yields (source, jobs) as soon as each platform delivers a batch (crawled
+        sources stream several), so callers see the fastest sources first.
+        Near-duplicates of a job already yielded are merged into that record (its
+        `sources` list grows) instead of being yielded again.
 
-        return await self._deduplicate_jobs(jobs)
+        Matches already in the job store are yielded first under the "store" source;
+        only platforms whose data for this query is stale get scraped again.
+        """
+        index = DedupIndex()
+        with traced("store", "search") as span:
+            stored = await asyncio.to_thread(self.store.search, keywords, location)
+            span.output_size = len(stored)
+        yield "store", index.add_many(stored, "store")
 
-    async def _run_scraper(self, scraper, keywords, location):
+        queue = asyncio.Queue()
+        stale = await asyncio.to_thread(
+            lambda: [scraper for scraper in self.scrapers if self.store.is_stale(source_name(scraper), keywords, location)]
+        )
+        pending = {asyncio.create_task(self._run_scraper(scraper, keywords, location, queue)) for scraper in stale}
+        remaining = len(pending)
         try:
-            return scraper.search(keywords, location)
-        except Exception as e:
-            print(f"Error from {scraper.__class__.__name__}: {e}")
-            return []
+            while remaining:
+                kind, source, payload = await queue.get()
+                if kind == "done":
+                    remaining -= 1
+                    if payload:
+                        await asyncio.to_thread(self.store.mark_fetched, source, keywords, location)
+                    continue
+                new_jobs, changed = await asyncio.to_thread(self.store.upsert, source, payload)
+                self.indexer.submit(new_jobs)
+                self.indexer.submit([job for job, _ in changed], first_seen=[seen for _, seen in changed])
+                if new_jobs:
+                    # Off the loop: the first call counts the whole stored corpus
+                    await asyncio.to_thread(self.market.add_jobs, new_jobs)
+                yield source, index.add_many(payload, source)
+        finally:
+            # Consumer stopped early (or was cancelled): abandon the remaining sources
+            for task in pending:
+                task.cancel()
+
+    async def semantic_search(self, query: str, location: str = "", max_age_days: float = None, limit: int = 10) -> list[dict]:
+        """
+        Stored jobs closest in meaning to a natural-language query, answered from the
+        local vector index without touching any job board.
+        """
+        def run():
+            self.indexer.ensure_built(self.store)
+            query_vector = self.indexer.embed([query])[0]
+            max_age = max_age_days * 86400 if max_age_days is not None else None
+            with traced("store", "semantic_search") as span:
+                hits = self.indexer.index.search(query_vector, limit, location, max_age)
+                span.output_size = len(hits)
+            jobs = self.store.get([key for key, _ in hits])
+            return [{**job, "semantic_score": round(score, 4)} for job, (_, score) in zip(jobs, hits) if job]
+
+        return await asyncio.to_thread(run)
+
+    def _timeout_for(self, source: str) -> float:
+        return settings.SOURCE_TIMEOUTS.get(source, settings.SOURCE_TIMEOUT)
+
+    async def _run_scraper(self, scraper, keywords, location, queue: asyncio.Queue):
+        """
+        Runs one source in the thread pool and puts ("batch", source, jobs) on the
+        queue for every batch it streams, then ("done", source, succeeded).
+        Sources whose circuit breaker is open are skipped without waiting.
+        """
+        source = source_name(scraper)
+        breaker = self.health.breaker(source)
+        if not breaker.allow():
+            print(f"Skipping {source}: circuit open")
+            queue.put_nowait(("done", source, False))
+            return
+
+        timeout = self._timeout_for(source)
+        loop = asyncio.get_running_loop()
+        lock = threading.Lock()
+        owner = []  # The first attempt to deliver a batch owns the output; hedges that lose stop
+        stops = []
+        first_batch_at = []  # Breakers judge a source by how soon it delivers, not by how long a crawl runs
+
+        def produce(attempt: int, stop: threading.Event):
+            if isinstance(scraper, CachedScraper):
+                # Hedges and retries race the first attempt instead of waiting on it in the cache
+                batches = scraper.stream(keywords, location, coalesce=attempt == 0)
+            elif hasattr(scraper, "stream"):
+                batches = scraper.stream(keywords, location)
+            else:
+                batches = [scraper.search(keywords, location)]
+            found = 0
+            try:
+                for jobs in batches:
+                    with lock:
+                        if not owner:
+                            owner.append(attempt)
+                            first_batch_at.append(loop.time())
+                    if stop.is_set() or owner[0] != attempt:
+                        break
+                    found += len(jobs)
+                    loop.call_soon_threadsafe(queue.put_nowait, ("batch", source, jobs))
+            finally:
+                if hasattr(batches, "close"):
+                    batches.close()
+            return found if not owner or owner[0] == attempt else None
+
+        def launch() -> asyncio.Future:
+            stop = threading.Event()
+            stops.append(stop)
+            return loop.run_in_executor(self.executor, produce, len(stops) - 1, stop)
+
+        start = loop.time()
+        succeeded = False
+        with traced("scraper", source) as span:
+            try:
+                span.output_size = await asyncio.wait_for(self._attempt(source, launch, owner, breaker), timeout=timeout)
+                succeeded = True
+            except asyncio.TimeoutError:
+                print(f"{source} timed out after {timeout}s")
+                span.fail()
+            except Exception as e:
+                print(f"Error from {source}: {e}")
+                span.fail()
+            finally:
+                # A source still running in its thread stops at its next batch
+                for stop in stops:
+                    stop.set()
+                breaker.record(succeeded, (first_batch_at[0] if first_batch_at else loop.time()) - start)
+                queue.put_nowait(("done", source, succeeded))
+
+    async def _attempt(self, source: str, launch, owner: list, breaker) -> int:
+        """Retries with backoff and jitter, but only while nothing has been delivered yet."""
+        hedge_after = settings.SOURCE_HEDGE_AFTER.get(source)
+        for attempt in range(settings.SOURCE_RETRIES + 1):
+            try:
+                return await self._hedged(launch, hedge_after, owner, breaker)
+            except Exception as e:
+                if owner or attempt == settings.SOURCE_RETRIES:
+                    raise
+                delay = backoff_delay(attempt)
+                print(f"{source} failed ({e}); retrying in {delay:.2f}s")
+                breaker.count("retries")
+                await asyncio.sleep(delay)
+
+    async def _hedged(self, launch, hedge_after, owner: list, breaker) -> int:
+        """
+        Starts a second, identical attempt if the first has delivered nothing after
+        `hedge_after` seconds; whichever delivers first wins and the other stops.
+        """
+        attempts = {launch()}
+        if hedge_after:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done and not owner:
+                breaker.count("hedges")
+                attempts.add(launch())
+
+        error = None
+        while attempts:
+            done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is not None:
+                    error = attempt.exception()
+                elif attempt.result() is not None:  # None: lost the race to the other attempt
+                    return attempt.result()
+        raise error
 
     async def _deduplicate_jobs(self, jobs: list[dict]) -> list[dict]:
-        seen = set()
-        unique_jobs = []
-        for job in jobs:
-            job_hash = hashlib.md5(f"{job['title']}{job['company']}{job['location']}".encode()).hexdigest()
-            if job_hash not in seen:
-                seen.add(job_hash)
-                unique_jobs.append(job)
-        return unique_jobs
+        return deduplicate_jobs(jobs)
@@ -0,0 +1,213 @@
+# job_store.py (Persistent job store + inverted index)
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from apps.text_utils import tokenize, query_key
+from config import settings
+
+INDEXED_FIELDS = ("title", "company", "location", "description")
+
+
+def job_identity(job: dict) -> str:
+    return hashlib.md5(f"{job['title']}{job['company']}{job['location']}".encode()).hexdigest()
+
+
+class JobStore:
+    def __init__(self, path: str = settings.JOB_STORE_PATH, ttl: float = settings.JOB_STORE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_key TEXT PRIMARY KEY,
+                    job_id TEXT,
+                    source TEXT,
+                    data TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_job_id ON jobs(job_id);
+                CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs(first_seen, job_key);
+                CREATE TABLE IF NOT EXISTS postings (
+                    token TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    job_key TEXT NOT NULL,
+                    PRIMARY KEY (token, field, job_key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS postings_job_key ON postings(job_key);
+                CREATE TABLE IF NOT EXISTS fetches (
+                    source TEXT NOT NULL,
+                    query_key TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (source, query_key)
+                );
+            """)
+            self._conn = conn
+        return self._conn
+
+    # --- Ingestion ---
+    def ingest(self, source: str, jobs: list[dict], now: float = None) -> list[dict]:
+        """Upserts jobs and returns the ones seen for the first time."""
+        return self.upsert(source, jobs, now)[0]
+
+    def upsert(self, source: str, jobs: list[dict], now: float = None) -> tuple[list[dict], list[tuple[dict, float]]]:
+        """
+        Upserts jobs and returns the ones seen for the first time, plus
+        (job, first_seen) for stored jobs whose indexed text changed, such as a
+        card later enriched with its full description.
+        """
+        now = now or time.time()
+        new_jobs, changed = [], []
+        with self._lock, self.conn:
+            for job in jobs:
+                key = job_identity(job)
+                data = json.dumps(job, sort_keys=True)
+                row = self.conn.execute("SELECT data, first_seen FROM jobs WHERE job_key = ?", (key,)).fetchone()
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO jobs (job_key, job_id, source, data, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, job.get("id"), source, data, now, now),
+                    )
+                    self._index(key, job)
+                    new_jobs.append(job)
+                else:
+                    self.conn.execute(
+                        "UPDATE jobs SET data = ?, last_seen = ? WHERE job_key = ?", (data, now, key)
+                    )
+                    if row[0] != data:
+                        self.conn.execute("DELETE FROM postings WHERE job_key = ?", (key,))
+                        self._index(key, job)
+                        stored = json.loads(row[0])
+                        if any(stored.get(field, "") != job.get(field, "") for field in INDEXED_FIELDS):
+                            changed.append((job, row[1]))
+        return new_jobs, changed
+
+    def _index(self, key: str, job: dict):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO postings (token, field, job_key) VALUES (?, ?, ?)",
+            {(token, field, key) for field in INDEXED_FIELDS for token in tokenize(job.get(field, ""))},
+        )
+
+    def mark_fetched(self, source: str, keywords: str, location: str, now: float = None):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO fetches (source, query_key, fetched_at) VALUES (?, ?, ?)",
+                (source, query_key(keywords, location), now or time.time()),
+            )
+
+    def is_stale(self, source: str, keywords: str, location: str) -> bool:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT fetched_at FROM fetches WHERE source = ? AND query_key = ?",
+                (source, query_key(keywords, location)),
+            ).fetchone()
+        return row is None or time.time() - row[0] > self.ttl
+
+    # --- Queries ---
+    def search(self, keywords: str, location: str = "", limit: int = 50) -> list[dict]:
+        """
+        Ranks stored jobs by keyword hits (title hits count double); every location
+        token must appear in the job's location.
+        """
+        keyword_tokens = sorted(set(tokenize(keywords)))
+        location_tokens = sorted(set(tokenize(location)))
+        if not keyword_tokens:
+            return []
+
+        sql = f"""
+            SELECT p.job_key, SUM(CASE p.field WHEN 'title' THEN 2 ELSE 1 END) AS score
+            FROM postings p
+            WHERE p.field != 'location' AND p.token IN ({",".join("?" * len(keyword_tokens))})
+        """
+        params = list(keyword_tokens)
+        if location_tokens:
+            sql += f"""
+                AND p.job_key IN (
+                    SELECT job_key FROM postings
+                    WHERE field = 'location' AND token IN ({",".join("?" * len(location_tokens))})
+                    GROUP BY job_key HAVING COUNT(DISTINCT token) = ?
+                )
+            """
+            params += location_tokens + [len(location_tokens)]
+        sql = f"""
+            SELECT j.data, j.source, j.first_seen, j.last_seen
+            FROM ({sql} GROUP BY p.job_key) hits JOIN jobs j ON j.job_key = hits.job_key
+            ORDER BY hits.score DESC, j.last_seen DESC
+            LIMIT ?
+        """
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [
+            {"source": source, **json.loads(data), "first_seen": first, "last_seen": last}
+            for data, source, first, last in rows
+        ]
+
+    def known_jobs(self, jobs: list[dict]) -> list:
+        """The stored copy of each job (matched by identity, so any source's listing counts) or None."""
+        keys = [job_identity(job) for job in jobs]
+        if not keys:
+            return []
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT job_key, data FROM jobs WHERE job_key IN ({','.join('?' * len(set(keys)))})", list(set(keys))
+            ).fetchall()
+        stored = {key: json.loads(data) for key, data in rows}
+        return [stored.get(key) for key in keys]
+
+    def get(self, keys: list[str]) -> list:
+        """Stored jobs by job key, in order (None for keys not in the store)."""
+        if not keys:
+            return []
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT job_key, source, data, first_seen, last_seen FROM jobs WHERE job_key IN ({','.join('?' * len(set(keys)))})",
+                list(set(keys)),
+            ).fetchall()
+        stored = {
+            key: {"source": source, **json.loads(data), "first_seen": first, "last_seen": last}
+            for key, source, data, first, last in rows
+        }
+        return [stored.get(key) for key in keys]
+
+    def all_jobs(self, batch_size: int = 1000):
+        """
+        Yields (job, first_seen) for every stored job, reading in batches. Jobs come
+        oldest first, so a job's position only moves if older jobs are removed.
+        """
+        last = (-1.0, "")
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    """SELECT job_key, data, first_seen FROM jobs WHERE (first_seen, job_key) > (?, ?)
+                       ORDER BY first_seen, job_key LIMIT ?""",
+                    (*last, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for key, data, first_seen in rows:
+                yield json.loads(data), first_seen
+            last = (rows[-1][2], rows[-1][0])
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+# --- Shared store ---
+job_store = JobStore()
@@ -1,24 +1,308 @@
-class JobMarketIntelligence:
-    async def generate_market_insights(self, user_skills, target_roles):
+# market_insight.py (Market analytics from incrementally maintained job aggregates)
+
+import asyncio
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from apps.services.dedup import normalize_company, normalize_location
+from apps.services.job_store import JobStore, job_identity, job_store
+from apps.services.skill_dictionary import find_skills
+from apps.text_utils import tokenize
+from config import settings
+
+DAY = 86400
+_SALARY_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+
+def parse_salary(text) -> float:
+    """Midpoint of an annual salary string ('$90,000 - $120,000', '120k'); NaN when there is none."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    values = []
+    for number, thousands in _SALARY_RE.findall(text or ""):
+        value = float(number.replace(",", "")) * (1000 if thousands else 1)
+        if value >= 1000:  # Hourly and monthly figures would skew an annual median
+            values.append(value)
+    return float(np.mean(values[:2])) if values else float("nan")
+
+
+def _tally(values: np.ndarray) -> dict:
+    ids, counts = np.unique(values, return_counts=True)
+    return dict(zip(ids.tolist(), counts.tolist()))
+
+
+class _Vocab:
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def id(self, name: str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+        return self.ids[name]
+
+
+class _Column:
+    """Append-only NumPy column with amortized growth."""
+
+    def __init__(self, dtype, fill=0):
+        self.data = np.full(1024, fill, dtype=dtype)
+        self.fill = fill
+        self.size = 0
+
+    def append(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        if self.size + len(values) > len(self.data):
+            grown = np.full(max(2 * len(self.data), self.size + len(values)), self.fill, dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.data[:self.size]
+
+
+class MarketAggregates:
+    """
+    Columnar view of every collected job: one row per job with the day it was first
+    seen, location, company, remote flag and salary, plus its skills as a CSR list
+    (offsets + skill ids). Title tokens map to row lists, so a role query touches
+    only the rows whose title has every role token.
+
+    Per (roles, window) results are kept as raw counters in a bounded LRU and bumped
+    in place when a matching job is ingested; a cached entry is recomputed only when
+    the day rolls over or it is evicted.
+    """
+
+    def __init__(self, store: JobStore = None, max_entries: int = settings.MARKET_CACHE_MAX_ENTRIES):
+        self.store = store or job_store
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._loaded = False
+        self.keys = set()
+        self.day = _Column(np.int32)
+        self.location = _Column(np.int32)
+        self.company = _Column(np.int32)
+        self.remote = _Column(bool, False)
+        self.salary = _Column(np.float32, np.nan)
+        self.skill_offsets = _Column(np.int64)
+        self.skill_offsets.append([0])
+        self.skill_ids = _Column(np.int32)
+        self.locations, self.companies, self.skills = _Vocab(), _Vocab(), _Vocab()
+        self.title_rows = {}  # title token -> list of rows
+        self._cache = OrderedDict()  # (roles key, window days, today) -> counters
+        self.stats = {"jobs": 0, "hits": 0, "misses": 0, "incremental_updates": 0}
+
+    # --- Ingest ---
+    def add_jobs(self, jobs: list[dict], first_seen: list[float] = None):
+        """Appends jobs not counted yet; first_seen defaults to now."""
+        now = time.time()
+        with self._lock:
+            self._load()
+            self._append(jobs, first_seen or [now] * len(jobs))
+
+    def _append(self, jobs, first_seen):
+        for job, seen_at in zip(jobs, first_seen):
+            key = job_identity(job)
+            if key in self.keys:
+                continue
+            self.keys.add(key)
+            row = self.day.size
+            day = int(seen_at // DAY)
+            location = job.get("location", "")
+            skill_ids = sorted({self.skills.id(skill) for skill in find_skills(
+                " ".join(filter(None, (job.get("title"), job.get("description"))))
+            )})
+            title_tokens = set(tokenize(job.get("title", "")))
+
+            self.day.append([day])
+            self.location.append([self.locations.id(normalize_location(location) or "unknown")])
+            self.company.append([self.companies.id(normalize_company(job.get("company", "")) or "unknown")])
+            self.remote.append([normalize_location(location) == "remote"])
+            self.salary.append([parse_salary(job.get("salary"))])
+            self.skill_ids.append(skill_ids)
+            self.skill_offsets.append([self.skill_ids.size])
+            for token in title_tokens:
+                self.title_rows.setdefault(token, []).append(row)
+            self.stats["jobs"] += 1
+            self._update_cached(row, day, title_tokens)
+
+    def _update_cached(self, row: int, day: int, title_tokens: set):
+        for (roles_key, window, today), entry in self._cache.items():
+            if not (today - window < day <= today) or not self._matches(roles_key, title_tokens):
+                continue
+            self._count_rows(entry["current"], np.array([row]))
+            self.stats["incremental_updates"] += 1
+
+    @staticmethod
+    def _matches(roles_key: tuple, title_tokens: set) -> bool:
+        return not roles_key or any(set(role) <= title_tokens for role in roles_key)
+
+    def _load(self):
+        """Counts the stored corpus once, on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        batch, seen = [], []
+        for job, first_seen in self.store.all_jobs():
+            batch.append(job)
+            seen.append(first_seen)
+        self._append(batch, seen)
+
+    # --- Queries ---
+    def _role_rows(self, roles_key: tuple) -> np.ndarray:
+        if not roles_key:
+            return np.arange(self.day.size)
+        matched = []
+        for role in roles_key:
+            postings = [self.title_rows.get(token, []) for token in role]
+            rows = np.asarray(min(postings, key=len), dtype=np.int64)
+            for other in postings:
+                if len(rows):
+                    rows = np.intersect1d(rows, np.asarray(other, dtype=np.int64), assume_unique=True)
+            matched.append(rows)
+        return np.unique(np.concatenate(matched)) if matched else np.zeros(0, dtype=np.int64)
+
+    def _count_rows(self, counters: dict, rows: np.ndarray):
+        counters["jobs"] += len(rows)
+        if not len(rows):
+            return
+        counters["remote"] += int(self.remote.values[rows].sum())
+        counters["locations"].update(_tally(self.location.values[rows]))
+        counters["companies"].update(_tally(self.company.values[rows]))
+        offsets = self.skill_offsets.values
+        starts, lengths = offsets[rows], offsets[rows + 1] - offsets[rows]
+        if lengths.sum():
+            # Gather every row's skill ids from the CSR arrays without a Python loop
+            flat = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            counters["skills"].update(_tally(self.skill_ids.values[flat]))
+        salaries = self.salary.values[rows]
+        counters["salaries"].extend(salaries[~np.isnan(salaries)].tolist())
+
+    def _counters(self, roles_key: tuple, window: int, today: int) -> dict:
+        rows = self._role_rows(roles_key)
+        days = self.day.values[rows]
+        entry = {}
+        for name, low, high in (("current", today - window, today), ("previous", today - 2 * window, today - window)):
+            counters = {"jobs": 0, "remote": 0, "locations": Counter(), "companies": Counter(),
+                        "skills": Counter(), "salaries": []}
+            self._count_rows(counters, rows[(days > low) & (days <= high)])
+            entry[name] = counters
+        return entry
+
+    def query(self, roles: list[str], window_days: int, now: float = None) -> dict:
+        roles_key = tuple(sorted({tuple(sorted(set(tokenize(role)))) for role in roles or []} - {()}))
+        today = int((now or time.time()) // DAY)
+        key = (roles_key, window_days, today)
+        with self._lock:
+            self._load()
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+                entry = self._counters(roles_key, window_days, today)
+                self._cache[key] = entry
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            return self._summarize(entry, window_days)
+
+    def precompute(self, roles_list: list[list[str]], windows: list[int]):
+        for roles in roles_list:
+            for window in windows:
+                self.query(roles, window)
+
+    def _summarize(self, entry: dict, window_days: int) -> dict:
+        current, previous = entry["current"], entry["previous"]
+        top = settings.MARKET_TOP_N
+
+        def share(count, total):
+            return round(count / total, 3) if total else 0.0
+
+        skills = [
+            {
+                "skill": self.skills.names[sid],
+                "jobs": count,
+                "share": share(count, current["jobs"]),
+                "share_delta": round(share(count, current["jobs"]) - share(previous["skills"][sid], previous["jobs"]), 3),
+            }
+            for sid, count in current["skills"].most_common(top)
+        ]
+        declining = sorted(
+            (
+                (share(current["skills"][sid], current["jobs"]) - share(count, previous["jobs"]), self.skills.names[sid])
+                for sid, count in previous["skills"].items()
+            ),
+        )[:top]
+        salaries = current["salaries"]
+        previous_median = float(np.median(previous["salaries"])) if previous["salaries"] else None
+        median = float(np.median(salaries)) if salaries else None
         return {
+            "window_days": window_days,
+            "jobs_in_window": current["jobs"],
             "salary_insights": {
-                "median_salary": 120000,
-                "salary_range": [90000, 150000],
-                "growth_trend": "+12% YoY"
-            },
-            "skill_gaps": {
-                "high_demand_skills": ["ML Ops", "Data Engineering"],
-                "declining_skills": ["Flash"],
-                "recommended_to_learn": ["LangChain", "Docker"]
+                "jobs_with_salary": len(salaries),
+                "median_salary": round(median) if median is not None else None,
+                "salary_range": [round(float(np.percentile(salaries, 10))), round(float(np.percentile(salaries, 90)))]
+                if salaries else None,
+                "median_change_pct": round(100 * (median - previous_median) / previous_median, 1)
+                if median is not None and previous_median else None,
             },
+            "skill_demand": skills,
+            "declining_skills": [name for delta, name in declining if delta < 0],
             "location_insights": {
-                "best_markets": ["Bangalore", "Hyderabad"],
-                "remote_percentage": 65,
-                "competition_level": "Moderate"
+                "top_locations": [
+                    {"location": self.locations.names[lid], "jobs": count, "share": share(count, current["jobs"])}
+                    for lid, count in current["locations"].most_common(top)
+                ],
+                "remote_percentage": round(100 * share(current["remote"], current["jobs"]), 1),
             },
             "hiring_trends": {
-                "top_hiring_companies": ["Google", "TCS", "Infosys"],
-                "industry_growth": ["AI", "Healthcare Tech"],
-                "hiring_timeline": "Peak in Q1/Q3"
-            }
-        }
\ No newline at end of file
+                "top_hiring_companies": [
+                    {"company": self.companies.names[cid], "jobs": count}
+                    for cid, count in current["companies"].most_common(top)
+                ],
+                "postings": current["jobs"],
+                "postings_previous_window": previous["jobs"],
+                "postings_change_pct": round(100 * (current["jobs"] - previous["jobs"]) / previous["jobs"], 1)
+                if previous["jobs"] else None,
+            },
+        }
+
+
+class JobMarketIntelligence:
+    def __init__(self, aggregates: MarketAggregates = None):
+        self._aggregates = aggregates
+
+    @property
+    def aggregates(self) -> MarketAggregates:
+        return self._aggregates or market_aggregates
+
+    async def generate_market_insights(self, user_skills, target_roles, window_days: int = settings.MARKET_DEFAULT_WINDOW_DAYS):
+        if isinstance(user_skills, dict):
+            user_skills = find_skills(user_skills.get("text", ""))
+        else:
+            user_skills = find_skills(" ".join(user_skills or [])) | set(user_skills or [])
+        if isinstance(target_roles, str):
+            target_roles = [target_roles]
+
+        # The first query counts the stored corpus, so keep it off the event loop
+        insights = await asyncio.to_thread(self.aggregates.query, target_roles, window_days)
+        in_demand = [entry["skill"] for entry in insights["skill_demand"]]
+        insights["skill_gaps"] = {
+            "high_demand_skills": in_demand,
+            "recommended_to_learn": [skill for skill in in_demand if skill not in user_skills],
+        }
+        return insights
+
+
+# --- Shared aggregates (fed by the search engine on ingest) ---
+market_aggregates = MarketAggregates()
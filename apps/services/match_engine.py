@@ -1,32 +1,79 @@
-from transformers import pipeline
+from apps.schemas.schemas import Preferences
+from apps.services.embeddings import embed_texts, cosine_scores, top_k_indices, job_text
+from apps.services.embedding_cache import embedding_cache
+from apps.services.model_registry import model_registry
+from apps.tracing import traced
 from apps.services.resume_optimizer import ResumeOptimizer
+from apps.services.ats_checker import ats_checker
 from apps.services.job_search_engine import JobSearchEngine
 from apps.services.market_insight import JobMarketIntelligence
 from config import settings
+import asyncio
+import numpy as np
 
 class JobMatchResumeMCP:
     def __init__(self):
-        self.text_similarity = pipeline("feature-extraction", model=settings.TEXT_SIMILARITY_MODEL)
-        self.skill_extractor = pipeline("ner", model=settings.SKILL_EXTRACTION_MODEL)
-        self.text_generator = pipeline("text-generation", model=settings.TEXT_GENERATION_MODEL)
-
+        # Models come from the shared registry and load on first use, so constructing
+        # an engine per request is cheap.
+        self.models = model_registry
+        self.embedding_cache = embedding_cache
         self.job_engine = JobSearchEngine()
         self.resume_optimizer = ResumeOptimizer()
         self.market_intelligence = JobMarketIntelligence()
+        self.ats_checker = ats_checker
+
+    @property
+    def text_similarity(self):
+        return self.models.get("text_similarity")
+
+    @property
+    def skill_extractor(self):
+        return self.models.get("skill_extractor")
+
+    def embed(self, texts: list[str]):
+        return self.embedding_cache.get_or_compute(texts, self._embed_uncached)
+
+    def _embed_uncached(self, texts: list[str]):
+        with traced("model", "text_similarity", input_size=len(texts)):
+            return embed_texts(self.text_similarity, texts)
+
+    def rank_jobs(self, resume_text: str, jobs: list[dict], top_k: int = settings.MATCH_TOP_K,
+                  ats_weight: float = settings.MATCH_ATS_WEIGHT) -> list[tuple[dict, float, float]]:
+        """
+        The best top_k jobs as (job, cosine similarity, ATS fit), ranked by the two
+        blended: `ats_weight` of the model-free ATS fit, the rest embedding similarity.
+        """
+        if not jobs:
+            return []
+        resume_vector = self.embed([resume_text])[0]
+        job_matrix = self.embed([job_text(job) for job in jobs])
+        scores = cosine_scores(resume_vector, job_matrix)
+        resume = self.ats_checker.resume_profile(resume_text)
+        ats = np.array([self.ats_checker.fit(resume, self.ats_checker.job_profile(job)) for job in jobs])
+        blended = (1 - ats_weight) * scores + ats_weight * ats
+        return [(jobs[i], float(scores[i]), float(ats[i])) for i in top_k_indices(blended, top_k)]
+
+    async def find_and_optimize_jobs(self, resume_text, preferences, top_k: int = settings.MATCH_TOP_K):
+        if isinstance(preferences, dict):
+            preferences = Preferences(**preferences)
 
-    async def find_and_optimize_jobs(self, resume_text, preferences):
         resume_analysis = {"text": resume_text}  # TODO: Implement actual analysis
         jobs = await self.job_engine.search_all_platforms(
-            preferences.job_titles, preferences.location, preferences.experience_level
+            ", ".join(preferences.job_titles), preferences.location
         )
+        ranked = await asyncio.to_thread(self.rank_jobs, resume_text, jobs, top_k)
 
+        # Tailoring is cached per (resume, job) and cheap by default, so the top matches run together
+        optimized_all = await asyncio.gather(
+            *(self.resume_optimizer.optimize_resume_for_job(resume_text, job) for job, _, _ in ranked)
+        )
         top_matches = []
-        for job in jobs[:5]:
-            optimized = await self.resume_optimizer.optimize_resume_for_job(resume_text, job)
+        for (job, score, ats_score), optimized in zip(ranked, optimized_all):
             top_matches.append({
                 "job": job,
                 "optimized_resume": optimized["optimized_resume"],
-                "match_score": 0.87,  # TODO: Calculate real score
+                "match_score": round(score, 4),
+                "ats_score": round(ats_score, 3),
                 "missing_skills": optimized["improvements"]["missing_skills"],
                 "recommendations": optimized["recommendations"]
             })
@@ -36,4 +83,4 @@ class JobMatchResumeMCP:
             "top_matches": top_matches,
             "market_insights": await self.market_intelligence.generate_market_insights(resume_analysis, preferences.job_titles),
             "skill_gaps": {"todo": True}  # TODO: Implement
-        }
\ No newline at end of file
+        }
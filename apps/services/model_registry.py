@@ -0,0 +1,105 @@
+# model_registry.py (Process-wide, lazily loaded Hugging Face pipelines)
+
+import os
+import threading
+import time
+
+from transformers import pipeline
+from config import settings
+
+# Registry name -> (pipeline task, model id)
+MODEL_SPECS = {
+    "text_similarity": ("feature-extraction", settings.TEXT_SIMILARITY_MODEL),
+    "skill_extractor": ("ner", settings.SKILL_EXTRACTION_MODEL),
+    "text_generator": ("text-generation", settings.TEXT_GENERATION_MODEL),
+}
+
+
+class ModelUnavailableError(RuntimeError):
+    pass
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _parameter_bytes(model) -> int:
+    try:
+        return sum(p.numel() * p.element_size() for p in model.model.parameters())
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """Loads each pipeline once, on first use, and shares it across the process."""
+
+    def __init__(self, specs: dict = MODEL_SPECS, loader=pipeline):
+        self.specs = dict(specs)
+        self._loader = loader
+        self._models = {}
+        self._errors = {}
+        self._stats = {}
+        self._locks = {name: threading.Lock() for name in self.specs}
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if name not in self.specs:
+            raise KeyError(f"Unknown model '{name}'")
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                raise ModelUnavailableError(f"{name} failed to load: {self._errors[name]}")
+
+            task, model_id = self.specs[name]
+            print(f"Loading model '{name}' ({model_id})...")
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            try:
+                model = self._loader(task, model=model_id)
+            except Exception as e:
+                self._errors[name] = e
+                raise ModelUnavailableError(f"{name} failed to load: {e}") from e
+
+            self._stats[name] = {
+                "task": task,
+                "model": model_id,
+                "loaded": True,
+                "load_seconds": round(time.perf_counter() - start, 3),
+                "rss_delta_mb": round((_rss_bytes() - rss_before) / 2**20, 1),
+                "parameters_mb": round(_parameter_bytes(model) / 2**20, 1),
+            }
+            self._models[name] = model
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names: list[str] = None):
+        for name in names if names is not None else self.specs:
+            try:
+                self.get(name)
+            except ModelUnavailableError as e:
+                print(f"Warning: {e}")
+
+    def stats(self) -> dict:
+        return {
+            name: self._stats.get(name) or {
+                "task": task,
+                "model": model_id,
+                "loaded": False,
+                "error": str(self._errors[name]) if name in self._errors else None,
+            }
+            for name, (task, model_id) in self.specs.items()
+        }
+
+
+# --- Shared registry ---
+model_registry = ModelRegistry()
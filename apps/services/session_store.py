@@ -0,0 +1,165 @@
+# session_store.py (Per-session memory for MCP conversations)
+
+import asyncio
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+
+# The session of the request being served, so tools can record artifacts into it
+active_session = contextvars.ContextVar("active_session", default=None)
+
+
+def new_session() -> dict:
+    return {
+        "history": [],          # recent turns, verbatim: {"role": "human" | "ai", "content": str}
+        "summary": "",          # older turns, compacted
+        "memory": {},
+        "resume_text": None,
+        "resume_hash": None,
+        "resume_skills": [],
+        "resume_embedding": None,
+        "search_results": [],
+        "updated_at": time.time(),
+    }
+
+
+def compact_history(
+    session: dict,
+    max_turns: int = settings.SESSION_MAX_TURNS,
+    max_summary_chars: int = settings.SESSION_SUMMARY_CHARS,
+):
+    """
+    Keeps the last `max_turns` exchanges verbatim and folds older messages into a
+    bounded running summary, so the prompt size stays flat however long the chat.
+    """
+    keep = max_turns * 2
+    if len(session["history"]) <= keep:
+        return
+    older, session["history"] = session["history"][:-keep], session["history"][-keep:]
+    lines = [f"{message['role']}: {' '.join(message['content'].split())[:200]}" for message in older]
+    summary = "\n".join(filter(None, [session["summary"], *lines]))
+    session["summary"] = summary[-max_summary_chars:]
+
+
+def remember_search_results(jobs: list[dict], limit: int = settings.SESSION_MAX_SEARCH_RESULTS):
+    session = active_session.get()
+    if session is None:
+        return
+    listings = [
+        {key: job.get(key) for key in ("id", "title", "company", "location", "url")}
+        for job in jobs[:limit]
+    ]
+    session["search_results"] = listings
+
+
+class InMemorySessionStore:
+    def __init__(self, ttl: float = settings.SESSION_TTL, max_sessions: int = settings.SESSION_MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.time() - session["updated_at"] > self.ttl:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def put(self, session_id: str, session: dict):
+        session["updated_at"] = time.time()
+        with self._lock:
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [key for key, session in self._sessions.items() if session["updated_at"] < cutoff]
+            for key in expired:
+                del self._sessions[key]
+        return len(expired)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionStore:
+    def __init__(self, path: str = settings.SESSION_DB_PATH, ttl: float = settings.SESSION_TTL):
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions(updated_at)")
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ? AND updated_at >= ?",
+                (session_id, time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, session_id: str, session: dict):
+        session["updated_at"] = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(session), session["updated_at"]),
+            )
+
+    def delete(self, session_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def evict_expired(self) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def create_session_store(backend: str = settings.SESSION_BACKEND):
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "memory":
+        return InMemorySessionStore()
+    raise ValueError(f"Unknown session backend '{backend}'")
+
+
+async def run_session_eviction(store, interval: float = settings.SESSION_SWEEP_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(store.evict_expired)
+        except Exception as e:
+            print(f"Session eviction failed: {e}")
+
+
+# --- Shared store ---
+session_store = create_session_store()
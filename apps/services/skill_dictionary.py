@@ -0,0 +1,185 @@
+# skill_dictionary.py (Canonical skill names and the spellings that map to them)
+
+import functools
+import json
+from collections import Counter, deque
+
+from apps.text_utils import tokenize
+from config import settings
+
+# Spellings that are ordinary English words (or mean something else, like "CV") too
+# often to count on their own; the longer spellings of those skills still match
+AMBIGUOUS_SPELLINGS = {"go", "r", "rest", "express", "spring", "node", "ts", "tf", "swift"}
+
+# Canonical name -> alternative spellings (matched after tokenization, case-insensitive)
+SKILL_SYNONYMS = {
+    "Python": ["python3"],
+    "Java": [],
+    "JavaScript": ["js", "ecmascript"],
+    "TypeScript": ["ts"],
+    "Go": ["golang", "go lang"],
+    "Rust": [],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    "Scala": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Ruby": [],
+    "PHP": [],
+    "R": ["r programming", "rstats"],
+    "SQL": [],
+    "Bash": ["shell scripting"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["spring", "springboot"],
+    "Node.js": ["node", "nodejs"],
+    "Express": ["express.js", "expressjs"],
+    "React": ["react.js", "reactjs"],
+    "Angular": ["angularjs"],
+    "Vue": ["vue.js", "vuejs"],
+    "Next.js": ["nextjs"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "GraphQL": [],
+    "REST APIs": ["rest", "restful", "rest api", "restful apis"],
+    "gRPC": [],
+    "Microservices": ["microservice", "micro services"],
+    "PostgreSQL": ["postgres"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "opensearch"],
+    "Cassandra": [],
+    "DynamoDB": [],
+    "Snowflake": [],
+    "BigQuery": ["big query"],
+    "Kafka": ["apache kafka"],
+    "RabbitMQ": [],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": [],
+    "Airflow": ["apache airflow"],
+    "dbt": [],
+    "ETL": ["elt"],
+    "Pandas": [],
+    "NumPy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "PyTorch": ["torch"],
+    "TensorFlow": ["tf"],
+    "Keras": [],
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "NLP": ["natural language processing"],
+    "Computer Vision": [],
+    "LLMs": ["llm", "large language models", "large language model"],
+    "LangChain": ["lang chain"],
+    "MLOps": ["ml ops"],
+    "Data Engineering": [],
+    "Data Analysis": ["data analytics"],
+    "Statistics": [],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": [],
+    "AWS": ["amazon web services"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Azure": ["microsoft azure"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["ci cd", "cicd", "continuous integration"],
+    "Git": ["github", "gitlab"],
+    "Linux": ["unix"],
+    "DevOps": [],
+    "SRE": ["site reliability"],
+    "Prometheus": [],
+    "Grafana": [],
+    "Agile": ["scrum"],
+    "Jira": [],
+    "System Design": ["distributed systems"],
+    "Security": ["cybersecurity", "cyber security"],
+    "Selenium": [],
+    "Unit Testing": ["pytest", "junit", "unit tests"],
+}
+
+
+class SkillAutomaton:
+    """
+    Aho–Corasick automaton over tokens: every spelling in the dictionary is one
+    pattern, so a single pass over the text's tokens finds all skills, however many
+    patterns there are. `counts` reports how often each canonical skill occurs.
+    """
+
+    def __init__(self, synonyms: dict):
+        self.goto = [{}]    # state -> {token: next state}
+        self.fail = [0]
+        self.output = [()]  # state -> canonical skills whose spelling ends here
+        for canonical, aliases in synonyms.items():
+            for spelling in (canonical, *aliases):
+                tokens = tokenize(spelling)
+                if tokens and " ".join(tokens) not in AMBIGUOUS_SPELLINGS:
+                    self._insert(tokens, canonical)
+        self._link()
+
+    def _insert(self, tokens: list[str], canonical: str):
+        state = 0
+        for token in tokens:
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        if canonical not in self.output[state]:
+            self.output[state] += (canonical,)
+
+    def _link(self):
+        # Breadth-first, so a state's failure target is always linked before the state itself
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(token, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] += tuple(s for s in self.output[self.fail[child]] if s not in self.output[child])
+
+    def counts(self, text: str) -> Counter:
+        goto, fail, output = self.goto, self.fail, self.output
+        found = Counter()
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def find(self, text: str) -> set[str]:
+        return set(self.counts(text))
+
+
+def load_synonyms(path: str = settings.SKILL_DICTIONARY_PATH) -> dict:
+    """The built-in dictionary, extended by an optional JSON file of {canonical: [aliases]}."""
+    synonyms = {canonical: list(aliases) for canonical, aliases in SKILL_SYNONYMS.items()}
+    if path:
+        with open(path) as f:
+            for canonical, aliases in json.load(f).items():
+                synonyms.setdefault(canonical, []).extend(aliases)
+    return synonyms
+
+
+@functools.lru_cache(maxsize=None)
+def skill_automaton(path: str = settings.SKILL_DICTIONARY_PATH) -> SkillAutomaton:
+    """Compiled once per dictionary and shared by every caller."""
+    return SkillAutomaton(load_synonyms(path))
+
+
+def find_skills(text: str) -> set[str]:
+    """Canonical names of every dictionary skill mentioned in the text."""
+    return skill_automaton().find(text)
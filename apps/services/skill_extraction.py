@@ -0,0 +1,138 @@
+# skill_extraction.py (Micro-batched jobbert skill extraction)
+
+import asyncio
+import contextvars
+import time
+
+from apps.services.embedding_cache import SkillCache, skill_cache
+from apps.services.model_registry import ModelRegistry, ModelUnavailableError, model_registry
+from apps.tracing import traced
+from config import settings
+
+FALLBACK_SKILLS = {"Python", "FastAPI", "SQL"}
+
+
+def aggregate_skill_spans(text: str, entities: list[dict]) -> set[str]:
+    """
+    Merges token-level B/I predictions into skill phrases. A B token opens a span,
+    following I tokens extend it; the phrase is cut from the original text by offset.
+    """
+    skills = set()
+    span = None  # [start, end, last_token_index]
+
+    def close():
+        if span:
+            phrase = text[span[0]:span[1]].strip(" ,.;:()")
+            if phrase:
+                skills.add(phrase)
+
+    for entity in sorted(entities, key=lambda e: e.get("index", 0)):
+        label = entity.get("entity", "")
+        tag = label.split("-", 1)[0]
+        if tag not in ("B", "I"):
+            continue
+        start, end, index = entity.get("start"), entity.get("end"), entity.get("index", 0)
+        if start is None or end is None:
+            continue
+        if tag == "I" and span and index == span[2] + 1:
+            span[1], span[2] = end, index
+        else:
+            close()
+            span = [start, end, index]
+    close()
+    return skills
+
+
+class SkillExtractionBatcher:
+    """
+    Collects texts from concurrent callers for up to `max_wait_ms` (or until
+    `max_batch_size` texts are queued) and runs them through the NER pipeline as
+    one batched call.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry = model_registry,
+        cache: SkillCache = skill_cache,
+        max_batch_size: int = settings.SKILL_BATCH_SIZE,
+        max_wait_ms: float = settings.SKILL_BATCH_MAX_WAIT_MS,
+    ):
+        self.registry = registry
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._loop = None
+        self._queue = None
+        self._worker = None
+        self.stats = {"requests": 0, "cache_hits": 0, "batches": 0, "batched_texts": 0}
+
+    async def extract(self, text: str) -> set[str]:
+        self.stats["requests"] += 1
+        if not text or not text.strip():
+            return set()
+        cached = self.cache.get(text)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # One worker per event loop; queues and futures cannot cross loops
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            # Fresh context: the worker serves every caller, so it must not record into one caller's trace
+            self._worker = loop.create_task(self._run(), context=contextvars.Context())
+
+        future = loop.create_future()
+        with traced("model", "skill_extractor", input_size=len(text)):
+            await self._queue.put((text, future))
+            return await future
+
+    async def extract_many(self, texts: list[str]) -> list[set[str]]:
+        return await asyncio.gather(*(self.extract(text) for text in texts))
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                results = await asyncio.to_thread(self._extract_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(set(results[text]))
+
+    def _extract_batch(self, texts: list[str]) -> dict:
+        try:
+            extractor = self.registry.get("skill_extractor")
+        except ModelUnavailableError as e:
+            print(f"Warning: Skill extractor unavailable. Using fallback. Error: {e}")
+            return {text: FALLBACK_SKILLS for text in texts}
+
+        self.stats["batches"] += 1
+        self.stats["batched_texts"] += len(texts)
+        with traced("model", "skill_extractor_batch", input_size=len(texts)):
+            outputs = extractor(texts, batch_size=len(texts))
+        results = {}
+        for text, entities in zip(texts, outputs):
+            results[text] = aggregate_skill_spans(text, entities)
+            self.cache.put(text, results[text])
+        return results
+
+
+# --- Shared batcher ---
+skill_batcher = SkillExtractionBatcher()
@@ -0,0 +1,482 @@
+# vector_index.py (ANN index over stored job embeddings for semantic search)
+
+import atexit
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from apps.services.embeddings import job_text, normalize_rows
+from apps.services.job_store import job_identity
+from apps.text_utils import tokenize
+from config import settings
+
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+
+_ASSIGN_CHUNK = 4096  # Rows scored against the centroids at once; bounds the temporary matrix
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return np.concatenate([
+        np.argmax(vectors[start:start + _ASSIGN_CHUNK] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), _ASSIGN_CHUNK)
+    ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+
+
+class IVFLists:
+    """
+    Inverted file in pure NumPy: spherical k-means centroids, and each row filed
+    under its nearest centroid. A query scans only the rows of its `nprobe`
+    closest lists.
+    """
+
+    def __init__(self, nlist: int = settings.VECTOR_INDEX_NLIST, nprobe: int = settings.VECTOR_INDEX_NPROBE,
+                 iterations: int = 8, seed: int = 0):
+        self.nlist = nlist  # 0: about 4 * sqrt(rows) at training time
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids = None
+        self.assign = np.zeros(0, dtype=np.int32)  # row -> list, -1 when not filed
+        self._lists = []
+        self._arrays = {}  # list -> cached np array of its rows
+        self.trained_on = 0
+
+    def train(self, vectors: np.ndarray, rows: np.ndarray):
+        nlist = min(self.nlist or max(1, int(4 * np.sqrt(len(rows)))), len(rows))
+        rng = np.random.default_rng(self.seed)
+        sample = vectors[np.sort(rng.choice(rows, size=min(len(rows), nlist * 40), replace=False))]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(self.iterations):
+            labels = _nearest(sample, centroids)
+            order = np.argsort(labels, kind="stable")
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = sample[rng.choice(len(sample), nlist)]  # Empty lists are reseeded at random
+            sums[present] = np.add.reduceat(sample[order], starts)
+            centroids = normalize_rows(sums).astype(np.float32)
+        self.centroids = centroids
+        self.assign = np.full(len(vectors), -1, dtype=np.int32)
+        self._lists = [[] for _ in range(nlist)]
+        self._arrays = {}
+        self.add(rows, vectors[rows])
+        self.trained_on = len(rows)
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray):
+        if self.centroids is None:
+            return
+        if len(rows) and rows.max() >= len(self.assign):
+            self.assign = np.concatenate([self.assign, np.full(rows.max() + 1 - len(self.assign), -1, dtype=np.int32)])
+        for row, label in zip(rows.tolist(), _nearest(vectors, self.centroids).tolist()):
+            self.assign[row] = label
+            self._lists[label].append(row)
+            self._arrays.pop(label, None)
+
+    def remove(self, rows):
+        if self.centroids is None:
+            return
+        for row in rows:
+            label = self.assign[row] if row < len(self.assign) else -1
+            if label >= 0:
+                self._lists[label].remove(row)
+                self._arrays.pop(label, None)
+                self.assign[row] = -1
+
+    def candidates(self, query: np.ndarray, k: int, nprobe: int = None) -> np.ndarray:
+        nprobe = min(nprobe or self.nprobe, len(self._lists))
+        closest = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        arrays = []
+        for label in closest.tolist():
+            if label not in self._arrays:
+                self._arrays[label] = np.asarray(self._lists[label], dtype=np.int64)
+            arrays.append(self._arrays[label])
+        return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+
+    def state(self) -> dict:
+        return {"centroids": self.centroids, "assign": self.assign, "trained_on": self.trained_on}
+
+    def restore(self, state: dict):
+        self.centroids = state["centroids"]
+        self.assign = state["assign"]
+        self.trained_on = int(state["trained_on"])
+        self._lists = [[] for _ in range(len(self.centroids))]
+        self._arrays = {}
+        for row, label in enumerate(self.assign.tolist()):
+            if label >= 0:
+                self._lists[label].append(row)
+
+
+class HNSWGraph:
+    """hnswlib graph over inner product (rows are unit length, so this is cosine)."""
+
+    def __init__(self, dim: int, m: int = settings.VECTOR_INDEX_HNSW_M,
+                 ef_construction: int = settings.VECTOR_INDEX_HNSW_EF_CONSTRUCTION,
+                 ef: int = settings.VECTOR_INDEX_HNSW_EF, capacity: int = 1024, path: str = None):
+        self.graph = hnswlib.Index(space="ip", dim=dim)
+        if path:
+            self.graph.load_index(path, max_elements=capacity)
+        else:
+            self.graph.init_index(max_elements=capacity, ef_construction=ef_construction, M=m)
+        self.graph.set_ef(ef)
+        self.ef = ef
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray):
+        needed = self.graph.get_current_count() + len(rows)
+        if needed > self.graph.get_max_elements():
+            self.graph.resize_index(max(needed, 2 * self.graph.get_max_elements()))
+        self.graph.add_items(vectors, rows)
+
+    def remove(self, rows):
+        for row in rows:
+            self.graph.mark_deleted(int(row))
+
+    def candidates(self, query: np.ndarray, k: int, allowed: np.ndarray = None) -> np.ndarray:
+        self.graph.set_ef(max(self.ef, k))
+        labels, _ = self.graph.knn_query(
+            query, k=k, filter=(lambda row: bool(allowed[row])) if allowed is not None else None
+        )
+        return labels[0].astype(np.int64)
+
+    def save(self, path: str):
+        self.graph.save_index(path)
+
+
+class JobVectorIndex:
+    """
+    Unit-length job embeddings keyed by job identity, with location tokens and the
+    time each job was first seen for filtering. Nearest-neighbour candidates come
+    from an HNSW graph (when hnswlib is installed and the backend allows it) or
+    IVF lists; candidates are re-scored exactly. Below `train_min` rows, or when a
+    filter leaves at most `exact_max` rows, the search is an exact scan instead.
+
+    Deletes leave tombstones that are compacted away once they pass a quarter of
+    the rows. `save` writes one .npz file (plus the hnswlib graph) atomically.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.VECTOR_INDEX_PATH,
+        backend: str = settings.VECTOR_INDEX_BACKEND,
+        train_min: int = settings.VECTOR_INDEX_TRAIN_MIN,
+        exact_max: int = settings.VECTOR_INDEX_EXACT_MAX,
+    ):
+        if backend not in ("auto", "ivf", "hnsw"):
+            raise ValueError(f"Unknown vector index backend '{backend}'; expected auto, ivf or hnsw")
+        if backend == "hnsw" and not HNSW_AVAILABLE:
+            raise ValueError("Vector index backend 'hnsw' needs the hnswlib package")
+        self.path = path
+        self.backend = "hnsw" if backend == "hnsw" or (backend == "auto" and HNSW_AVAILABLE) else "ivf"
+        self.train_min = train_min
+        self.exact_max = exact_max
+        self._lock = threading.RLock()
+        self._reset(dim=None)
+        self._loaded = False
+        self.dirty = False
+
+    def _reset(self, dim):
+        self.dim = dim
+        self.count = 0  # Rows in use, tombstones included
+        self.vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self.first_seen = np.zeros(0, dtype=np.float64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.keys = []
+        self.locations = []
+        self.rows = {}  # job key -> row
+        self.location_rows = defaultdict(set)  # location token -> rows
+        self.ann = None
+
+    # --- Updates ---
+    def add(self, keys: list[str], vectors: np.ndarray, locations: list[str], first_seen: list[float]):
+        """Inserts jobs (replacing any already indexed under the same key)."""
+        if not keys:
+            return
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            self._load()
+            self.remove([key for key in keys if key in self.rows])
+            if self.dim is None:
+                self._reset(dim=vectors.shape[1])
+            self._grow(self.count + len(keys))
+            rows = np.arange(self.count, self.count + len(keys))
+            self.vectors[rows] = vectors
+            self.first_seen[rows] = first_seen
+            self.alive[rows] = True
+            for row, key, location in zip(rows.tolist(), keys, locations):
+                self.keys.append(key)
+                self.locations.append(location or "")
+                self.rows[key] = row
+                for token in set(tokenize(location)):
+                    self.location_rows[token].add(row)
+            self.count += len(keys)
+            if self.ann is not None:
+                self.ann.add(rows, vectors)
+            self._maybe_build()
+            self.dirty = True
+
+    def remove(self, keys: list[str]) -> int:
+        with self._lock:
+            self._load()
+            rows = [self.rows.pop(key) for key in keys if key in self.rows]
+            for row in rows:
+                self.alive[row] = False
+                for token in set(tokenize(self.locations[row])):
+                    self.location_rows[token].discard(row)
+            if rows and self.ann is not None:
+                self.ann.remove(rows)
+            if rows:
+                self.dirty = True
+            if self.count - len(self.rows) > max(1000, self.count // 4):
+                self._compact()
+            return len(rows)
+
+    def prune(self, older_than: float) -> int:
+        """Drops jobs first seen before `older_than` (epoch seconds)."""
+        with self._lock:
+            self._load()
+            stale = np.flatnonzero(self.alive[:self.count] & (self.first_seen[:self.count] < older_than))
+            return self.remove([self.keys[row] for row in stale.tolist()])
+
+    def _grow(self, rows_needed: int):
+        capacity = len(self.vectors)
+        if rows_needed <= capacity:
+            return
+        capacity = max(1024, 2 * capacity, rows_needed)
+        self.vectors = np.resize(self.vectors, (capacity, self.dim))
+        self.first_seen = np.resize(self.first_seen, capacity)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self.alive)] = self.alive
+        self.alive = alive
+
+    def _maybe_build(self):
+        live = len(self.rows)
+        if self.backend == "hnsw":
+            if self.ann is None and live >= self.train_min:
+                self.ann = HNSWGraph(self.dim, capacity=max(1024, 2 * live))
+                rows = np.flatnonzero(self.alive[:self.count])
+                self.ann.add(rows, self.vectors[rows])
+        elif live >= self.train_min and (self.ann is None or live > 2 * self.ann.trained_on):
+            # Retrain as the index doubles so list sizes stay balanced
+            self.ann = self.ann or IVFLists()
+            self.ann.train(self.vectors[:self.count], np.flatnonzero(self.alive[:self.count]))
+
+    def _compact(self):
+        live = np.flatnonzero(self.alive[:self.count])
+        vectors, first_seen = self.vectors[live], self.first_seen[live]
+        keys, locations = [self.keys[row] for row in live], [self.locations[row] for row in live]
+        self._reset(dim=self.dim)
+        self.add(keys, vectors, locations, first_seen)
+
+    # --- Queries ---
+    def _allowed(self, location: str, max_age: float, now: float):
+        """Boolean row mask for the filters, or None when nothing is filtered."""
+        location_tokens = set(tokenize(location))
+        if not location_tokens and max_age is None:
+            return None
+        allowed = self.alive[:self.count].copy()
+        if location_tokens:
+            rows = set.intersection(*(self.location_rows.get(token, set()) for token in location_tokens))
+            mask = np.zeros(self.count, dtype=bool)
+            mask[list(rows)] = True
+            allowed &= mask
+        if max_age is not None:
+            allowed &= self.first_seen[:self.count] >= now - max_age
+        return allowed
+
+    def search(self, query: np.ndarray, k: int = 10, location: str = "", max_age: float = None,
+               now: float = None) -> list[tuple[str, float]]:
+        """Best `k` (job key, cosine score) pairs; `max_age` in seconds since first seen."""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        with self._lock:
+            self._load()
+            if not self.rows:
+                return []
+            allowed = self._allowed(location, max_age, now or time.time())
+            if allowed is not None and allowed.sum() <= self.exact_max:
+                candidates = np.flatnonzero(allowed)
+            elif self.ann is None:
+                candidates = np.flatnonzero(self.alive[:self.count] if allowed is None else allowed)
+            else:
+                candidates = self._ann_candidates(query, k, allowed)
+            if not len(candidates):
+                return []
+            scores = self.vectors[candidates] @ query
+            best = np.argsort(-scores)[:k] if len(scores) <= k else np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [(self.keys[candidates[i]], float(scores[i])) for i in best]
+
+    def _ann_candidates(self, query, k, allowed) -> np.ndarray:
+        if self.backend == "hnsw":
+            try:
+                return self.ann.candidates(query, min(k, len(self.rows)), allowed)
+            except RuntimeError:
+                # Too few allowed rows reachable through the graph: scan them instead
+                return np.flatnonzero(allowed if allowed is not None else self.alive[:self.count])
+        nprobe = self.ann.nprobe
+        while True:
+            candidates = self.ann.candidates(query, k, nprobe)
+            keep = self.alive[candidates] if allowed is None else allowed[candidates]
+            candidates = candidates[keep]
+            # A selective filter can leave fewer than k rows in the probed lists: widen the probe
+            if len(candidates) >= k or nprobe >= len(self.ann.centroids):
+                return candidates
+            nprobe *= 2
+
+    # --- Persistence ---
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        data = np.load(self.path)
+        if data["vectors"].shape[0] == 0:
+            return
+        keys, locations = data["keys"].tolist(), data["locations"].tolist()
+        alive = data["alive"]
+        self._reset(dim=data["vectors"].shape[1])
+        self._grow(len(keys))
+        self.count = len(keys)
+        self.vectors[:self.count] = data["vectors"]
+        self.first_seen[:self.count] = data["first_seen"]
+        self.alive[:self.count] = alive
+        self.keys, self.locations = keys, locations
+        for row in np.flatnonzero(alive).tolist():
+            self.rows[keys[row]] = row
+            for token in set(tokenize(locations[row])):
+                self.location_rows[token].add(row)
+
+        graph_path = self.path + ".hnsw"
+        if self.backend == "ivf" and "centroids" in data:
+            self.ann = IVFLists()
+            self.ann.restore({"centroids": data["centroids"], "assign": data["assign"], "trained_on": data["trained_on"]})
+        elif self.backend == "hnsw" and os.path.exists(graph_path):
+            self.ann = HNSWGraph(self.dim, capacity=max(1024, 2 * self.count), path=graph_path)
+        else:
+            self._maybe_build()
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            arrays = {
+                "vectors": self.vectors[:self.count],
+                "first_seen": self.first_seen[:self.count],
+                "alive": self.alive[:self.count],
+                "keys": np.array(self.keys, dtype=str),
+                "locations": np.array(self.locations, dtype=str),
+            }
+            if isinstance(self.ann, IVFLists):
+                arrays.update(self.ann.state())
+            elif isinstance(self.ann, HNSWGraph):
+                self.ann.save(self.path + ".hnsw.tmp")
+                os.replace(self.path + ".hnsw.tmp", self.path + ".hnsw")
+            with open(self.path + ".tmp", "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(self.path + ".tmp", self.path)
+            self.dirty = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self.rows)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._load()
+            return key in self.rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._load()
+            return {
+                "backend": self.backend,
+                "jobs": len(self.rows),
+                "tombstones": self.count - len(self.rows),
+                "dim": self.dim,
+                "ann_built": self.ann is not None,
+                "ivf_lists": len(self.ann.centroids) if isinstance(self.ann, IVFLists) else None,
+            }
+
+
+class JobIndexer:
+    """
+    Keeps the vector index in step with the job store: newly stored jobs are
+    embedded (through the persistent embedding cache) and inserted on a single
+    background thread, and the index is saved at most every `save_interval`.
+    """
+
+    def __init__(self, index: JobVectorIndex, embed=None, save_interval: float = settings.VECTOR_INDEX_SAVE_INTERVAL):
+        self.index = index
+        self._embed = embed
+        self.save_interval = save_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-index")
+        self._last_save = time.monotonic()
+        self._built = False
+        self._build_lock = threading.Lock()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        if self._embed is None:
+            # Imported late: the match engine imports the search engine, which imports this module
+            from apps.services.match_engine import JobMatchResumeMCP
+            self._embed = JobMatchResumeMCP().embed
+        return self._embed(texts)
+
+    def submit(self, jobs: list[dict], now: float = None, first_seen: list[float] = None):
+        """Queues jobs for indexing; `first_seen` keeps the stored times of re-embedded jobs."""
+        if jobs:
+            self._executor.submit(self._index_safely, jobs, first_seen or [now or time.time()] * len(jobs))
+
+    def _index_safely(self, jobs, first_seen):
+        try:
+            self.index_jobs(jobs, first_seen)
+        except Exception as e:
+            print(f"Indexing {len(jobs)} jobs failed: {e}")
+
+    def index_jobs(self, jobs: list[dict], first_seen: list[float]):
+        vectors = self.embed([job_text(job) for job in jobs])
+        self.index.add([job_identity(job) for job in jobs], vectors, [job.get("location", "") for job in jobs], first_seen)
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.index.save()
+            self._last_save = time.monotonic()
+
+    def ensure_built(self, store, batch_size: int = 1024):
+        """
+        Backfills stored jobs the index is missing, on the first query. The index
+        only ever holds stored jobs, so it is complete once it is as large as the
+        store; jobs submitted by earlier searches don't count as a backfill.
+        """
+        with self._build_lock:
+            if self._built:
+                return
+            if len(self.index) < store.count():
+                batch, seen = [], []
+                for job, first_seen in store.all_jobs():
+                    if job_identity(job) in self.index:
+                        continue
+                    batch.append(job)
+                    seen.append(first_seen)
+                    if len(batch) >= batch_size:
+                        self.index_jobs(batch, seen)
+                        batch, seen = [], []
+                if batch:
+                    self.index_jobs(batch, seen)
+                self.index.save()
+            self._built = True
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.index.save()
+
+
+# --- Shared index ---
+job_index = JobVectorIndex()
+job_indexer = JobIndexer(job_index)
+atexit.register(job_indexer.close)
@@ -0,0 +1,22 @@
+# text_utils.py (Shared text normalization)
+
+import hashlib
+import re
+
+STOPWORDS = {"a", "an", "and", "or", "the", "in", "of", "for", "to", "with", "at", "on", "jobs", "job"}
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = (t.rstrip(".") for t in _TOKEN_RE.findall((text or "").lower()))
+    return [t for t in tokens if t and t not in STOPWORDS]
+
+
+def query_key(keywords: str, location: str) -> str:
+    """Normalized (keywords, location) so trivially different queries share a key."""
+    return " ".join(sorted(set(tokenize(keywords)))) + "|" + " ".join(sorted(set(tokenize(location))))
+
+
+def text_hash(text: str) -> str:
+    """Content hash that ignores whitespace differences."""
+    return hashlib.sha256(" ".join((text or "").split()).encode()).hexdigest()
@@ -1,36 +1,50 @@
 # tools.py (Corrected and Enhanced)
-from typing import List, Set
-from langchain.tools import tool
+from typing import List, Optional, Set
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
-from transformers import pipeline
-from config import settings
-from apps.job_scraper import (
-    indeed_api, linkedin_api, glassdoor_api, google_jobs_api,
-    jsearch_api, monster_api, ziprecruiter_api
-)
 import asyncio
-from apps.services import ResumeOptimizer, ATSChecker, JobMatchResumeMCP, JobMarketIntelligence
-
-
-# Load Hugging Face model
-try:
-    skill_extractor = pipeline("ner", model=settings.SKILL_EXTRACTION_MODEL)
-except Exception as e:
-    print(f"Warning: Failed to load skill extractor. Using fallback. Error: {e}")
-    skill_extractor = None
+import functools
+from apps.services import ResumeOptimizer, JobMatchResumeMCP, JobMarketIntelligence
+from apps.services.ats_checker import ats_checker
+from apps.services.job_search_engine import JobSearchEngine
+from apps.services.skill_extraction import skill_batcher
+from apps.services.session_store import remember_search_results
+
+
+# Shared service instances (models and caches behind them are process-wide)
+job_engine = JobSearchEngine()
+resume_optimizer = ResumeOptimizer()
+market_intelligence = JobMarketIntelligence()
+match_engine = JobMatchResumeMCP()
+
+def async_tool(coroutine):
+    """
+    Like @tool, but for an async implementation. The agent awaits the coroutine on
+    the server's event loop; sync callers get an asyncio.run fallback.
+    """
+    @functools.wraps(coroutine)
+    def func(*args, **kwargs):
+        return asyncio.run(coroutine(*args, **kwargs))
+
+    return StructuredTool.from_function(
+        func=func, coroutine=coroutine, name=coroutine.__name__, description=coroutine.__doc__
+    )
 
-# Helper function
+# Helper functions
 async def _internal_extract_skills(text: str) -> Set[str]:
-    def extract():
-        if not skill_extractor:
-            return {"Python", "FastAPI", "SQL"}
-        skills = skill_extractor(text)
-        return set(
-            skill.get("word", "").strip()
-            for skill in skills
-            if isinstance(skill.get("word", ""), str) and "SKILL" in skill.get("entity", "")
-        )
-    return await asyncio.to_thread(extract)
+    return await skill_batcher.extract(text)
+
+async def _publish_jobs(source: str, jobs: list[dict]):
+    """Surfaces partial search results to streaming clients as a `job_batch` event."""
+    listings = [
+        {key: job.get(key) for key in ("id", "title", "company", "location", "url")}
+        for job in jobs
+    ]
+    try:
+        await adispatch_custom_event("job_batch", {"source": source, "jobs": listings})
+    except RuntimeError:
+        pass  # Not inside an agent run (e.g. the tool was called directly)
 
 # Pydantic Models for Tool Inputs
 class ResumeInput(BaseModel):
@@ -40,6 +54,11 @@ class JobSearchInput(BaseModel):
     keywords: str = Field(..., description="The job title(s) to search for")
     location: str = Field(..., description="The city or region to search in")
 
+class SemanticJobSearchInput(BaseModel):
+    query: str = Field(..., description="What the user is looking for, in their own words (role, skills, seniority)")
+    location: str = Field("", description="City or region to restrict results to; empty for anywhere")
+    max_age_days: Optional[float] = Field(None, description="Only jobs first seen within this many days")
+
 class ResumeJobCompareInput(BaseModel):
     resume_text: str = Field(..., description="The text content of the resume")
     job_description: str = Field(..., description="The job description to compare")
@@ -60,39 +79,26 @@ class JobMatchInput(BaseModel):
     preferences: dict = Field(...)
 
 # --- Tools ---
-@tool
-def extract_skills_from_text(input: ResumeInput) -> List[str]:
+@async_tool
+async def extract_skills_from_text(input: ResumeInput) -> List[str]:
     """Extract a list of technical skills from a block of text."""
-    skills = asyncio.run(_internal_extract_skills(input.text))
+    skills = await _internal_extract_skills(input.text)
     return list(skills)
 
-@tool
-def search_for_jobs(input: JobSearchInput) -> str:
+@async_tool
+async def search_for_jobs(input: JobSearchInput) -> str:
     """Search for jobs on multiple platforms using keywords and location."""
     keywords = input.keywords
     location = input.location
 
-    search_tasks = [
-        asyncio.to_thread(jsearch_api.search, keywords, location),
-        asyncio.to_thread(google_jobs_api.search, keywords, location),
-        asyncio.to_thread(indeed_api.search, keywords, location),
-        asyncio.to_thread(ziprecruiter_api.search, keywords, location),
-        asyncio.to_thread(monster_api.search, keywords, location),
-        asyncio.to_thread(linkedin_api.search, keywords, location),
-        asyncio.to_thread(glassdoor_api.search, keywords, location),
-    ]
-
-    results = asyncio.run(asyncio.gather(*search_tasks, return_exceptions=True))
-
-    all_jobs = [job for res in results if isinstance(res, list) for job in res]
+    # The engine merges cross-platform near-duplicates, so every job here is unique
     unique_jobs = []
-    seen_urls = set()
-    for job in all_jobs:
-        url = job.get("url")
-        if url and url not in seen_urls:
-            seen_urls.add(url)
-            unique_jobs.append(job)
+    async for source, jobs in job_engine.stream_all_platforms(keywords, location):
+        unique_jobs.extend(jobs)
+        if jobs:
+            await _publish_jobs(source, jobs)
 
+    remember_search_results(unique_jobs)
     if not unique_jobs:
         return "No jobs found."
 
@@ -102,15 +108,36 @@ def search_for_jobs(input: JobSearchInput) -> str:
             f"{i}. Title: {job.get('title', 'N/A')}\n"
             f"   Company: {job.get('company', 'N/A')}\n"
             f"   Location: {job.get('location', 'N/A')}\n"
-            f"   URL: {job.get('url', 'N/A')}\n\n"
+            f"   URL: {job.get('url', 'N/A')}\n"
+            f"   Listed on: {', '.join(dict.fromkeys(s['source'] for s in job.get('sources', []) if s['source'])) or 'N/A'}\n\n"
         )
     return output
 
-@tool
-def analyze_resume_against_job(input: ResumeJobCompareInput) -> str:
+@async_tool
+async def semantic_job_search(input: SemanticJobSearchInput) -> str:
+    """Search already collected jobs by meaning, e.g. "backend Python roles with Kubernetes". Fast; does not query job boards."""
+    jobs = await job_engine.semantic_search(input.query, input.location, input.max_age_days)
+    remember_search_results(jobs)
+    if not jobs:
+        return "No stored jobs match; try search_for_jobs to query the job boards."
+
+    output = "Closest stored job listings:\n\n"
+    for i, job in enumerate(jobs, 1):
+        output += (
+            f"{i}. Title: {job.get('title', 'N/A')}\n"
+            f"   Company: {job.get('company', 'N/A')}\n"
+            f"   Location: {job.get('location', 'N/A')}\n"
+            f"   URL: {job.get('url', 'N/A')}\n"
+            f"   Relevance: {job['semantic_score']:.2f}\n\n"
+        )
+    return output
+
+@async_tool
+async def analyze_resume_against_job(input: ResumeJobCompareInput) -> str:
     """Analyze a resume against a job description to find matching/missing skills."""
-    resume_skills = asyncio.run(_internal_extract_skills(input.resume_text))
-    job_skills = asyncio.run(_internal_extract_skills(input.job_description))
+    resume_skills, job_skills = await skill_batcher.extract_many(
+        [input.resume_text, input.job_description]
+    )
 
     matching = list(resume_skills & job_skills)
     missing = list(job_skills - resume_skills)
@@ -122,28 +149,22 @@ def analyze_resume_against_job(input: ResumeJobCompareInput) -> str:
         f"Consider learning {missing[0] if missing else 'relevant skills'}."
     )
 
-@tool
-def get_market_insights(input: MarketInsightInput) -> dict:
+@async_tool
+async def get_market_insights(input: MarketInsightInput) -> dict:
     """Provides salary and skill demand insights for a job title."""
-    insight = JobMarketIntelligence()
-    result = asyncio.run(insight.generate_market_insights([input.job_title], [input.job_title]))
-    return result
+    return await market_intelligence.generate_market_insights([input.job_title], [input.job_title])
 
-@tool
-def optimize_resume_for_job(input: ResumeOptimizationInput) -> dict:
+@async_tool
+async def optimize_resume_for_job(input: ResumeOptimizationInput) -> dict:
     """Optimizes a resume for a specific job description."""
-    optimizer = ResumeOptimizer()
-    result = asyncio.run(optimizer.optimize_resume_for_job(input.resume, {"description": input.job_description}))
-    return result
+    return await resume_optimizer.optimize_resume_for_job(input.resume, {"description": input.job_description})
 
-@tool
-def ats_check_resume(input: ATSCheckInput) -> dict:
+@async_tool
+async def ats_check_resume(input: ATSCheckInput) -> dict:
     """Performs ATS compatibility analysis."""
-    checker = ATSChecker()
-    return asyncio.run(checker.analyze_ats_compatibility(input.resume, input.job_description))
+    return await ats_checker.analyze_ats_compatibility(input.resume, input.job_description)
 
-@tool
-def match_jobs_to_resume(input: JobMatchInput) -> dict:
+@async_tool
+async def match_jobs_to_resume(input: JobMatchInput) -> dict:
     """Find and optimize best-matching jobs from resume and preferences."""
-    matcher = JobMatchResumeMCP()
-    return asyncio.run(matcher.find_and_optimize_jobs(input.resume_text, input.preferences))
+    return await match_engine.find_and_optimize_jobs(input.resume_text, input.preferences)
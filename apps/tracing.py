@@ -0,0 +1,198 @@
+# tracing.py (Per-invocation spans + process-wide latency histograms)
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+# Seconds; spans from sub-millisecond cache hits up to multi-minute scrapes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Histograms and counters rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._counters = {}    # (name, labels) -> float
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, /, help: str = "", **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(name, help)
+            self._histograms.setdefault(key, Histogram()).observe(value)
+
+    def inc(self, name: str, value: float = 1, /, help: str = "", **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(name, help)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @staticmethod
+    def _labels(labels, extra=()) -> str:
+        pairs = [*labels, *extra]
+        if not pairs:
+            return ""
+        escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for metric_type, series in (("counter", self._counters), ("histogram", self._histograms)):
+                for name in sorted({name for name, _ in series}):
+                    lines.append(f"# HELP {name} {self._help.get(name) or name}")
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    for (series_name, labels), value in sorted(series.items()):
+                        if series_name != name:
+                            continue
+                        if metric_type == "counter":
+                            lines.append(f"{name}{self._labels(labels)} {value}")
+                            continue
+                        cumulative = 0
+                        for bound, count in zip([*value.buckets, "+Inf"], value.counts):
+                            cumulative += count
+                            lines.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+                        lines.append(f"{name}_sum{self._labels(labels)} {value.sum}")
+                        lines.append(f"{name}_count{self._labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """Spans recorded while serving one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+
+    def add(self, span: Dict[str, Any]):
+        self.spans.append(span)
+
+    @property
+    def tools_used(self) -> List[str]:
+        return list(dict.fromkeys(span["name"] for span in self.spans if span["stage"] == "tool"))
+
+    def summary(self) -> Dict[str, Any]:
+        stages = {}
+        for span in self.spans:
+            stages[span["stage"]] = round(stages.get(span["stage"], 0.0) + span["seconds"], 4)
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "stages": stages,
+            "spans": self.spans,
+        }
+
+
+metrics = Metrics()
+current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+def record_span(stage: str, name: str, seconds: float, ok: bool = True, input_size: int = None, output_size: int = None):
+    labels = {"stage": stage, "name": name}
+    metrics.observe("job_agent_stage_seconds", seconds, help="Wall time per traced stage", **labels)
+    if not ok:
+        metrics.inc("job_agent_stage_failures_total", 1, help="Failed traced stages", **labels)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add({
+            "stage": stage, "name": name, "seconds": round(seconds, 4), "ok": ok,
+            "input_size": input_size, "output_size": output_size,
+        })
+
+
+@contextmanager
+def start_trace(endpoint: str):
+    """Collects spans for one request and records its total latency."""
+    trace = Trace()
+    token = current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        current_trace.reset(token)
+        metrics.observe(
+            "job_agent_request_seconds", time.perf_counter() - trace.started,
+            help="End-to-end agent request latency", endpoint=endpoint,
+        )
+
+
+class Span:
+    def __init__(self, input_size: int = None):
+        self.ok = True
+        self.input_size = input_size
+        self.output_size = None
+
+    def fail(self):
+        self.ok = False
+
+
+@contextmanager
+def traced(stage: str, name: str, input_size: int = None):
+    """Times the block; call span.fail() for handled failures, exceptions count automatically."""
+    span = Span(input_size)
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException:
+        span.ok = False
+        raise
+    finally:
+        record_span(stage, name, time.perf_counter() - start, span.ok, span.input_size, span.output_size)
+
+
+class TracingCallbackHandler(AsyncCallbackHandler):
+    """Turns LangChain tool and LLM callbacks into spans on the current trace."""
+
+    def __init__(self):
+        self._runs: Dict[UUID, tuple] = {}  # run_id -> (stage, name, started, input_size)
+
+    def _start(self, run_id: UUID, stage: str, name: str, input_size: int):
+        self._runs[run_id] = (stage, name, time.perf_counter(), input_size)
+
+    def _end(self, run_id: UUID, ok: bool, output_size: Optional[int] = None):
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            stage, name, started, input_size = run
+            record_span(stage, name, time.perf_counter() - started, ok, input_size, output_size)
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._start(run_id, "tool", (serialized or {}).get("name") or kwargs.get("name") or "tool", len(input_str or ""))
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id, True, len(str(getattr(output, "content", output))))
+
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, False)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        name = (serialized or {}).get("name") or "chat_model"
+        self._start(run_id, "llm", name, sum(len(str(m.content)) for batch in messages for m in batch))
+
+    async def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, "llm", (serialized or {}).get("name") or "llm", sum(len(p) for p in prompts))
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        size = sum(len(g.text or "") for generations in response.generations for g in generations)
+        self._end(run_id, True, size)
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, False)
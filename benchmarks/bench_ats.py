@@ -0,0 +1,65 @@
+# bench_ats.py
+#
+# Model-free ATS scoring: automaton compile time, then one resume against N
+# synthetic jobs, cold (job profiles built) and warm (profiles cached).
+#
+#   python -m benchmarks.bench_ats --jobs 500
+
+import argparse
+import json
+import time
+
+from apps.services.ats_checker import ATSChecker
+from apps.services.skill_dictionary import SkillAutomaton, load_synonyms
+from benchmarks.bench_match_scoring import RESUME, synthetic_jobs
+
+RESUME_DOCUMENT = f"""Jane Doe
+jane@example.com | +91 98765 43210
+
+SUMMARY
+{RESUME}
+
+EXPERIENCE
+Senior Backend Engineer, Acme (2019 - 2024)
+- Built FastAPI and Django services on Kubernetes and AWS.
+- Ran Spark pipelines orchestrated with Airflow; tuned SQL on PostgreSQL.
+
+EDUCATION
+B.Tech Computer Science, 2017
+
+SKILLS
+Python, FastAPI, Django, Kubernetes, Docker, AWS, SQL, Spark, Airflow, Redis
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    automaton = SkillAutomaton(load_synonyms())
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    checker = ATSChecker(automaton=automaton)
+    jobs = synthetic_jobs(args.jobs)
+
+    start = time.perf_counter()
+    cold = checker.rank_jobs(RESUME_DOCUMENT, jobs)
+    cold_s = time.perf_counter() - start
+    start = time.perf_counter()
+    checker.rank_jobs(RESUME_DOCUMENT, jobs)
+    warm_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "jobs": args.jobs,
+        "automaton_states": len(automaton.goto),
+        "compile_ms": round(compile_ms, 2),
+        "cold_us_per_pair": round(cold_s / args.jobs * 1e6, 1),
+        "warm_us_per_pair": round(warm_s / args.jobs * 1e6, 1),
+        "top_scores": [round(score, 3) for _, score in cold[:5]],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_batch_profiles.py
+#
+# Building ATS profiles for a batch chunk inline versus in a process pool, by chunk
+# size, to place BATCH_POOL_MIN_ROWS. The pool is warmed first, so only the
+# per-chunk cost (pickling items out and profiles back) is compared.
+#
+# On one core the pool never wins. Job profiles (~5 us each) cost less to build than
+# to pickle (~9 us each), so they are always built inline. Resume profiles (~0.2 ms
+# each) carry ~8 us of pickling plus a few ms per chunk, so the pool pays off for
+# chunks of a few hundred resumes once there are cores to spread them over.
+#
+#   python -m benchmarks.bench_batch_profiles --sizes 64 256 1024 4096 --workers 2
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from apps.services.batch_scoring import BatchScorer, _build_profiles
+from benchmarks.bench_ats import RESUME_DOCUMENT
+from benchmarks.bench_match_scoring import synthetic_jobs
+
+
+def _timed(run, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024, 4096])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scorer = BatchScorer(workers=args.workers)
+    pool = ProcessPoolExecutor(max_workers=args.workers)
+    asyncio.run(scorer._pooled(pool, "job", synthetic_jobs(args.workers)))  # Start the workers
+
+    report = []
+    for size in args.sizes:
+        jobs = synthetic_jobs(size)
+        resumes = [RESUME_DOCUMENT + f"\nReference {i}" for i in range(size)]
+        row = {"rows": size}
+        for kind, items in (("job", jobs), ("resume", resumes)):
+            inline = _timed(lambda: _build_profiles(kind, items), args.repeat)
+            pooled = _timed(lambda: asyncio.run(scorer._pooled(pool, kind, items)), args.repeat)
+            row[f"{kind}_inline_ms"] = round(inline * 1000, 2)
+            row[f"{kind}_pool_ms"] = round(pooled * 1000, 2)
+        report.append(row)
+    pool.shutdown(wait=True)
+    print(json.dumps({"workers": args.workers, "cpus": os.cpu_count(), "chunks": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_browser_pool.py
+#
+# Per-query scraper latency with a cold browser per query (the old behaviour,
+# reproduced with max_pages=1) versus a warm, pooled browser.
+#
+#   python -m benchmarks.bench_browser_pool --queries 10
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+# No artificial politeness delay against the local fixture server
+os.environ.setdefault("SCRAPER_MIN_DELAY", "0")
+os.environ.setdefault("SCRAPER_MAX_DELAY", "0")
+
+from apps.browser_pool import BrowserPool
+from apps.crawler import CrawlScheduler
+from apps.job_scraper import IndeedScraper, ZipRecruiterScraper
+from benchmarks.fixture_server import FixtureServer
+
+
+class BrowserOnly:
+    """Skips the HTTP fast path so every page goes through the browser pool."""
+
+    def get_html(self, url):
+        return None
+
+
+def run(pool: BrowserPool, base_url: str, queries: int) -> dict:
+    # One results page per query, no detail pages: this measures browser reuse only
+    crawler = CrawlScheduler(max_pages=1, fetch_details=False)
+    indeed = IndeedScraper(pool=pool, fetcher=BrowserOnly(), crawler=crawler)
+    indeed.base_url, indeed.site_url = f"{base_url}/jobs", base_url
+    ziprecruiter = ZipRecruiterScraper(pool=pool, fetcher=BrowserOnly(), crawler=crawler)
+    ziprecruiter.base_url = f"{base_url}/jobs-search"
+
+    latencies = []
+    for i in range(queries):
+        start = time.perf_counter()
+        found = indeed.search(f"python developer {i}", "Bangalore")
+        found += ziprecruiter.search(f"python developer {i}", "Bangalore")
+        latencies.append(time.perf_counter() - start)
+        assert found, "fixture pages returned no jobs"
+    pool.close()
+
+    return {
+        "queries": queries,
+        "mean_s": round(statistics.mean(latencies), 3),
+        "p50_s": round(statistics.median(latencies), 3),
+        "max_s": round(max(latencies), 3),
+        "pool": pool.status(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    with FixtureServer() as server:
+        report = {
+            "cold_browser_per_query": run(BrowserPool(size=1, max_pages=1), server.url, args.queries),
+            "pooled_warm_browser": run(BrowserPool(size=1), server.url, args.queries),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
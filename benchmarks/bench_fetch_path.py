@@ -0,0 +1,105 @@
+# bench_fetch_path.py
+#
+# Per-page cost of the plain HTTP + lxml fast path versus a pooled headless
+# browser, both against the local fixtures, plus the parse step on its own
+# (BeautifulSoup html.parser, the old parser, versus precompiled lxml XPath).
+#
+#   python -m benchmarks.bench_fetch_path --pages 50
+#   python -m benchmarks.bench_fetch_path --pages 50 --skip-browser
+
+import argparse
+import json
+import os
+import resource
+import time
+
+os.environ.setdefault("SCRAPER_MIN_DELAY", "0")
+os.environ.setdefault("SCRAPER_MAX_DELAY", "0")
+
+from bs4 import BeautifulSoup
+
+from apps.browser_pool import BrowserPool
+from apps.http_client import HostRateLimiter, HttpFetcher
+from apps.job_scraper import IndeedScraper
+from benchmarks.fixture_server import FIXTURES_DIR, FixtureServer
+
+
+def parse_with_bs4(html: str) -> int:
+    soup = BeautifulSoup(html, "html.parser")
+    cards = 0
+    for card in soup.find_all("div", class_="job_seen_beacon")[:10]:
+        card.find("h2", class_="jobTitle").find("a").get_text(strip=True)
+        card.find("span", class_="companyName").get_text(strip=True)
+        card.find("div", class_="companyLocation").get_text(strip=True)
+        card.find("div", class_="job-snippet").get_text(strip=True)
+        cards += 1
+    return cards
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def measure(fetch_page, pages: int) -> dict:
+    fetch_page(0)  # Warm up: connection pool / browser launch
+    rss_before = _rss_mb()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    latencies = []
+    for i in range(pages):
+        start = time.perf_counter()
+        assert fetch_page(i), "fixture page returned no jobs"
+        latencies.append(time.perf_counter() - start)
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    latencies.sort()
+    return {
+        "pages": pages,
+        "wall_ms_per_page": round(wall / pages * 1000, 2),
+        "p95_ms": round(latencies[int(0.95 * (pages - 1))] * 1000, 2),
+        "cpu_ms_per_page": round(cpu / pages * 1000, 2),  # This process only; Chrome runs in its own
+        "rss_delta_mb": round(_rss_mb() - rss_before, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--skip-browser", action="store_true", help="Only run the paths that need no Chrome")
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, "indeed.html")) as f:
+        html = f.read()
+    scraper = IndeedScraper()
+    report = {
+        "parse_only": {
+            "bs4_html_parser": measure(lambda i: parse_with_bs4(html), args.pages),
+            "lxml_precompiled_xpath": measure(lambda i: scraper.parse(html), args.pages),
+        }
+    }
+
+    with FixtureServer() as server:
+        url = f"{server.url}/jobs?q=python&l=Bangalore"
+        fetcher = HttpFetcher(rate_limiter=HostRateLimiter(min_interval=0))
+        report["http_lxml"] = measure(lambda i: scraper.parse(fetcher.get_html(f"{url}&p={i}")), args.pages)
+        fetcher.close()
+
+        if not args.skip_browser:
+            pool = BrowserPool(size=1)
+
+            def browser_page(i):
+                with pool.session() as browser:
+                    browser.get(f"{url}&p={i}")
+                    return parse_with_bs4(browser.page_source)
+
+            report["browser_bs4"] = measure(browser_page, args.pages)
+            pool.close()
+            report["speedup_wall"] = round(
+                report["browser_bs4"]["wall_ms_per_page"] / report["http_lxml"]["wall_ms_per_page"], 1
+            )
+
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
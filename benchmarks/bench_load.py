@@ -0,0 +1,212 @@
+# bench_load.py
+#
+# End-to-end latency under concurrency, fully offline: job boards are the recorded
+# fixtures behind a local HTTP server (plus a mock board with injected latency and
+# failures), the Gemini agent LLM is a deterministic fake, and the Hugging Face
+# models are tiny ones set through the usual env settings.
+#
+#   python -m benchmarks.bench_load --requests 50 --concurrency 8 --output load.json
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+
+# Settings are read at import time, so the offline environment is set up first
+_scratch = tempfile.mkdtemp(prefix="bench-load-")
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(_scratch, "jobs.db"))
+os.environ.setdefault("EMBEDDING_CACHE_DIR", os.path.join(_scratch, "embeddings"))
+os.environ.setdefault("VECTOR_INDEX_PATH", os.path.join(_scratch, "job_index.npz"))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")  # Never used: the LLM is swapped out
+os.environ.setdefault("TEXT_SIMILARITY_MODEL", "sentence-transformers/paraphrase-MiniLM-L3-v2")
+os.environ.setdefault("SKILL_EXTRACTION_MODEL", "hf-internal-testing/tiny-random-BertForTokenClassification")
+os.environ.setdefault("TEXT_GENERATION_MODEL", "sshleifer/tiny-gpt2")
+os.environ.setdefault("SCRAPER_MIN_DELAY", "0")
+os.environ.setdefault("SCRAPER_MAX_DELAY", "0")
+
+import httpx
+
+from agent_executor import agent_executor
+from apps.job_scraper import IndeedScraper, ZipRecruiterScraper, build_url
+from apps.scraper_cache import CachedScraper, scraper_cache
+from apps.services.model_registry import model_registry
+from apps.tools import tools
+from benchmarks.bench_match_scoring import RESUME, TITLES
+from benchmarks.fake_chat_model import install_fake_llm
+from benchmarks.fixture_server import FixtureServer
+from main import app
+from mocks import MockJobBoardScraper
+
+CITIES = ["Bangalore", "Pune", "Hyderabad", "Chennai"]
+SCENARIOS = ("agent_invoke", "mcp_invoke", "agent_direct", "search_all_platforms", "match_engine")
+
+
+class FixtureBoardScraper(MockJobBoardScraper):
+    """A real scraper's parser fed over plain HTTP from the fixture server, no browser."""
+
+    def __init__(self, scraper, url: str, **kwargs):
+        super().__init__(name=scraper.name, **kwargs)
+        self.scraper = scraper
+        self.url = url
+
+    def listings(self, keywords, location):
+        with urllib.request.urlopen(build_url(self.url, keywords, location)) as response:
+            return self.scraper.parse(response.read().decode("utf-8"))
+
+
+def fixture_scrapers(base_url: str, latency: float, failure_rate: float, seed: int) -> list:
+    indeed = IndeedScraper()
+    indeed.site_url = base_url
+    options = {"latency": latency, "failure_rate": failure_rate, "seed": seed}
+    boards = [
+        FixtureBoardScraper(indeed, f"{base_url}/jobs", **options),
+        FixtureBoardScraper(ZipRecruiterScraper(), f"{base_url}/jobs-search", **options),
+        MockJobBoardScraper(name="mock_board", **options),
+    ]
+    return [CachedScraper(board, scraper_cache) for board in boards]
+
+
+def query(i: int, distinct: int) -> tuple[str, str]:
+    i %= distinct
+    return TITLES[i % len(TITLES)], CITIES[(i // len(TITLES)) % len(CITIES)]
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+async def run_scenario(call, requests: int, concurrency: int) -> dict:
+    limit = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i):
+        nonlocal errors
+        async with limit:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception as e:
+                errors += 1
+                print(f"request {i} failed: {e}", file=sys.stderr)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(requests / wall, 2),
+        "p50_s": round(_percentile(latencies, 0.50), 4),
+        "p95_s": round(_percentile(latencies, 0.95), 4),
+        "p99_s": round(_percentile(latencies, 0.99), 4),
+        "mean_s": round(statistics.mean(latencies), 4),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def scenario_calls(client: httpx.AsyncClient, distinct: int) -> dict:
+    async def post(path, body):
+        response = await client.post(path, json=body)
+        response.raise_for_status()
+
+    # Pinned to the agent: the intent router would otherwise answer these prompts with a direct tool call
+    async def agent_invoke(i):
+        keywords, location = query(i, distinct)
+        await post("/agent/invoke", {"query": f"Find {keywords} jobs in {location}", "route": "agent"})
+
+    async def mcp_invoke(i):
+        keywords, location = query(i, distinct)
+        await post("/mcp/invoke", {"input": f"Find {keywords} jobs in {location}", "route": "agent"})
+
+    async def agent_direct(i):
+        keywords, location = query(i, distinct)
+        await post("/agent/invoke", {"query": f"Find {keywords} jobs in {location}", "route": "direct"})
+
+    async def search_all_platforms(i):
+        await tools.job_engine.search_all_platforms(*query(i, distinct))
+
+    async def match_engine(i):
+        keywords, location = query(i, distinct)
+        await tools.match_engine.find_and_optimize_jobs(
+            RESUME, {"job_titles": [keywords], "location": location, "experience_level": "senior"}
+        )
+
+    return {
+        "agent_invoke": agent_invoke,
+        "mcp_invoke": mcp_invoke,
+        "agent_direct": agent_direct,
+        "search_all_platforms": search_all_platforms,
+        "match_engine": match_engine,
+    }
+
+
+async def run(args) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        calls = scenario_calls(client, args.distinct_queries)
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(calls[name], args.requests, args.concurrency)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--distinct-queries", type=int, default=8,
+                        help="Queries cycle through this many (title, city) pairs; fewer means more cache hits")
+    parser.add_argument("--board-latency", type=float, default=0.2, help="Seconds added to every job-board search")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of job-board searches that fail")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    agent_executor.verbose = False  # Console logging would dominate the timings
+    install_fake_llm(agent_executor, latency=args.llm_latency)
+    model_registry.warm_up(["text_similarity", "skill_extractor"])
+
+    with FixtureServer() as server:
+        boards = fixture_scrapers(server.url, args.board_latency, args.failure_rate, args.seed)
+        tools.job_engine.scrapers = boards
+        tools.match_engine.job_engine.scrapers = boards
+        results = asyncio.run(run(args))
+
+    report = {
+        "config": {
+            "board_latency_s": args.board_latency,
+            "failure_rate": args.failure_rate,
+            "llm_latency_s": args.llm_latency,
+            "distinct_queries": args.distinct_queries,
+            "models": {name: spec[1] for name, spec in model_registry.specs.items()},
+        },
+        "scenarios": results,
+        "caches": {"scraper": scraper_cache.stats()},
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_match_scoring.py
+#
+# Time to embed and rank N synthetic jobs against one resume on CPU.
+#
+#   python -m benchmarks.bench_match_scoring --jobs 1000
+
+import argparse
+import json
+import random
+import time
+
+from transformers import pipeline
+
+from apps.services.embeddings import embed_texts, cosine_scores, top_k_indices, job_text
+from config import settings
+
+SKILLS = ["Python", "FastAPI", "Django", "Kubernetes", "Docker", "AWS", "GCP", "SQL", "Spark",
+          "PyTorch", "React", "TypeScript", "Go", "Kafka", "Terraform", "Airflow", "Redis"]
+TITLES = ["Backend Engineer", "Data Engineer", "ML Engineer", "Full Stack Developer", "DevOps Engineer"]
+
+RESUME = (
+    "Senior Python developer with 6 years building FastAPI and Django services, "
+    "deploying on Kubernetes and AWS, and running Spark pipelines with Airflow."
+)
+
+
+def synthetic_jobs(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "title": rng.choice(TITLES),
+            "company": f"Company {i}",
+            "description": "We are hiring. Must know " + ", ".join(rng.sample(SKILLS, 5))
+                           + ". " + "You will own services end to end. " * rng.randint(1, 6),
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=settings.MATCH_TOP_K)
+    args = parser.parse_args()
+
+    extractor = pipeline("feature-extraction", model=settings.TEXT_SIMILARITY_MODEL)
+    jobs = synthetic_jobs(args.jobs)
+    embed_texts(extractor, ["warm up"])
+
+    start = time.perf_counter()
+    resume_vector = embed_texts(extractor, [RESUME])[0]
+    job_matrix = embed_texts(extractor, [job_text(job) for job in jobs])
+    embedded = time.perf_counter()
+    scores = cosine_scores(resume_vector, job_matrix)
+    best = top_k_indices(scores, args.top_k)
+    scored = time.perf_counter()
+
+    print(json.dumps({
+        "jobs": args.jobs,
+        "batch_size": settings.EMBEDDING_BATCH_SIZE,
+        "embed_s": round(embedded - start, 4),
+        "score_and_rank_ms": round((scored - embedded) * 1000, 3),
+        "total_s": round(scored - start, 4),
+        "top_scores": [round(float(scores[i]), 4) for i in best],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
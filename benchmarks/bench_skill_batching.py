@@ -0,0 +1,62 @@
+# bench_skill_batching.py
+#
+# Skill-extraction throughput for N concurrent callers: one pipeline call per text
+# (the old path) versus the micro-batching queue.
+#
+#   python -m benchmarks.bench_skill_batching --texts 64
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+
+from apps.services.embedding_cache import SkillCache
+from apps.services.model_registry import model_registry
+from apps.services.skill_extraction import SkillExtractionBatcher, aggregate_skill_spans
+from benchmarks.bench_match_scoring import synthetic_jobs
+from config import settings
+
+
+async def single_text(texts: list[str]) -> float:
+    extractor = model_registry.get("skill_extractor")
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        asyncio.to_thread(lambda t=text: aggregate_skill_spans(t, extractor(t))) for text in texts
+    ))
+    return time.perf_counter() - start
+
+
+async def batched(texts: list[str], batch_size: int, max_wait_ms: float) -> float:
+    # Fresh on-disk cache so every text really goes through the model
+    cache = SkillCache(settings.SKILL_EXTRACTION_MODEL, directory=tempfile.mkdtemp())
+    batcher = SkillExtractionBatcher(cache=cache, max_batch_size=batch_size, max_wait_ms=max_wait_ms)
+    start = time.perf_counter()
+    await batcher.extract_many(texts)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=settings.SKILL_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.SKILL_BATCH_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    texts = [job["description"] for job in synthetic_jobs(args.texts)]
+    model_registry.get("skill_extractor")(texts[0])  # load + warm up outside the timings
+
+    single_s = asyncio.run(single_text(texts))
+    batched_s = asyncio.run(batched(texts, args.batch_size, args.max_wait_ms))
+    print(json.dumps({
+        "texts": args.texts,
+        "batch_size": args.batch_size,
+        "max_wait_ms": args.max_wait_ms,
+        "single_text_per_s": round(args.texts / single_s, 1),
+        "batched_per_s": round(args.texts / batched_s, 1),
+        "speedup": round(single_s / batched_s, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
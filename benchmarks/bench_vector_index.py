@@ -0,0 +1,125 @@
+# bench_vector_index.py
+#
+# Recall@k and query latency of the semantic job index (IVF, and HNSW when
+# hnswlib is installed) against brute-force cosine over the same vectors.
+# Vectors are synthetic and clustered like topic embeddings, so no model is
+# needed; add --filter-location to measure a location-filtered query.
+#
+#   python -m benchmarks.bench_vector_index --jobs 100000
+#   python -m benchmarks.bench_vector_index --jobs 100000 --filter-location
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from apps.services.embeddings import normalize_rows
+from apps.services.vector_index import HNSW_AVAILABLE, JobVectorIndex
+
+CITIES = ["Bangalore", "Hyderabad", "Pune", "Chennai", "Mumbai", "Delhi", "Remote", "Noida", "Gurgaon", "Kolkata"]
+
+
+def synthetic_vectors(n: int, dim: int, topics: int, rng) -> np.ndarray:
+    centers = normalize_rows(rng.standard_normal((topics, dim)).astype(np.float32))
+    # Noise of norm ~0.6 around unit topic centres: neighbours share a topic, as job postings do
+    vectors = centers[rng.integers(0, topics, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32) / np.sqrt(dim)
+    return normalize_rows(vectors).astype(np.float32)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def brute_force(vectors, allowed, query, k):
+    rows = np.flatnonzero(allowed) if allowed is not None else np.arange(len(vectors))
+    scores = vectors[rows] @ query
+    best = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+    return rows[best]
+
+
+def measure(index, keys, vectors, locations, queries, k, location):
+    allowed = np.array([loc == location for loc in locations]) if location else None
+    latencies, recalls, exact_latencies = [], [], []
+    key_rows = {key: row for row, key in enumerate(keys)}
+    for query in queries:
+        start = time.perf_counter()
+        truth = set(brute_force(vectors, allowed, query, k).tolist())
+        exact_latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        hits = index.search(query, k, location=location or "")
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len(truth & {key_rows[key] for key, _ in hits}) / len(truth))
+    return {
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "brute_force_p50_ms": round(percentile(exact_latencies, 0.5) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)  # all-MiniLM-L6-v2
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=None, help="IVF lists probed (default: settings)")
+    parser.add_argument("--ef", type=int, default=None, help="HNSW search breadth (default: settings)")
+    parser.add_argument("--filter-location", action="store_true", help="Restrict queries to one city")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    vectors = synthetic_vectors(args.jobs, args.dim, args.topics, rng)
+    queries = synthetic_vectors(args.queries, args.dim, args.topics, rng)
+    keys = [f"job-{i}" for i in range(args.jobs)]
+    locations = [CITIES[i] for i in rng.integers(0, len(CITIES), args.jobs)]
+    location = "Bangalore" if args.filter_location else None
+    now = time.time()
+
+    report = {"jobs": args.jobs, "dim": args.dim, "k": args.k, "location_filter": location}
+    backends = ["ivf"] + (["hnsw"] if HNSW_AVAILABLE else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            path = os.path.join(tmp, f"{backend}.npz")
+            # exact_max=0: always go through the ANN structure, even for filtered queries
+            index = JobVectorIndex(path=path, backend=backend, exact_max=0)
+            start = time.perf_counter()
+            for chunk in range(0, args.jobs, 10_000):
+                index.add(keys[chunk:chunk + 10_000], vectors[chunk:chunk + 10_000],
+                          locations[chunk:chunk + 10_000], [now] * len(keys[chunk:chunk + 10_000]))
+            build_s = time.perf_counter() - start
+            if backend == "ivf" and args.nprobe:
+                index.ann.nprobe = args.nprobe
+            if backend == "hnsw" and args.ef:
+                index.ann.ef = args.ef
+
+            start = time.perf_counter()
+            index.save()
+            save_s = time.perf_counter() - start
+            start = time.perf_counter()
+            reloaded = JobVectorIndex(path=path, backend=backend, exact_max=0)
+            load_jobs = len(reloaded)
+            load_s = time.perf_counter() - start
+
+            report[backend] = {
+                "build_s": round(build_s, 2),
+                "save_s": round(save_s, 2),
+                "load_s": round(load_s, 2),
+                "loaded_jobs": load_jobs,
+                **index.stats(),
+                **measure(index, keys, vectors, locations, queries, args.k, location),
+            }
+
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# fake_chat_model.py (Deterministic stand-in for ChatGoogleGenerativeAI)
+
+import asyncio
+import re
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+SEARCH_PATTERN = re.compile(r"find (?P<keywords>.+?) jobs in (?P<location>[^.?!]+)", re.IGNORECASE)
+
+
+class DeterministicChatModel(BaseChatModel):
+    """
+    Plays the agent's LLM without a network call: "find <role> jobs in <city>"
+    becomes one search_for_jobs call, a tool result becomes a short final answer,
+    anything else is echoed back. `latency` simulates model time per call.
+    """
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "deterministic-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content=f"Here is what I found: {str(messages[-1].content)[:200]}")
+        human = next((m for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+        text = str(human.content) if human else ""
+        match = SEARCH_PATTERN.search(text)
+        if match is None:
+            return AIMessage(content=f"You asked: {text[:200]}")
+        args = {"input": {"keywords": match["keywords"].strip(), "location": match["location"].strip()}}
+        return AIMessage(content="", tool_calls=[{"name": "search_for_jobs", "args": args, "id": "call_search"}])
+
+    def _generate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+
+def install_fake_llm(executor, latency: float = 0.0) -> DeterministicChatModel:
+    """Swaps the LLM inside an existing AgentExecutor, keeping its prompt and tools."""
+    from agent_executor import prompt
+    from langchain.agents import create_tool_calling_agent
+
+    llm = DeterministicChatModel(latency=latency)
+    executor.agent.runnable = create_tool_calling_agent(llm, executor.tools, prompt)
+    return llm
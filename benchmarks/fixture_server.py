@@ -0,0 +1,52 @@
+# fixture_server.py (Local static job-board server for benchmarks)
+
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Request path -> fixture file, mirroring the real job-board search URLs
+ROUTES = {
+    "/jobs": "indeed.html",
+    "/jobs-search": "ziprecruiter.html",
+    "/viewjob": "indeed_detail.html",
+}
+# Path prefix -> fixture file, for detail pages whose path carries the job slug
+PREFIX_ROUTES = {
+    "/c/": "ziprecruiter_detail.html",
+}
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def translate_path(self, path):
+        route = path.split("?", 1)[0]
+        for prefix, fixture in PREFIX_ROUTES.items():
+            if route.startswith(prefix):
+                return os.path.join(FIXTURES_DIR, fixture)
+        return os.path.join(FIXTURES_DIR, ROUTES.get(route, route.lstrip("/")))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, handler=FixtureHandler):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -6,6 +6,152 @@ class Settings(BaseSettings):
     # Hugging Face Models
     TEXT_SIMILARITY_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     SKILL_EXTRACTION_MODEL: str = "jjzha/jobbert_skill_extraction"
-    TEXT_GENERATION_MODEL: str = "microsoft/DialoGPT-large"
+    TEXT_GENERATION_MODEL: str = "HuggingFaceTB/SmolLM2-135M-Instruct"  # Only loaded by the "local" backend
+    WARMUP_MODELS: list[str] = []  # Registry names to load at startup, e.g. ["text_similarity"]
 
-settings = Settings()
\ No newline at end of file
+    # Embedding-based match scoring
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_MAX_LENGTH: int = 256
+    MATCH_TOP_K: int = 5
+    MATCH_ATS_WEIGHT: float = 0.3  # Share of ATS keyword/structure fit in the match ranking; the rest is cosine
+    EMBEDDING_CACHE_DIR: str = "data/embeddings"
+
+    # Micro-batched skill extraction
+    SKILL_BATCH_SIZE: int = 16
+    SKILL_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # Headless browser pool
+    BROWSER_POOL_SIZE: int = 2
+    BROWSER_MAX_PAGES: int = 25
+    BROWSER_ACQUIRE_TIMEOUT: float = 60.0
+    SCRAPER_MIN_DELAY: float = 2.0
+    SCRAPER_MAX_DELAY: float = 4.0
+
+    # Plain HTTP fast path (the browser pool is the fallback for JavaScript-only pages)
+    HTTP_TIMEOUT: float = 20.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP2_ENABLED: bool = True  # Needs the h2 package; silently HTTP/1.1 without it
+    HTTP_HOST_MIN_INTERVAL: float = 1.0  # Politeness spacing between requests to one host
+
+    # Crawl scheduler (result-page pagination + job detail pages). Requests to one host are
+    # spaced HTTP_HOST_MIN_INTERVAL apart, so a crawl needs about
+    # CRAWL_DOMAIN_MAX_REQUESTS * HTTP_HOST_MIN_INTERVAL seconds (20s here) to fit CRAWL_DEADLINE
+    CRAWL_MAX_PAGES: int = 2
+    CRAWL_FETCH_DETAILS: bool = True
+    CRAWL_MAX_WORKERS: int = 8
+    CRAWL_DOMAIN_CONCURRENCY: int = 2  # Overlaps a slow response with the next slot; spacing still applies
+    CRAWL_DOMAIN_MAX_REQUESTS: int = 20  # Per crawl; jobs past the budget keep their snippet
+    CRAWL_DEADLINE: float = 30.0  # Keep below SOURCE_TIMEOUT so partial results are still delivered
+
+    # Per-source query cache
+    SCRAPER_CACHE_TTL: float = 900
+    SCRAPER_CACHE_STALE_TTL: float = 1800  # Extra window served stale while refreshing
+    SCRAPER_CACHE_MAX_ENTRIES: int = 512
+
+    # Aggregated search
+    SEARCH_MAX_WORKERS: int = 8
+    SOURCE_TIMEOUT: float = 45.0
+    SOURCE_TIMEOUTS: dict[str, float] = {}  # Per-source overrides, e.g. {"indeed": 30}
+    SOURCE_RETRIES: int = 1  # Extra attempts for a source that fails before delivering anything
+    RETRY_BASE_DELAY: float = 0.5
+    RETRY_MAX_DELAY: float = 5.0
+    SOURCE_HEDGE_AFTER: dict[str, float] = {}  # Start a second attempt if nothing arrived by then, e.g. {"indeed": 8}
+
+    # Per-source circuit breakers
+    BREAKER_WINDOW: int = 20  # Recent calls considered
+    BREAKER_MIN_CALLS: int = 5
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_SLOW_CALL_SECONDS: float = 20.0  # Measured to a source's first batch, not to the end of its crawl
+    BREAKER_SLOW_CALL_RATE: float = 0.8
+    BREAKER_OPEN_SECONDS: float = 60.0
+
+    # Persistent job store
+    JOB_STORE_PATH: str = "data/jobs.db"
+    JOB_STORE_TTL: float = 6 * 3600  # Seconds before a (source, query) is re-scraped
+
+    # Semantic job search: vector index over stored job embeddings
+    VECTOR_INDEX_PATH: str = "data/job_index.npz"
+    VECTOR_INDEX_BACKEND: str = "ivf"  # "ivf" (NumPy), "hnsw" (needs hnswlib) or "auto" (hnsw when installed)
+    VECTOR_INDEX_TRAIN_MIN: int = 2000  # Below this many jobs every query is an exact scan
+    VECTOR_INDEX_EXACT_MAX: int = 5000  # Filters that leave at most this many jobs are scanned exactly
+    VECTOR_INDEX_NLIST: int = 0  # IVF lists; 0 = about 4 * sqrt(jobs)
+    VECTOR_INDEX_NPROBE: int = 32  # Recall@10 ~0.98 at 100k jobs (benchmarks/bench_vector_index.py)
+    VECTOR_INDEX_HNSW_M: int = 16
+    VECTOR_INDEX_HNSW_EF_CONSTRUCTION: int = 200
+    VECTOR_INDEX_HNSW_EF: int = 400  # Recall@10 ~0.92 at 100k jobs; IVF builds ~6x faster for ~0.98
+    VECTOR_INDEX_SAVE_INTERVAL: float = 60
+
+    # Skill dictionary (built in; a JSON file of {canonical: [aliases]} extends it)
+    SKILL_DICTIONARY_PATH: str = ""
+
+    # ATS scoring weights; each component is in [0, 1]
+    ATS_WEIGHTS: dict[str, float] = {"keywords": 0.6, "structure": 0.25, "formatting": 0.15}
+    ATS_JOB_CACHE_MAX_ENTRIES: int = 4096  # Compiled job keyword profiles
+
+    # Market insights computed from collected jobs
+    MARKET_DEFAULT_WINDOW_DAYS: int = 30  # Trends compare this window with the one before it
+    MARKET_TOP_N: int = 10
+    MARKET_CACHE_MAX_ENTRIES: int = 256  # Cached (roles, window) aggregates
+    MARKET_PRECOMPUTE_ROLES: list[str] = []  # Roles aggregated at startup, e.g. ["data engineer"]
+    MARKET_PRECOMPUTE_WINDOWS: list[int] = [7, 30, 90]
+
+    # Near-duplicate detection across platforms (MinHash + LSH)
+    DEDUP_NUM_PERM: int = 128
+    DEDUP_BANDS: int = 32  # Rows per band = NUM_PERM / BANDS; more bands catch lower similarities
+    DEDUP_THRESHOLD: float = 0.7  # Estimated Jaccard over title/description shingles
+
+    # Admission control for /agent and /mcp endpoints
+    ADMISSION_MAX_CONCURRENT: int = 8
+    ADMISSION_MAX_PER_SESSION: int = 2
+    ADMISSION_MAX_QUEUE: int = 32
+    ADMISSION_QUEUE_TIMEOUT: float = 10.0
+
+    # MCP session memory
+    SESSION_BACKEND: str = "memory"  # "memory" (LRU) or "sqlite"
+    SESSION_DB_PATH: str = "data/sessions.db"
+    SESSION_TTL: float = 24 * 3600
+    SESSION_MAX_SESSIONS: int = 1000
+    SESSION_MAX_TURNS: int = 6  # Exchanges kept verbatim; older ones are compacted
+    SESSION_SUMMARY_CHARS: int = 2000
+    SESSION_RESUME_CHARS: int = 4000
+    SESSION_MAX_SEARCH_RESULTS: int = 20
+    SESSION_SWEEP_INTERVAL: float = 300
+
+    # Resume tailoring: "template" (extractive, no model), "local" (TEXT_GENERATION_MODEL) or "llm" (agent LLM)
+    GENERATION_BACKEND: str = "template"
+    GENERATION_MAX_INPUT_TOKENS: int = 512
+    GENERATION_MAX_NEW_TOKENS: int = 96
+    GENERATION_MAX_SENTENCES: int = 4  # Resume sentences kept in the tailored experience section
+    GENERATION_QUANTIZE: bool = True  # int8 dynamic quantization of the local model on CPU
+    GENERATION_CACHE_MAX_ENTRIES: int = 2048
+
+    # Saved-search job alerts (one shared scheduler; overlapping searches share a scrape)
+    ALERTS_ENABLED: bool = False
+    ALERT_DB_PATH: str = "data/alerts.db"
+    ALERT_INTERVAL: float = 3600  # Default seconds between runs of a saved search
+    ALERT_POLL_INTERVAL: float = 60  # Longest the scheduler sleeps between heap checks
+    # Cosine of the resume and job embeddings, the same scale as rank_jobs' match_score. With
+    # all-MiniLM-L6-v2 a whole resume against a posting for the same role lands around 0.45-0.7,
+    # an unrelated posting below 0.3
+    ALERT_MIN_SCORE: float = 0.45
+    ALERT_MAX_CONCURRENT_QUERIES: int = 4
+    ALERT_NOTIFY_BATCH: int = 100  # Recipients per notifier call
+    ALERT_SEEN_TTL: float = 30 * 24 * 3600  # Forget seen jobs after this long
+
+    # Intent router in front of the agent: single-tool requests skip the LLM
+    INTENT_ROUTER_MODE: str = "auto"  # "auto", "agent" (always the LLM agent) or "direct" (never the agent)
+    INTENT_MIN_CONFIDENCE: float = 0.8  # Classifier posterior needed to bypass the agent
+    INTENT_MAX_WORDS: int = 25  # Longer commands go to the agent
+    INTENT_CACHE_MAX_ENTRIES: int = 4096  # Cached routing decisions
+
+    # Bulk scoring (/batch): JSONL uploads scored in checkpointed chunks
+    BATCH_DB_PATH: str = "data/batches.db"
+    BATCH_WORKERS: int = 2  # Processes building resume profiles (multi-core only); 0 builds them in the server process
+    BATCH_CHUNK_SIZE: int = 256  # Rows scored, checkpointed and streamed together
+    BATCH_POOL_MIN_ROWS: int = 256  # Smaller resume chunks are profiled in a thread (benchmarks/bench_batch_profiles.py)
+    BATCH_MAX_ROWS: int = 50000
+    BATCH_SEMANTIC: bool = True  # Add embedding cosine scores unless the upload says otherwise
+    BATCH_MISSING_KEYWORDS: int = 10  # Missing keywords listed per result row
+    BATCH_RESULT_TTL: float = 7 * 24 * 3600  # Finished batches are pruned after this long
+
+settings = Settings()
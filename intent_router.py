@@ -0,0 +1,323 @@
+# intent_router.py (Deterministic shortcut in front of the agent for single-tool requests)
+
+import functools
+import math
+import re
+from collections import Counter
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException
+
+from agent_executor import agent_executor
+from apps.tracing import metrics
+from config import settings
+
+AUTO, AGENT, DIRECT = "auto", "agent", "direct"
+INTENT_TOOLS = {
+    "search": "search_for_jobs",
+    "skills": "extract_skills_from_text",
+    "market": "get_market_insights",
+}
+
+# Labelled utterances for the classifier; "agent" covers everything that needs planning
+EXAMPLES = {
+    "search": [
+        "find python jobs in pune",
+        "search for data engineer jobs in bangalore",
+        "show me react developer openings in london",
+        "any devops roles in berlin",
+        "looking for java developer positions in hyderabad",
+        "get me machine learning engineer jobs",
+        "list backend jobs in new york",
+        "i want frontend developer jobs in remote",
+        "jobs for golang developer in chennai",
+        "find me sre vacancies near mumbai",
+        "search product manager jobs",
+        "find data scientist roles in delhi",
+    ],
+    "skills": [
+        "extract skills from this resume",
+        "extract the skills from this text",
+        "list the technical skills in this job description",
+        "what skills are in my resume",
+        "pull the skills out of this cv",
+        "identify skills from the following text",
+        "which technologies does this job description mention",
+        "find the skills in this jd",
+        "get skills from my resume",
+        "extract technical skills",
+    ],
+    "market": [
+        "salary trends for data engineers",
+        "market insights for python developer",
+        "what is the salary of a devops engineer",
+        "show me market data for machine learning engineer",
+        "what skills are in demand for data scientists",
+        "job market outlook for frontend developers",
+        "how much do backend engineers earn",
+        "hiring trends for product managers",
+        "demand and pay for cloud architects",
+        "average salary for sre",
+    ],
+    "agent": [
+        "optimize my resume for this job",
+        "tailor my resume to the job description",
+        "compare my resume with this job and tell me what is missing",
+        "check my resume ats score",
+        "is my resume ats friendly for this role",
+        "match my resume to jobs and optimize it for the top ones",
+        "find jobs that fit my resume and rewrite my summary",
+        "write a cover letter for this job",
+        "what should i learn next to become a data engineer",
+        "help me prepare for an interview",
+        "find jobs like the ones above",
+        "search for jobs and then compare them with my resume",
+        "which of those jobs suits me best",
+        "thanks that was helpful",
+        "hello what can you do",
+    ],
+}
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Requests that need planning, references to earlier turns, or several steps
+_AGENT_RE = re.compile(
+    r"\b(optimi[sz]e|tailor|rewrite|improve|compare|match|ats|cover letter|interview|"
+    r"then|after that|as well|also|those|these|them|above|previous|earlier|like that|similar)\b",
+    re.IGNORECASE,
+)
+_SEARCH_VERBS_RE = re.compile(
+    r"^(?:(?:please|can you|could you|i want|i need|i'm|i am|show|find|search(?: for)?|look(?:ing)? for|get|"
+    r"list|any|some|me|all|open|new|latest)\s+)+",
+    re.IGNORECASE,
+)
+_SEARCH_NOUNS_RE = re.compile(r"\s*\b(?:jobs?|roles?|positions?|openings?|vacanc(?:y|ies)|opportunit(?:y|ies))\b\s*", re.IGNORECASE)
+_SEARCH_FOR_RE = re.compile(r"^\s*(?:for|as)\s+(?:an?\s+)?", re.IGNORECASE)
+_LOCATION_RE = re.compile(r"\s+(?:in|at|near|around|based in)\s+(?P<location>[A-Za-z][\w .,-]*?)\s*[?.!]*$", re.IGNORECASE)
+_DESCRIPTIVE_RE = re.compile(r"\b(with|using|that|which|where|who|like|paying|senior|junior|remote-first)\b", re.IGNORECASE)
+_SKILLS_PAYLOAD_RE = re.compile(r"[:\n]\s*(?P<text>.+)$", re.DOTALL)
+_MY_RESUME_RE = re.compile(r"\bmy (?:resume|cv)\b", re.IGNORECASE)
+_MARKET_ROLE_RE = re.compile(
+    r"\b(?:for|of|do|does)\s+(?:an?\s+|the\s+)?(?P<role>[A-Za-z][\w +#/.-]*?)"
+    r"(?:\s+(?:roles?|jobs?|positions?|earn|make|get paid))?\s*[?.!]*$",
+    re.IGNORECASE,
+)
+
+
+def _features(text: str) -> list[str]:
+    words = _WORD_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class IntentClassifier:
+    """Multinomial naive Bayes over words and word bigrams, trained on EXAMPLES at import."""
+
+    def __init__(self, examples: dict):
+        self.counts = {intent: Counter() for intent in examples}
+        for intent, utterances in examples.items():
+            for utterance in utterances:
+                self.counts[intent].update(_features(utterance))
+        self.vocab = set().union(*self.counts.values())
+        self.totals = {intent: sum(counts.values()) for intent, counts in self.counts.items()}
+        total_examples = sum(len(utterances) for utterances in examples.values())
+        self.priors = {intent: math.log(len(utterances) / total_examples) for intent, utterances in examples.items()}
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """Best intent and its posterior probability."""
+        features = [f for f in _features(text) if f in self.vocab]
+        scores = {
+            intent: self.priors[intent] + sum(
+                math.log((counts[f] + 1) / (self.totals[intent] + len(self.vocab))) for f in features
+            )
+            for intent, counts in self.counts.items()
+        }
+        best = max(scores, key=scores.get)
+        norm = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1 / norm
+
+
+class Route(NamedTuple):
+    intent: Optional[str]  # None: the agent handles it
+    confidence: float
+    args: tuple  # (name, value) pairs for the tool input
+    reason: str
+
+
+def _search_args(query: str) -> Optional[dict]:
+    if not (_SEARCH_VERBS_RE.match(query.strip()) or _SEARCH_NOUNS_RE.search(query)):
+        return None
+    location = ""
+    match = _LOCATION_RE.search(query)
+    if match:
+        location, query = match.group("location").strip(" ,."), query[:match.start()]
+    keywords = _SEARCH_FOR_RE.sub("", _SEARCH_NOUNS_RE.sub(" ", _SEARCH_VERBS_RE.sub("", query.strip()))).strip(" ,.?!")
+    if not keywords or len(keywords.split()) > 5 or _DESCRIPTIVE_RE.search(keywords):
+        return None  # Descriptive searches go to the agent, which can try semantic search first
+    return {"keywords": keywords, "location": location}
+
+
+def _skills_args(query: str) -> Optional[dict]:
+    match = _SKILLS_PAYLOAD_RE.search(query)
+    if match and len(match.group("text").split()) >= 3:
+        return {"text": match.group("text").strip()}
+    return None
+
+
+def _market_args(query: str) -> Optional[dict]:
+    match = _MARKET_ROLE_RE.search(query.strip())
+    if not match:
+        return None
+    role = match.group("role").strip()
+    if not role or len(role.split()) > 4:
+        return None
+    # "data engineers" -> "data engineer", so the role matches singular job titles
+    if role.lower().endswith(("ers", "ists", "ants", "ects", "ors", "ians")):
+        role = role[:-1]
+    return {"job_title": role}
+
+
+EXTRACTORS = {"search": _search_args, "skills": _skills_args, "market": _market_args}
+
+
+class IntentRouter:
+    """
+    Answers requests that map to exactly one tool without the LLM: deterministic
+    guards send multi-step or referential requests to the agent, a small naive
+    Bayes classifier names the intent, regex extractors pull the tool arguments,
+    and the tool is called directly. Anything ambiguous - low confidence, missing
+    arguments, a failing tool - falls through to `agent_executor`. Routing
+    decisions are cached per normalized query.
+
+    `mode` forces a path per request: "agent" always runs the agent, "direct"
+    never does (and fails if no tool fits); "auto" routes as above.
+    """
+
+    def __init__(
+        self,
+        executor=None,
+        classifier: IntentClassifier = None,
+        mode: str = settings.INTENT_ROUTER_MODE,
+        min_confidence: float = settings.INTENT_MIN_CONFIDENCE,
+        max_words: int = settings.INTENT_MAX_WORDS,
+        cache_size: int = settings.INTENT_CACHE_MAX_ENTRIES,
+    ):
+        self.executor = executor or agent_executor
+        self.classifier = classifier or IntentClassifier(EXAMPLES)
+        self.mode = mode
+        self.min_confidence = min_confidence
+        self.max_words = max_words
+        self.tools = {tool.name: tool for tool in self.executor.tools}
+        self.route = functools.lru_cache(maxsize=cache_size)(self._route)
+        self.stats = {"requests": 0, "direct": 0, "agent": 0, "forced": 0, "fallbacks": 0, "intents": Counter()}
+
+    def _route(self, query: str, forced: bool = False) -> Route:
+        command = query.split("\n", 1)[0] if "\n" in query else query.split(":", 1)[0]
+        intent, confidence = self.classifier.predict(command)
+        if not forced:
+            if len(command.split()) > self.max_words:
+                return Route(None, confidence, (), "too long")
+            if _AGENT_RE.search(command):
+                return Route(None, confidence, (), "needs planning")
+            if intent == "agent" or confidence < self.min_confidence:
+                return Route(None, confidence, (), "ambiguous")
+        elif intent == "agent":
+            # Forced: take the first single-tool intent whose arguments can be extracted
+            intent = next((name for name in EXTRACTORS if EXTRACTORS[name](query if name == "skills" else command)), intent)
+        if intent not in EXTRACTORS:
+            return Route(None, confidence, (), "no tool")
+        args = EXTRACTORS[intent](query if intent == "skills" else command)
+        if args is None:
+            return Route(None, confidence, (), "missing arguments")
+        return Route(intent, confidence, tuple(args.items()), "rule")
+
+    def resolve(self, query: str, mode: str = None, session: dict = None) -> Route:
+        mode = mode or self.mode
+        if mode == AGENT:
+            return Route(None, 1.0, (), "forced agent")
+        query = query.strip()
+        route = self.route(query, mode == DIRECT)
+        if route.intent is None and route.reason == "missing arguments" and session and session.get("resume_text") \
+                and _MY_RESUME_RE.search(query):
+            # "extract skills from my resume" in a session that already holds one
+            intent, confidence = self.classifier.predict(query)
+            if intent == "skills":
+                return Route("skills", confidence, (("text", session["resume_text"]),), "session resume")
+        return route
+
+    async def _call_tool(self, route: Route, config) -> str:
+        tool = self.tools[INTENT_TOOLS[route.intent]]
+        result = await tool.ainvoke({"input": dict(route.args)}, config=config)
+        return format_result(route.intent, dict(route.args), result)
+
+    async def ainvoke(self, query: str, agent_inputs: dict, config=None, mode: str = None, session: dict = None) -> dict:
+        """Agent-shaped result ({"output": ...}) plus "routed_to": the tool name, or None for the agent."""
+        mode = mode or self.mode
+        route = self.resolve(query, mode, session)
+        self.stats["requests"] += 1
+        self.stats["forced"] += mode != AUTO
+
+        if route.intent is not None:
+            try:
+                output = await self._call_tool(route, config)
+            except Exception as e:
+                if mode == DIRECT:
+                    raise
+                print(f"Direct {route.intent} call failed, falling back to the agent: {e}")
+                self.stats["fallbacks"] += 1
+            else:
+                self._count(route.intent)
+                return {"output": output, "routed_to": INTENT_TOOLS[route.intent]}
+        elif mode == DIRECT:
+            raise HTTPException(status_code=422, detail=f"Cannot answer without the agent ({route.reason})")
+
+        self._count(None)
+        result = await self.executor.ainvoke(agent_inputs, config=config)
+        return {**result, "routed_to": None}
+
+    def _count(self, intent: Optional[str]):
+        route = "direct" if intent else "agent"
+        self.stats[route] += 1
+        self.stats["intents"][intent or "agent"] += 1
+        metrics.inc("job_agent_router_total", help="Agent requests by route (direct tool call or full agent)",
+                    route=route, intent=intent or "agent")
+
+    def stats_snapshot(self) -> dict:
+        cache = self.route.cache_info()
+        handled = self.stats["direct"] + self.stats["agent"]
+        return {
+            "mode": self.mode,
+            **{key: value for key, value in self.stats.items() if key != "intents"},
+            "intents": dict(self.stats["intents"]),
+            "bypass_rate": round(self.stats["direct"] / handled, 3) if handled else 0.0,
+            "route_cache": {"hits": cache.hits, "misses": cache.misses, "size": cache.currsize},
+        }
+
+
+def format_result(intent: str, args: dict, result) -> str:
+    """Plain-text answer for a direct tool call, in the shape the agent would phrase it."""
+    if intent == "skills":
+        return f"Skills found: {', '.join(sorted(result))}" if result else "No skills found in the text."
+    if intent == "market":
+        lines = [f"Market insights for {args['job_title']} (last {result['window_days']} days, "
+                 f"{result['jobs_in_window']} postings):"]
+        salary = result["salary_insights"]
+        if salary["median_salary"] is not None:
+            low, high = salary["salary_range"]
+            lines.append(f"- Median salary: {salary['median_salary']:,} (typical range {low:,} - {high:,})")
+        if result["skill_demand"]:
+            lines.append("- Most requested skills: " + ", ".join(
+                f"{entry['skill']} ({entry['share']:.0%})" for entry in result["skill_demand"][:8]
+            ))
+        top_locations = result["location_insights"]["top_locations"]
+        if top_locations:
+            lines.append("- Top locations: " + ", ".join(entry["location"] for entry in top_locations[:5]))
+        lines.append(f"- Remote: {result['location_insights']['remote_percentage']}%")
+        companies = result["hiring_trends"]["top_hiring_companies"]
+        if companies:
+            lines.append("- Top hiring companies: " + ", ".join(entry["company"] for entry in companies[:5]))
+        return "\n".join(lines)
+    return str(result)
+
+
+# --- Shared router ---
+intent_router = IntentRouter()
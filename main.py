@@ -1,11 +1,29 @@
 # main.py
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from agent_executor import agent_executor
-from models import AgentRequest, AgentResponse
+from intent_router import intent_router
+from models import AgentRequest, AgentResponse, AlertRequest
 from dotenv import load_dotenv
 import os
 from mcp import router as mcp_router
+from apps.api.batch import router as batch_router
+from apps.api.match import router as match_router
+from admission import admission, AdmissionRejected
+from streaming import stream_agent_events, sse, ws_message
+from apps.scraper_cache import scraper_cache
+from apps.resilience import source_health
+from apps.services.alert_system import job_alerts
+from apps.services.batch_scoring import batch_scorer
+from apps.services.generation import resume_generator
+from apps.services.market_insight import market_aggregates
+from apps.services.model_registry import model_registry
+from apps.services.vector_index import job_index
+from apps.services.session_store import session_store, run_session_eviction
+from apps.tracing import TracingCallbackHandler, start_trace, metrics
+from config import settings
+import asyncio
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,6 +36,31 @@ app = FastAPI(
 )
 
 app.include_router(mcp_router)
+app.include_router(match_router)
+app.include_router(batch_router)
+
+@app.on_event("startup")
+async def warm_up_models():
+    # Loading happens off the event loop so the server can still answer health checks
+    if settings.WARMUP_MODELS:
+        await asyncio.to_thread(model_registry.warm_up, settings.WARMUP_MODELS)
+
+@app.on_event("startup")
+async def precompute_market_insights():
+    if settings.MARKET_PRECOMPUTE_ROLES:
+        roles = [[role] for role in settings.MARKET_PRECOMPUTE_ROLES]
+        app.state.market_precompute = asyncio.create_task(
+            asyncio.to_thread(market_aggregates.precompute, roles, settings.MARKET_PRECOMPUTE_WINDOWS)
+        )
+
+@app.on_event("startup")
+async def start_session_eviction():
+    app.state.session_eviction = asyncio.create_task(run_session_eviction(session_store))
+
+@app.on_event("startup")
+async def start_job_alerts():
+    if settings.ALERTS_ENABLED:
+        app.state.job_alerts = asyncio.create_task(job_alerts.run())
 
 # Check for API Key on startup
 # if not os.getenv("GEMINI_API_KEY"):
@@ -31,15 +74,80 @@ async def invoke_agent(request: AgentRequest):
     The agent will use its tools to fulfill the request.
     """
     try:
-        # The agent executor runs asynchronously and returns the final output
-        result = await agent_executor.ainvoke({
-            "input": request.query
-        })
+        # Bounded by the shared admission controller; rejects fast with 429/503 when saturated
+        with start_trace("/agent/invoke"):
+            async with admission.slot(request.session_id):
+                # Single-tool requests are answered directly; the rest go to the agent executor
+                result = await intent_router.ainvoke(
+                    request.query, {"input": request.query},
+                    config={"callbacks": [TracingCallbackHandler()]}, mode=request.route,
+                )
         return AgentResponse(output=result["output"])
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"An error occurred during agent execution: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    
+
+
+@app.post("/agent/stream", summary="Stream the LangChain Agent over Server-Sent Events")
+async def stream_agent(request: AgentRequest):
+    """
+    Streams tool_start, tool_end, jobs and token events while the agent runs.
+    The last event, `final`, carries the same body as /agent/invoke.
+    """
+    # Reject before the response starts so saturation still surfaces as 429/503; the
+    # slot itself is taken inside the stream, so a client gone before it starts holds none
+    admission.check(request.session_id)
+
+    async def events():
+        with start_trace("/agent/stream"):
+            try:
+                async with admission.slot(request.session_id):
+                    config = {"callbacks": [TracingCallbackHandler()]}
+                    async for event, data in stream_agent_events({"input": request.query}, config=config):
+                        if event == "agent_end":
+                            yield sse("final", AgentResponse(output=data["output"]).model_dump())
+                        else:
+                            yield sse(event, data)
+            except AdmissionRejected as e:
+                yield sse("error", {"status_code": e.status_code, "detail": e.detail, "retry_after": e.headers["Retry-After"]})
+            except Exception as e:
+                print(f"An error occurred during agent streaming: {e}")
+                yield sse("error", {"detail": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.websocket("/agent/ws")
+async def agent_websocket(websocket: WebSocket):
+    """
+    Accepts AgentRequest JSON messages and answers each with a sequence of
+    {"event": ..., "data": ...} messages ending in a `final` event.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            request = AgentRequest(**await websocket.receive_json())
+            try:
+                async with admission.slot(request.session_id):
+                    config = {"callbacks": [TracingCallbackHandler()]}
+                    async for event, data in stream_agent_events({"input": request.query}, config=config):
+                        if event == "agent_end":
+                            await websocket.send_text(ws_message("final", AgentResponse(output=data["output"]).model_dump()))
+                        else:
+                            await websocket.send_text(ws_message(event, data))
+            except AdmissionRejected as e:
+                await websocket.send_text(ws_message("error", {
+                    "status_code": e.status_code, "detail": e.detail, "retry_after": e.headers["Retry-After"]
+                }))
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                await websocket.send_text(ws_message("error", {"detail": str(e)}))
+    except WebSocketDisconnect:
+        pass
+
 
 @app.get("/agent/tools", summary="List all available LangChain tools and usage details")
 async def list_agent_tools():
@@ -61,4 +169,83 @@ async def list_agent_tools():
         }
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/stats/cache", summary="Hit/miss/eviction counters for the scraper query cache")
+async def cache_stats():
+    return scraper_cache.stats()
+
+
+@app.get("/stats/models", summary="Load state, load time and memory of each shared model")
+async def model_stats():
+    return model_registry.stats()
+
+
+@app.get("/stats/generation", summary="Backend, cache hit rate and fallbacks of resume tailoring")
+async def generation_stats():
+    return {"backend": resume_generator.backend.name, **resume_generator.stats}
+
+
+@app.get("/stats/index", summary="Size, backend and build state of the semantic job index")
+async def index_stats():
+    return await asyncio.to_thread(job_index.stats)
+
+
+@app.get("/stats/market", summary="Jobs counted and cache hit/update counters of the market aggregates")
+async def market_stats():
+    return market_aggregates.stats
+
+
+@app.get("/stats/batch", summary="Batches run, rows scored and replayed, and job-profile cache hits of bulk scoring")
+async def batch_stats():
+    return batch_scorer.stats
+
+
+@app.get("/stats/router", summary="Share of agent requests answered by a direct tool call instead of the LLM")
+async def router_stats():
+    return intent_router.stats_snapshot()
+
+
+@app.get("/stats/admission", summary="Concurrency, queue depth and wait-time metrics for agent requests")
+async def admission_stats():
+    return admission.stats()
+
+
+@app.get("/stats/sources", summary="Circuit-breaker state, error rate and latency of each job source")
+async def source_stats():
+    return source_health.stats()
+
+
+@app.get("/stats/alerts", summary="Saved searches, scheduled queries and alert-cycle counters")
+async def alert_stats():
+    return await asyncio.to_thread(job_alerts.stats_snapshot)
+
+
+@app.post("/alerts", summary="Save a search and get alerted about new matching jobs")
+async def create_alert(request: AlertRequest):
+    if not settings.ALERTS_ENABLED:
+        # Nothing would ever run the search
+        raise HTTPException(status_code=503, detail="Job alerts are disabled on this server (ALERTS_ENABLED)")
+    search_id = await job_alerts.subscribe(
+        request.user_id,
+        request.email,
+        request.keywords,
+        request.location,
+        request.resume_text,
+        request.min_score if request.min_score is not None else settings.ALERT_MIN_SCORE,
+        request.interval if request.interval is not None else settings.ALERT_INTERVAL,
+    )
+    return {"search_id": search_id}
+
+
+@app.delete("/alerts/{search_id}", summary="Delete a saved search")
+async def delete_alert(search_id: int):
+    if not await job_alerts.unsubscribe(search_id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return {"deleted": search_id}
+
+
+@app.get("/metrics", summary="Prometheus metrics for tools, LLM calls, scrapers and model passes")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,10 +1,21 @@
 # mcp.py
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-from agent_executor import agent_executor
+from typing import List, Literal, Optional, Dict, Any
+from intent_router import intent_router
 from langchain_core.runnables import RunnableConfig
+from admission import admission, AdmissionRejected
+from streaming import stream_agent_events, sse
+from apps.services.embedding_cache import text_key
+from apps.services.session_store import session_store, new_session, compact_history, active_session
+from apps.services.skill_extraction import skill_batcher
+from apps.tools.tools import match_engine
+from apps.tracing import TracingCallbackHandler, start_trace
+from config import settings
+import asyncio
+import json
 import uuid
 
 router = APIRouter()
@@ -19,43 +30,157 @@ class MCPContext(BaseModel):
 class MCPRequest(BaseModel):
     input: str
     context: Optional[MCPContext] = None
+    route: Optional[Literal["auto", "agent", "direct"]] = None  # Overrides INTENT_ROUTER_MODE
 
 class MCPResponse(BaseModel):
     output: str
     tools_used: List[str]
     session_id: str
     context_updated: Dict[str, Any]
+    timings: Dict[str, Any] = {}
 
-# --- Endpoint ---
+# --- Helpers ---
+def _session_id(payload: MCPRequest) -> str:
+    return payload.context.session_id if payload.context and payload.context.session_id else str(uuid.uuid4())
+
+def _build_config(payload: MCPRequest, session_id: str) -> RunnableConfig:
+    return RunnableConfig(
+        configurable={
+            "session_id": session_id,
+            "preferred_tools": payload.context.preferred_tools if payload.context else [],
+            "persona": payload.context.persona if payload.context else "",
+        },
+        callbacks=[TracingCallbackHandler()],
+    )
+
+def _context_updated(payload: MCPRequest, session: dict) -> Dict[str, Any]:
+    return {
+        "persona": payload.context.persona if payload.context else None,
+        "preferred_tools": payload.context.preferred_tools if payload.context else [],
+        "history_turns": len(session["history"]) // 2,
+        "has_resume": bool(session["resume_text"]),
+        "stored_search_results": len(session["search_results"]),
+    }
+
+async def _remember_resume(session: dict, resume_text: str):
+    # Skills and embedding are computed once per distinct resume, then reused every turn
+    resume_hash = text_key(resume_text, "resume")
+    if session["resume_hash"] == resume_hash:
+        return
+    session.update(resume_text=resume_text, resume_hash=resume_hash, resume_skills=[], resume_embedding=None)
+    try:
+        session["resume_skills"] = sorted(await skill_batcher.extract(resume_text))
+        session["resume_embedding"] = (await asyncio.to_thread(match_engine.embed, [resume_text]))[0].tolist()
+    except Exception as e:
+        print(f"Could not analyze session resume: {e}")
+
+async def _load_session(payload: MCPRequest, session_id: str) -> dict:
+    session = session_store.get(session_id) or new_session()
+    memory = dict(payload.context.memory or {}) if payload.context else {}
+    resume_text = memory.pop("resume_text", None) or memory.pop("resume", None)
+    session["memory"].update(memory)
+    if resume_text:
+        await _remember_resume(session, resume_text)
+    return session
+
+def _agent_inputs(payload: MCPRequest, session: dict) -> Dict[str, Any]:
+    context = []
+    if session["summary"]:
+        context.append("Earlier in this conversation:\n" + session["summary"])
+    if session["resume_text"]:
+        context.append("The user's resume (resume_text):\n" + session["resume_text"][:settings.SESSION_RESUME_CHARS])
+    if session["resume_skills"]:
+        context.append("Skills already extracted from the resume: " + ", ".join(session["resume_skills"]))
+    if session["search_results"]:
+        context.append("Jobs found earlier:\n" + "\n".join(
+            f"{i}. {job['title']} at {job['company']} ({job['location']}) {job['url']}"
+            for i, job in enumerate(session["search_results"], 1)
+        ))
+    if session["memory"]:
+        context.append("Session memory: " + json.dumps(session["memory"], default=str))
+
+    text = payload.input
+    if context:
+        text += "\n\n[Session context]\n" + "\n\n".join(context)
+    return {
+        "input": text,
+        "chat_history": [(message["role"], message["content"]) for message in session["history"]],
+    }
+
+def _save_session(session_id: str, session: dict, user_input: str, output: str):
+    session["history"] += [{"role": "human", "content": user_input}, {"role": "ai", "content": output}]
+    compact_history(session)
+    session_store.put(session_id, session)
+
+# --- Endpoints ---
 @router.post("/mcp/invoke", response_model=MCPResponse)
 async def invoke_mcp_agent(payload: MCPRequest):
     try:
-        session_id = payload.context.session_id if payload.context and payload.context.session_id else str(uuid.uuid4())
-
-        config = RunnableConfig(
-            configurable={
-                "session_id": session_id,
-                "preferred_tools": payload.context.preferred_tools if payload.context else [],
-                "persona": payload.context.persona if payload.context else "",
-            }
-        )
-
-        result = await agent_executor.ainvoke({
-            "input": payload.input
-        }, config=config)
+        session_id = _session_id(payload)
+        config = _build_config(payload, session_id)
 
-        # Optional: Extract tools used (you can track it via callbacks or metadata)
-        tools_used = [tool.name for tool in agent_executor.tools]
+        with start_trace("/mcp/invoke") as trace:
+            async with admission.slot(session_id):
+                session = await _load_session(payload, session_id)
+                token = active_session.set(session)
+                try:
+                    result = await intent_router.ainvoke(
+                        payload.input, _agent_inputs(payload, session), config=config, mode=payload.route, session=session,
+                    )
+                finally:
+                    active_session.reset(token)
+                _save_session(session_id, session, payload.input, result["output"])
 
         return MCPResponse(
             output=result["output"],
-            tools_used=tools_used,
+            tools_used=trace.tools_used,
             session_id=session_id,
-            context_updated={
-                "persona": payload.context.persona if payload.context else None,
-                "preferred_tools": payload.context.preferred_tools if payload.context else []
-            }
+            context_updated=_context_updated(payload, session),
+            timings=trace.summary()
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"MCP Agent Error: {str(e)}")
+
+@router.post("/mcp/stream", summary="Stream MCP agent events over Server-Sent Events")
+async def stream_mcp_agent(payload: MCPRequest):
+    """
+    Same input as /mcp/invoke, answered as an SSE stream of tool_start, tool_end,
+    jobs and token events. The last event, `final`, carries an MCPResponse.
+    """
+    session_id = _session_id(payload)
+    config = _build_config(payload, session_id)
+    # Reject before the response starts so saturation still surfaces as 429/503; the
+    # slot itself is taken inside the stream, so a client gone before it starts holds none
+    admission.check(session_id)
+
+    async def events():
+        token = None
+        with start_trace("/mcp/stream") as trace:
+            try:
+                async with admission.slot(session_id):
+                    session = await _load_session(payload, session_id)
+                    token = active_session.set(session)
+                    async for event, data in stream_agent_events(_agent_inputs(payload, session), config=config):
+                        if event == "agent_end":
+                            _save_session(session_id, session, payload.input, data["output"])
+                            yield sse("final", MCPResponse(
+                                output=data["output"],
+                                tools_used=trace.tools_used,
+                                session_id=session_id,
+                                context_updated=_context_updated(payload, session),
+                                timings=trace.summary()
+                            ).model_dump())
+                        else:
+                            yield sse(event, data)
+            except AdmissionRejected as e:
+                yield sse("error", {"status_code": e.status_code, "detail": e.detail, "retry_after": e.headers["Retry-After"]})
+            except Exception as e:
+                yield sse("error", {"detail": f"MCP Agent Error: {str(e)}"})
+            finally:
+                if token is not None:
+                    active_session.reset(token)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
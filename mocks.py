@@ -1,24 +1,51 @@
 # mocks.py
 
 import asyncio
+import random
+import time
+
+class MockJobBoardError(RuntimeError):
+    pass
 
 class MockJobBoardAPI:
     """A mock API to simulate fetching jobs from platforms like Indeed, LinkedIn, etc."""
-    async def search(self, keywords, location):
-        print(f"Mock Searching for '{keywords}' in '{location}'...")
-        await asyncio.sleep(0.5) # Simulate network latency
+    def __init__(self, name: str = "mock", latency: float = 0.5, failure_rate: float = 0.0, seed: int = None):
+        self.name = name
+        self.latency = latency  # Seconds per search
+        self.failure_rate = failure_rate  # Fraction of searches that raise MockJobBoardError
+        self._random = random.Random(seed)
+
+    def _should_fail(self) -> bool:
+        return self.failure_rate > 0 and self._random.random() < self.failure_rate
+
+    def listings(self, keywords, location):
         return [
             {
-                "id": f"mock_{i}",
+                "id": f"{self.name}_{i}",
                 "title": f"Senior {keywords}",
                 "company": f"Tech Company {i}",
                 "location": location,
                 "description": f"Seeking a {keywords} with experience in Python, SQL, and Cloud. Responsibilities include building scalable systems. Knowledge of Docker is a plus.",
-                "url": f"https://example.com/job/{i}"
+                "url": f"https://example.com/{self.name}/job/{i}"
             } for i in range(1, 6)
         ]
 
+    async def search(self, keywords, location):
+        print(f"Mock Searching for '{keywords}' in '{location}'...")
+        await asyncio.sleep(self.latency) # Simulate network latency
+        if self._should_fail():
+            raise MockJobBoardError(f"{self.name} failed")
+        return self.listings(keywords, location)
+
+class MockJobBoardScraper(MockJobBoardAPI):
+    """Blocking variant with the scraper interface, for JobSearchEngine's thread pool."""
+    def search(self, keywords, location):
+        time.sleep(self.latency)
+        if self._should_fail():
+            raise MockJobBoardError(f"{self.name} failed")
+        return self.listings(keywords, location)
+
 # Instantiate mock APIs
 indeed_api = MockJobBoardAPI()
 linkedin_scraper = MockJobBoardAPI()
-glassdoor_api = MockJobBoardAPI()
\ No newline at end of file
+glassdoor_api = MockJobBoardAPI()
@@ -1,9 +1,24 @@
 # models.py
 
 from pydantic import BaseModel
+from typing import Literal, Optional
+
 
 class AgentRequest(BaseModel):
     query: str
+    session_id: Optional[str] = None
+    route: Optional[Literal["auto", "agent", "direct"]] = None  # Overrides INTENT_ROUTER_MODE
+
 
 class AgentResponse(BaseModel):
-    output: str
\ No newline at end of file
+    output: str
+
+
+class AlertRequest(BaseModel):
+    user_id: str
+    email: str
+    keywords: str
+    location: str = ""
+    resume_text: str
+    min_score: Optional[float] = None  # Resume/job embedding cosine, as match_score; ALERT_MIN_SCORE when unset
+    interval: Optional[float] = None
@@ -0,0 +1,54 @@
+# streaming.py (Agent event streaming for SSE / WebSocket endpoints)
+
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from agent_executor import agent_executor
+
+# Tool outputs can be long (job listings); events carry a preview, the final event the full answer
+TOOL_OUTPUT_PREVIEW_CHARS = 2000
+
+
+def _token_text(chunk) -> str:
+    content = getattr(chunk, "content", "")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content or ""
+
+
+async def stream_agent_events(inputs: Dict[str, Any], config: Optional[dict] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Runs the agent and yields (event, data) pairs as they happen:
+    tool_start, tool_end, jobs (partial listings per source), token, and finally
+    agent_end with the complete output.
+    """
+    output = None
+    async for event in agent_executor.astream_events(inputs, config=config, version="v2"):
+        kind = event["event"]
+        if kind == "on_tool_start":
+            yield "tool_start", {"tool": event["name"], "run_id": event["run_id"], "input": event["data"].get("input")}
+        elif kind == "on_tool_end":
+            result = event["data"].get("output")
+            result = getattr(result, "content", result)
+            yield "tool_end", {
+                "tool": event["name"],
+                "run_id": event["run_id"],
+                "output": str(result)[:TOOL_OUTPUT_PREVIEW_CHARS],
+            }
+        elif kind == "on_custom_event" and event["name"] == "job_batch":
+            yield "jobs", event["data"]
+        elif kind == "on_chat_model_stream":
+            text = _token_text(event["data"].get("chunk"))
+            if text:
+                yield "token", {"text": text}
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            output = (event["data"].get("output") or {}).get("output")
+    yield "agent_end", {"output": output or ""}
+
+
+def sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def ws_message(event: str, data: Any) -> str:
+    return json.dumps({"event": event, "data": data}, default=str)
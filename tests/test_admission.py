@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+
+
+def make_controller(**overrides):
+    options = {"max_concurrent": 1, "max_per_session": 2, "max_queue": 2, "queue_timeout": 1.0, **overrides}
+    return AdmissionController(**options)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_release_hands_the_slot_to_the_oldest_waiter():
+    async def main():
+        admission = make_controller()
+        await admission.acquire("a")
+        first = asyncio.create_task(admission.acquire("b"))
+        second = asyncio.create_task(admission.acquire("c"))
+        await settle()
+        assert admission.stats()["queue_depth"] == 2
+
+        admission.release("a", held_for=2.0)
+        await settle()
+        assert first.done() and not second.done()
+        assert admission.stats()["active"] == 1  # Handed over, never freed
+
+        admission.release("b")
+        await second
+        admission.release("c")
+        return admission.stats()
+
+    stats = asyncio.run(main())
+    assert stats["active"] == 0 and stats["queue_depth"] == 0 and stats["active_sessions"] == 0
+    assert stats["admitted"] == 3 and stats["queued"] == 2
+    assert stats["avg_service_seconds"] == 1.2  # The release's held_for fed the estimate
+
+
+def test_queue_timeout_rejects_and_forgets_the_waiter():
+    async def main():
+        admission = make_controller(queue_timeout=0.05)
+        await admission.acquire("a")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire("b")
+        admission.release("a")
+        return admission, rejected.value
+
+    admission, rejected = asyncio.run(main())
+    assert rejected.status_code == 503 and int(rejected.headers["Retry-After"]) >= 1
+    stats = admission.stats()
+    assert stats["rejected_timeout"] == 1
+    assert stats["active"] == 0 and stats["queue_depth"] == 0 and stats["active_sessions"] == 0
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def main():
+        admission = make_controller()
+        await admission.acquire("a")
+        waiting = asyncio.create_task(admission.acquire("b"))
+        await settle()
+        waiting.cancel()
+        await settle()
+        assert admission.stats()["queue_depth"] == 0
+        admission.release("a")
+        return admission.stats()
+
+    stats = asyncio.run(main())
+    assert stats["active"] == 0 and stats["active_sessions"] == 0
+
+
+def test_slot_granted_to_a_cancelled_waiter_is_passed_on():
+    async def main():
+        admission = make_controller()
+        await admission.acquire("a")
+        first = asyncio.create_task(admission.acquire("b"))
+        second = asyncio.create_task(admission.acquire("c"))
+        await settle()
+        admission.release("a")  # Grants the slot to the first waiter...
+        first.cancel()  # ...which goes away before it runs
+        await settle()
+        if first.cancelled():
+            assert second.done()
+            admission.release("c")
+        else:
+            admission.release("b")
+            await second
+            admission.release("c")
+        return admission.stats()
+
+    stats = asyncio.run(main())
+    assert stats["active"] == 0 and stats["queue_depth"] == 0 and stats["active_sessions"] == 0
+
+
+def test_check_rejects_without_taking_a_slot():
+    async def main():
+        admission = make_controller(max_per_session=1, max_queue=0)
+        admission.check("a")
+        assert admission.stats()["active"] == 0
+        async with admission.slot("a"):
+            with pytest.raises(AdmissionRejected) as session_full:
+                admission.check("a")
+            with pytest.raises(AdmissionRejected) as queue_full:
+                admission.check("b")
+        admission.check("b")
+        return admission.stats(), session_full.value, queue_full.value
+
+    stats, session_full, queue_full = asyncio.run(main())
+    assert session_full.status_code == 429 and queue_full.status_code == 503
+    assert stats["active"] == 0 and stats["admitted"] == 1
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from apps.services.alert_system import AlertStore, JobAlertSystem
+
+RESUME = "Python developer with Django and PostgreSQL."
+JOB = {"id": "x_1", "title": "Python Developer", "company": "Acme", "location": "Pune",
+       "description": "Build Django services on PostgreSQL."}
+
+
+class LoopCheckingStore(AlertStore):
+    """Records any store call that runs on the event loop's thread."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.loop_thread = None
+        self.on_loop = []
+        for name in ("add", "remove", "schedule", "subscribers", "set_next_due", "diff_new", "prune_seen"):
+            setattr(self, name, self._checked(name, getattr(self, name)))
+
+    def _checked(self, name, method):
+        def call(*args, **kwargs):
+            if threading.current_thread() is self.loop_thread:
+                self.on_loop.append(name)
+            return method(*args, **kwargs)
+        return call
+
+
+class FakeEngine:
+    async def search_all_platforms(self, keywords, location):
+        return [JOB]
+
+
+class FakeMatcher:
+    def embed(self, texts):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+class Outbox:
+    def __init__(self):
+        self.sent = {}
+
+    async def send_batch(self, digests):
+        self.sent.update(digests)
+
+
+def test_alert_cycle_keeps_store_calls_off_the_loop(tmp_path):
+    store = LoopCheckingStore(str(tmp_path / "alerts.db"))
+    outbox = Outbox()
+    alerts = JobAlertSystem(store=store, search_engine=FakeEngine(), matcher=FakeMatcher(), notifier=outbox)
+
+    async def main():
+        store.loop_thread = threading.current_thread()
+        search_id = await alerts.subscribe("u1", "u1@example.com", "python", "pune", RESUME, min_score=0.5, interval=60)
+        digests = await alerts.run_due()
+        assert await alerts.unsubscribe(search_id)
+        return digests
+
+    digests = asyncio.run(main())
+    assert [alert["job"]["id"] for alert in digests["u1@example.com"]] == ["x_1"]
+    assert outbox.sent == digests
+    assert store.on_loop == []
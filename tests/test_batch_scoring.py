@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import apps.api.batch as batch_api
+from apps.services.ats_checker import ATSChecker
+from apps.services.batch_scoring import RESUME_VS_JOBS, BatchScorer, BatchStore
+from apps.services.job_store import JobStore
+
+RESUME = "Python developer with Django, SQL and Docker experience."
+
+
+def make_job(n, skill="Python"):
+    return {"id": f"x_{n}", "title": f"{skill} Engineer {n}", "company": "Acme", "location": "Pune",
+            "description": f"We need {skill} and SQL."}
+
+
+def make_scorer(tmp_path):
+    return BatchScorer(checker=ATSChecker(), store=BatchStore(str(tmp_path / "batches.db")), workers=0, chunk_size=2)
+
+
+def post_saved_jobs(client, **params):
+    body = json.dumps({"resume_text": RESUME, "saved_jobs": True}) + "\n"
+    lines = [json.loads(line) for line in client.post("/batch/score", content=body, params=params).text.splitlines()]
+    return lines[0]["batch_id"], lines[1:-1]
+
+
+def test_saved_jobs_batch_follows_the_store(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    scorer = make_scorer(tmp_path)
+    monkeypatch.setattr(batch_api, "job_store", store)
+    monkeypatch.setattr(batch_api, "batch_scorer", scorer)
+    app = FastAPI()
+    app.include_router(batch_api.router)
+    client = TestClient(app)
+
+    store.ingest("x", [make_job(2), make_job(5)], now=100.0)
+    first_id, results = post_saved_jobs(client, semantic=False)
+    assert sorted(result["id"] for result in results) == ["x_2", "x_5"]
+
+    # A newer job whose key sorts before both stored ones
+    store.ingest("x", [make_job(3, skill="Java")], now=200.0)
+    second_id, results = post_saved_jobs(client, semantic=False)
+    assert second_id != first_id
+    assert scorer.stats["rows_scored"] == 5
+    jobs = [job for job, _ in store.all_jobs()]
+    assert [(result["row"], result["id"]) for result in results] == [(row, job["id"]) for row, job in enumerate(jobs)]
+
+
+def test_explicit_batch_id_resumes_after_the_store_grows(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    scorer = make_scorer(tmp_path)
+    monkeypatch.setattr(batch_api, "job_store", store)
+    monkeypatch.setattr(batch_api, "batch_scorer", scorer)
+    app = FastAPI()
+    app.include_router(batch_api.router)
+    client = TestClient(app)
+
+    store.ingest("x", [make_job(2), make_job(5)], now=100.0)
+    post_saved_jobs(client, batch_id="nightly", semantic=False)
+    store.ingest("x", [make_job(3, skill="Java")], now=200.0)
+    _, results = post_saved_jobs(client, batch_id="nightly", semantic=False)
+
+    assert scorer.stats["rows_scored"] == 3  # Only the new job was scored on the second run
+    by_row = {result["row"]: result["id"] for result in results}
+    assert by_row == {0: "x_2", 1: "x_5", 2: "x_3"}
+    assert scorer.store.run("nightly")["total"] == 3
+
+
+def test_concurrent_runs_of_one_batch_score_each_row_once(tmp_path):
+    scorer = make_scorer(tmp_path)
+    jobs = [make_job(n) for n in range(6)]
+
+    async def consume():
+        return [result async for result in scorer.run("same", RESUME_VS_JOBS, RESUME, jobs, semantic=False)]
+
+    async def main():
+        return await asyncio.gather(consume(), consume())
+
+    first, second = asyncio.run(main())
+    assert sorted(result["row"] for result in first) == sorted(result["row"] for result in second) == list(range(6))
+    assert scorer.stats["rows_scored"] == 6
+    assert scorer.stats["rows_replayed"] == 6
+    assert scorer._running == {}
+
+
+class BrokenMatcher:
+    def embed(self, texts):
+        raise OSError("all-MiniLM-L6-v2 is not available offline")
+
+
+def test_semantic_batch_falls_back_to_ats_when_the_model_fails(tmp_path):
+    scorer = BatchScorer(checker=ATSChecker(), matcher=BrokenMatcher(), store=BatchStore(str(tmp_path / "batches.db")),
+                         workers=0, chunk_size=2)
+
+    async def consume():
+        return [result async for result in scorer.run("offline", RESUME_VS_JOBS, RESUME, [make_job(1), make_job(2)],
+                                                      semantic=True)]
+
+    results = asyncio.run(consume())
+    assert [result["row"] for result in results] == [0, 1]
+    assert all(result["semantic_fallback"] and "match_score" not in result and "ats_score" in result
+               for result in results)
+    assert scorer.stats["semantic_fallbacks"] == 1
+
+
+def test_small_chunks_are_profiled_without_the_pool(tmp_path):
+    scorer = BatchScorer(checker=ATSChecker(), store=BatchStore(str(tmp_path / "batches.db")), workers=2,
+                         chunk_size=4, pool_min_rows=256)
+
+    async def consume():
+        return [result async for result in scorer.run("small", RESUME_VS_JOBS, RESUME, [make_job(n) for n in range(8)],
+                                                      semantic=False)]
+
+    assert len(asyncio.run(consume())) == 8
+    assert scorer._pool is None
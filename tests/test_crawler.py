@@ -0,0 +1,98 @@
+import time
+
+import httpx
+import pytest
+
+from apps.crawler import CrawlScheduler, job_key
+from apps.http_client import DeadlineExceeded, HostRateLimiter, HttpFetcher
+
+
+class FakeSite:
+    """One page of cards; every card lacks a source id (empty data-jk)."""
+
+    def __init__(self, jobs_per_page: dict):
+        self.jobs_per_page = jobs_per_page
+
+    def page_url(self, keywords, location, page):
+        return f"https://boards.example/jobs?q={keywords}&page={page}"
+
+    def fetch_jobs(self, url):
+        return [dict(job) for job in self.jobs_per_page.get(int(url.rsplit("=", 1)[1]), [])]
+
+    def fetch_detail(self, url):
+        return f"Full description from {url}"
+
+
+def test_job_key_ignores_bare_source_prefix():
+    assert job_key({"id": "indeed_abc"}) == "indeed_abc"
+    assert job_key({"id": "indeed_", "url": "https://x/1"}) == "https://x/1"
+    a = job_key({"id": "indeed_", "title": "Python Dev", "company": "A", "location": "Pune"})
+    b = job_key({"id": "indeed_", "title": "Python Dev", "company": "B", "location": "Pune"})
+    assert a != b
+
+
+def test_cards_without_ids_are_all_returned():
+    cards = [{"id": "indeed_", "title": f"Engineer {i}", "company": "Acme", "location": "Pune"} for i in range(5)]
+    scheduler = CrawlScheduler(max_pages=1, fetch_details=False, deadline=5)
+    jobs = [job for batch in scheduler.crawl(FakeSite({0: cards}), "python", "pune") for job in batch]
+    assert sorted(job["title"] for job in jobs) == [f"Engineer {i}" for i in range(5)]
+
+
+def test_rate_limiter_refuses_slots_past_the_deadline():
+    limiter = HostRateLimiter(min_interval=10)
+    limiter.wait("boards.example")
+    with pytest.raises(DeadlineExceeded):
+        limiter.wait("boards.example", deadline=time.monotonic() + 1)
+    # The refused slot was not taken: the next one is still 10s after the first
+    assert limiter._next_slot["boards.example"] - time.monotonic() < 10.5
+
+
+def test_next_results_page_goes_ahead_of_this_pages_details():
+    order = []
+
+    class RecordingSite(FakeSite):
+        def fetch_jobs(self, url):
+            order.append(("results", url[-1]))
+            return super().fetch_jobs(url)
+
+        def fetch_detail(self, url):
+            order.append(("detail", url))
+            return super().fetch_detail(url)
+
+    pages = {
+        page: [{"id": f"x_{page}{i}", "title": "T", "url": f"https://boards.example/{page}{i}"} for i in range(3)]
+        for page in range(2)
+    }
+    scheduler = CrawlScheduler(max_pages=2, max_workers=1, domain_concurrency=1, deadline=5)
+    list(scheduler.crawl(RecordingSite(pages), "python", "pune"))
+    assert order[:2] == [("results", "0"), ("results", "1")]
+    details = [url for kind, url in order if kind == "detail"]
+    assert details == sorted(details)  # Page 0's details still come before page 1's
+
+
+def test_crawl_ends_at_its_deadline_under_host_spacing():
+    cards = "".join(f'<a class="job" href="https://boards.example/job/{i}">Job {i}</a>' for i in range(10))
+
+    def handler(request):
+        body = f"<html><body>{cards}</body></html>" if "page" in str(request.url) else "<html><p>Full</p></html>"
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=body)
+
+    fetcher = HttpFetcher(rate_limiter=HostRateLimiter(min_interval=0.2), transport=httpx.MockTransport(handler), http2=False)
+
+    class HttpSite(FakeSite):
+        def fetch_jobs(self, url):
+            fetcher.get_html(url)
+            return [{"id": f"x_{i}", "title": f"Job {i}", "url": f"https://boards.example/job/{i}"} for i in range(10)]
+
+        def fetch_detail(self, url):
+            fetcher.get_html(url)
+            return "Full"
+
+    scheduler = CrawlScheduler(max_pages=1, max_workers=4, domain_concurrency=2, deadline=0.7)
+    started = time.monotonic()
+    jobs = [job for batch in scheduler.crawl(HttpSite({}), "python", "pune") for job in batch]
+    assert time.monotonic() - started < 1.2
+    assert len(jobs) == 10  # Jobs whose detail page missed the deadline keep their snippet
+    assert 0 < sum(job.get("description") == "Full" for job in jobs) < 10
+    # No request slot was handed out past the deadline, so no worker is left sleeping in the host queue
+    assert fetcher.rate_limiter._next_slot["boards.example"] <= started + 0.7 + 0.2 + 0.05
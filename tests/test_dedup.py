@@ -0,0 +1,52 @@
+from apps.services.dedup import DedupIndex, deduplicate_jobs, normalize_company, normalize_location
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to build Python services on FastAPI and PostgreSQL, "
+    "run them on Kubernetes in AWS, and own their monitoring, alerting and on-call rotation."
+)
+
+
+def posting(**fields):
+    job = {"id": "indeed_1", "title": "Senior Python Developer", "company": "Acme Pvt Ltd",
+           "location": "Pune, Maharashtra", "description": DESCRIPTION, "url": "https://indeed.example/1"}
+    return {**job, **fields}
+
+
+def test_normalization():
+    assert normalize_company("Acme Pvt. Ltd.") == normalize_company("ACME") == "acme"
+    assert normalize_location("Remote - US") == normalize_location("Remote (USA)") == "remote"
+    assert normalize_location("Pune, Maharashtra") == "pune"
+
+
+def test_cross_platform_repost_is_merged_into_the_first_record():
+    index = DedupIndex()
+    first, is_new = index.add(posting(salary=""), "indeed")
+    repost = posting(
+        id="naukri_9", company="ACME", location="Pune", url="https://naukri.example/9", salary="20 LPA",
+        description=DESCRIPTION + " Hybrid, three days a week in the office.",
+    )
+    merged, repost_is_new = index.add(repost, "naukri")
+
+    assert is_new and not repost_is_new and merged is first
+    assert [entry["source"] for entry in merged["sources"]] == ["indeed", "naukri"]
+    assert merged["id"] == "indeed_1"  # The first listing keeps its identity
+    assert merged["salary"] == "20 LPA"  # Empty fields are filled in
+    assert merged["description"] == repost["description"]  # The longer description wins
+    assert index.stats["merged"] == 1
+
+
+def test_same_text_at_another_company_or_city_is_kept():
+    jobs = [posting(), posting(company="Globex"), posting(location="Bengaluru, Karnataka")]
+    assert len(deduplicate_jobs(jobs)) == 3
+
+
+def test_different_roles_are_kept():
+    other = posting(title="Data Analyst", description="Own dashboards in Tableau and write SQL for the finance team.")
+    assert len(deduplicate_jobs([posting(), other])) == 2
+
+
+def test_add_many_returns_only_new_records():
+    index = DedupIndex()
+    assert len(index.add_many([posting()], "indeed")) == 1
+    assert index.add_many([posting(id="naukri_9")], "naukri") == []
+    assert len(index.records[0]["sources"]) == 2
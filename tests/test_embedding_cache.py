@@ -0,0 +1,47 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from apps.services.embedding_cache import EmbeddingCache
+
+
+def fake_compute(texts):
+    time.sleep(0.1)  # Long enough for concurrent misses to overlap
+    return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_concurrent_misses_store_each_text_once(tmp_path):
+    cache = EmbeddingCache("fake-model", directory=str(tmp_path))
+    results = []
+
+    def embed():
+        results.append(cache.get_or_compute(["python developer", "data engineer"], fake_compute))
+
+    threads = [threading.Thread(target=embed) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()["vectors"] == 2
+    for vectors in results:
+        assert vectors.tolist() == [[16.0, 1.0], [13.0, 1.0]]
+
+
+def test_missing_matrix_file_resets_the_index(tmp_path):
+    cache = EmbeddingCache("fake-model", directory=str(tmp_path))
+    cache.get_or_compute(["python developer"], fake_compute)
+    os.remove(cache.path)
+
+    reopened = EmbeddingCache("fake-model", directory=str(tmp_path))
+    calls = []
+
+    def compute(texts):
+        calls.append(texts)
+        return fake_compute(texts)
+
+    assert reopened.get_or_compute(["python developer"], compute).tolist() == [[16.0, 1.0]]
+    assert calls == [["python developer"]]
+    assert reopened.stats()["vectors"] == 1
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from intent_router import AGENT, DIRECT, IntentRouter
+
+
+class FakeTool:
+    def __init__(self, name, result=None, error=None):
+        self.name = name
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    async def ainvoke(self, tool_input, config=None):
+        self.calls.append(tool_input["input"])
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class FakeExecutor:
+    def __init__(self, tools):
+        self.tools = tools
+        self.calls = 0
+
+    async def ainvoke(self, inputs, config=None):
+        self.calls += 1
+        return {"output": "agent answer"}
+
+
+def make_router(**tool_options):
+    tools = [
+        FakeTool("search_for_jobs", result=[], **tool_options.get("search", {})),
+        FakeTool("extract_skills_from_text", result=["docker", "python"]),
+        FakeTool("get_market_insights", result={}),
+    ]
+    return IntentRouter(executor=FakeExecutor(tools), mode="auto")
+
+
+def test_single_tool_requests_are_routed_with_their_arguments():
+    router = make_router()
+
+    search = router.resolve("Find python jobs in Pune")
+    assert search.intent == "search" and dict(search.args) == {"keywords": "python", "location": "Pune"}
+
+    skills = router.resolve("Extract the skills from this text: Python, Docker and Kubernetes on AWS")
+    assert skills.intent == "skills" and dict(skills.args) == {"text": "Python, Docker and Kubernetes on AWS"}
+
+    market = router.resolve("salary trends for data engineers")
+    assert market.intent == "market" and dict(market.args) == {"job_title": "data engineer"}
+
+
+@pytest.mark.parametrize("query, reason", [
+    ("optimize my resume for this job", "needs planning"),
+    ("find jobs like the ones above", "needs planning"),
+    ("search for python jobs and then compare them with my resume", "needs planning"),
+    ("help me prepare for an interview", "needs planning"),
+    ("hello what can you do", "ambiguous"),
+])
+def test_planning_and_open_requests_go_to_the_agent(query, reason):
+    route = make_router().resolve(query)
+    assert route.intent is None and route.reason == reason
+
+
+def test_descriptive_search_goes_to_the_agent():
+    route = make_router().resolve("find python jobs with a good work life balance")
+    assert route.intent is None
+
+
+def test_session_resume_fills_in_skills_text():
+    session = {"resume_text": "Python developer, Docker, Kubernetes"}
+    route = make_router().resolve("extract skills from my resume", session=session)
+    assert route.intent == "skills" and dict(route.args) == {"text": session["resume_text"]}
+    assert make_router().resolve("extract skills from my resume").intent is None
+
+
+def test_forced_modes():
+    router = make_router()
+    assert router.resolve("find python jobs in pune", mode=AGENT).intent is None
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(router.ainvoke("hello what can you do", {"input": "hello"}, mode=DIRECT))
+    assert rejected.value.status_code == 422
+    assert router.executor.calls == 0
+
+
+def test_direct_call_skips_the_agent_and_failures_fall_back():
+    router = make_router()
+    result = asyncio.run(router.ainvoke("extract skills: Python, Docker and Kubernetes", {"input": "x"}))
+    assert result["routed_to"] == "extract_skills_from_text" and "docker, python" in result["output"]
+    assert router.executor.calls == 0
+
+    failing = make_router(search={"error": RuntimeError("board down")})
+    result = asyncio.run(failing.ainvoke("find python jobs in pune", {"input": "x"}))
+    assert result == {"output": "agent answer", "routed_to": None}
+    assert failing.stats["fallbacks"] == 1 and failing.executor.calls == 1
@@ -0,0 +1,51 @@
+import numpy as np
+
+from apps.services.match_engine import JobMatchResumeMCP
+
+RESUME = """Jane Doe
+jane@example.com
+
+EXPERIENCE
+Built Python services with FastAPI and Docker on AWS.
+
+SKILLS
+Python, FastAPI, Docker, AWS
+"""
+FIT = {"id": "fit", "title": "Python Developer", "company": "A", "location": "Pune",
+       "description": "Python, FastAPI, Docker and AWS."}
+MISFIT = {"id": "misfit", "title": "Java Developer", "company": "B", "location": "Pune",
+          "description": "Java, Spring and Oracle."}
+
+
+def make_engine(similarity: dict):
+    """An engine whose embeddings give each job the cosine in `similarity` (by job id)."""
+    engine = JobMatchResumeMCP()
+
+    def embed(texts):
+        vectors = []
+        for text in texts:
+            job = next((job for job in (FIT, MISFIT) if job["title"] in text), None)
+            cosine = 1.0 if job is None else similarity[job["id"]]
+            vectors.append([cosine, np.sqrt(max(0.0, 1 - cosine ** 2))])
+        return np.array(vectors, dtype=np.float32)
+
+    engine.embed = embed
+    return engine
+
+
+def test_ats_fit_breaks_near_ties_in_similarity():
+    engine = make_engine({"fit": 0.50, "misfit": 0.52})
+
+    ranked = engine.rank_jobs(RESUME, [MISFIT, FIT], top_k=2)
+    assert [job["id"] for job, _, _ in ranked] == ["fit", "misfit"]
+    (_, cosine, ats_fit), (_, _, misfit_ats) = ranked
+    assert round(cosine, 2) == 0.50  # match_score stays the raw cosine
+    assert ats_fit > misfit_ats
+
+    by_similarity = engine.rank_jobs(RESUME, [MISFIT, FIT], top_k=2, ats_weight=0.0)
+    assert [job["id"] for job, _, _ in by_similarity] == ["misfit", "fit"]
+
+
+def test_similarity_still_dominates_a_clear_gap():
+    engine = make_engine({"fit": 0.20, "misfit": 0.75})
+    assert engine.rank_jobs(RESUME, [FIT, MISFIT], top_k=1)[0][0]["id"] == "misfit"
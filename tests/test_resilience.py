@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+from apps.resilience import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **overrides):
+    options = dict(window=10, min_calls=4, error_rate=0.5, slow_call_seconds=5, slow_call_rate=0.8, open_seconds=30)
+    options.update(overrides)
+    return CircuitBreaker(clock=clock, **options)
+
+
+def test_opens_on_error_rate_after_min_calls():
+    breaker = make_breaker(FakeClock())
+    for ok in (True, False, False):
+        breaker.record(ok, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED  # Below min_calls
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.counters["short_circuited"] == 1
+
+
+def test_opens_on_slow_call_rate():
+    breaker = make_breaker(FakeClock())
+    for _ in range(4):
+        breaker.record(True, 6.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_allows_one_probe_and_closes_on_success():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record(False, 0.1)
+    clock.now = 31
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record(True, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["window_calls"] == 1
+
+
+def test_failed_probe_reopens():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record(False, 0.1)
+    clock.now = 31
+    assert breaker.allow()
+    breaker.record(True, 6.0)  # A slow probe is not healthy
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.counters["opened"] == 2
+    clock.now = 40
+    assert not breaker.allow()
+
+
+class Sink:
+    """Stands in for the vector indexer and the market aggregates."""
+
+    def submit(self, jobs, first_seen=None):
+        pass
+
+    def add_jobs(self, jobs):
+        pass
+
+
+def test_long_streaming_source_is_judged_by_its_first_batch(tmp_path):
+    from apps.resilience import SourceHealth
+    from apps.services.job_search_engine import JobSearchEngine
+    from apps.services.job_store import JobStore
+
+    class SlowCrawl:
+        name = "slowcrawl"
+
+        def stream(self, keywords, location):
+            yield [{"id": "slowcrawl_1", "title": "Python Dev", "company": "A", "location": "Pune", "url": "u1"}]
+            time.sleep(0.3)  # The rest of the crawl takes longer than the slow-call threshold
+            yield [{"id": "slowcrawl_2", "title": "Data Eng", "company": "B", "location": "Pune", "url": "u2"}]
+
+    health = SourceHealth(lambda: CircuitBreaker(min_calls=1, slow_call_seconds=0.2, slow_call_rate=0.5))
+    engine = JobSearchEngine(store=JobStore(str(tmp_path / "jobs.db")), health=health, indexer=Sink(), market=Sink())
+    engine.scrapers = [SlowCrawl()]
+
+    jobs = asyncio.run(engine.search_all_platforms("python", "pune"))
+    assert {job["id"] for job in jobs} == {"slowcrawl_1", "slowcrawl_2"}
+    assert health.breaker("slowcrawl").state == CircuitBreaker.CLOSED
+
+
+def test_hedge_races_a_hung_cached_source(tmp_path, monkeypatch):
+    from apps.resilience import SourceHealth
+    from apps.scraper_cache import CachedScraper, QueryCache
+    from apps.services.job_search_engine import JobSearchEngine
+    from apps.services.job_store import JobStore
+    from config import settings
+
+    class HungOnce:
+        name = "hung"
+
+        def __init__(self):
+            self.calls = 0
+
+        def stream(self, keywords, location):
+            self.calls += 1
+            if self.calls == 1:
+                time.sleep(1.0)  # The first request hangs
+            yield [{"id": f"hung_{self.calls}", "title": "Python Dev", "company": "A", "location": "Pune", "url": "u"}]
+
+    monkeypatch.setattr(settings, "SOURCE_HEDGE_AFTER", {"hung": 0.1})
+    health = SourceHealth(lambda: CircuitBreaker(min_calls=1))
+    engine = JobSearchEngine(store=JobStore(str(tmp_path / "jobs.db")), health=health, indexer=Sink(), market=Sink())
+    source = HungOnce()
+    engine.scrapers = [CachedScraper(source, QueryCache(ttl=60, stale_ttl=60))]
+
+    start = time.monotonic()
+    jobs = asyncio.run(engine.search_all_platforms("python", "pune"))
+    assert time.monotonic() - start < 0.8  # Answered by the hedge, not after the hung request
+    assert [job["id"] for job in jobs] == ["hung_2"]
+    assert source.calls == 2
+    assert health.breaker("hung").counters["hedges"] == 1
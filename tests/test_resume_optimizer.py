@@ -0,0 +1,26 @@
+import asyncio
+
+from apps.services.resume_optimizer import ResumeOptimizer
+
+
+class FakeSkills:
+    def __init__(self, resume_skills, job_skills):
+        self.found = [resume_skills, job_skills]
+
+    async def extract_many(self, texts):
+        return self.found
+
+
+class FakeGenerator:
+    async def tailor(self, resume_text, job, matched_skills):
+        return {"summary": "", "experience": []}
+
+
+def test_skills_differing_only_in_case_are_listed_once():
+    skills = FakeSkills({"python", "Docker", "docker", "SQL"}, {"Python", "AWS"})
+    optimizer = ResumeOptimizer(generator=FakeGenerator(), skills=skills)
+
+    result = asyncio.run(optimizer.optimize_resume_for_job("resume", {"description": "job"}))
+
+    assert result["optimized_resume"]["skills"] == ["Python", "Docker", "SQL"]
+    assert result["improvements"]["missing_skills"] == ["AWS"]
@@ -0,0 +1,184 @@
+import threading
+import time
+
+from apps.scraper_cache import CachedScraper, QueryCache
+
+
+class SlowScraper:
+    name = "slow"
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.calls = 0
+        self.started = threading.Event()
+
+    def search(self, keywords, location):
+        self.calls += 1
+        self.started.set()
+        time.sleep(self.delay)
+        return [{"id": f"slow_{self.calls}", "title": keywords}]
+
+    def stream(self, keywords, location):
+        self.calls += 1
+        self.started.set()
+        time.sleep(self.delay)
+        yield [{"id": "slow_a", "title": keywords}]
+        yield [{"id": "slow_b", "title": keywords}]
+
+
+def _run_concurrently(*targets):
+    results = [None] * len(targets)
+
+    def run(i, target):
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i, t)) for i, t in enumerate(targets)]
+    threads[0].start()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_get_or_fetch_coalesces_concurrent_misses():
+    cache = QueryCache(ttl=60, stale_ttl=60)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return ["job"]
+
+    results = _run_concurrently(*[lambda: cache.get_or_fetch("k", fetch)] * 5)
+    assert results == [["job"]] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_get_or_fetch_serves_stale_and_refreshes_in_background():
+    cache = QueryCache(ttl=0.05, stale_ttl=60)
+    values = iter([["old"], ["new"]])
+    cache.get_or_fetch("k", lambda: next(values))
+    time.sleep(0.1)
+
+    assert cache.get_or_fetch("k", lambda: next(values)) == ["old"]
+    deadline = time.monotonic() + 2
+    while cache.stats()["inflight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get_or_fetch("k", lambda: ["unused"]) == ["new"]
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_failed_fetch_reaches_every_waiter_and_is_not_cached():
+    cache = QueryCache(ttl=60, stale_ttl=60)
+
+    def fail():
+        time.sleep(0.1)
+        raise RuntimeError("blocked")
+
+    def call():
+        try:
+            return cache.get_or_fetch("k", fail)
+        except RuntimeError as e:
+            return str(e)
+
+    assert _run_concurrently(call, call) == ["blocked", "blocked"]
+    assert cache.get_or_fetch("k", lambda: ["ok"]) == ["ok"]
+
+
+def test_stream_coalesces_identical_searches():
+    scraper = SlowScraper()
+    cached = CachedScraper(scraper, QueryCache(ttl=60, stale_ttl=60))
+
+    def owner():
+        return [job["id"] for batch in cached.stream("python", "pune") for job in batch]
+
+    def follower():
+        scraper.started.wait()
+        return [job["id"] for batch in cached.stream("Python", "Pune") for job in batch]
+
+    assert _run_concurrently(owner, follower) == [["slow_a", "slow_b"]] * 2
+    assert scraper.calls == 1
+
+
+def test_stream_serves_stale_entry_while_refreshing():
+    scraper = SlowScraper(delay=0)
+    cache = QueryCache(ttl=0.05, stale_ttl=60)
+    cached = CachedScraper(scraper, cache)
+    assert [job["id"] for batch in cached.stream("python", "pune") for job in batch] == ["slow_a", "slow_b"]
+    time.sleep(0.1)
+
+    batches = list(cached.stream("python", "pune"))
+    assert [job["id"] for job in batches[0]] == ["slow_a", "slow_b"]
+    assert cache.stats()["stale_hits"] == 1
+    deadline = time.monotonic() + 2
+    while cache.stats()["inflight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert scraper.calls == 2  # The background refresh ran through `search`
+
+
+def test_stream_closed_early_releases_waiters_without_caching():
+    scraper = SlowScraper(delay=0)
+    cache = QueryCache(ttl=60, stale_ttl=60)
+    cached = CachedScraper(scraper, cache)
+    stream = cached.stream("python", "pune")
+    next(stream)
+    stream.close()
+
+    assert cache.stats()["inflight"] == 0
+    assert cache.stats()["entries"] == 0
+
+
+class HangingScraper:
+    """The first stream hangs until released; later ones answer right away."""
+
+    name = "hanging"
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def stream(self, keywords, location):
+        self.calls += 1
+        if self.calls == 1:
+            self.started.set()
+            self.release.wait(5)
+            yield [{"id": "late"}]
+            return
+        yield [{"id": "hedge_a"}]
+        yield [{"id": "hedge_b"}]
+
+
+def test_uncoalesced_stream_races_the_inflight_search_and_answers_its_waiters():
+    scraper = HangingScraper()
+    cache = QueryCache(ttl=60, stale_ttl=60)
+    cached = CachedScraper(scraper, cache)
+    waiter_result = []
+
+    def owner():
+        return [job["id"] for batch in cached.stream("python", "pune") for job in batch]
+
+    def waiter():
+        scraper.started.wait()
+        waiter_result.extend(job["id"] for batch in cached.stream("python", "pune") for job in batch)
+
+    owner_thread = threading.Thread(target=owner)
+    waiter_thread = threading.Thread(target=waiter)
+    owner_thread.start()
+    waiter_thread.start()
+    scraper.started.wait()
+    time.sleep(0.05)
+
+    start = time.monotonic()
+    hedged = [job["id"] for batch in cached.stream("python", "pune", coalesce=False) for job in batch]
+    waiter_thread.join(2)
+    assert time.monotonic() - start < 1
+    assert hedged == waiter_result == ["hedge_a", "hedge_b"]
+    assert cached.search("python", "pune") == [{"id": "hedge_a"}, {"id": "hedge_b"}]
+
+    scraper.release.set()  # The hung owner finishing late leaves the cached answer alone
+    owner_thread.join(2)
+    assert cached.search("python", "pune") == [{"id": "hedge_a"}, {"id": "hedge_b"}]
+    assert scraper.calls == 2 and cache.stats()["inflight"] == 0
@@ -0,0 +1,77 @@
+import hashlib
+
+import numpy as np
+
+from apps.services.embeddings import job_text
+from apps.services.job_store import JobStore, job_identity
+from apps.services.vector_index import JobIndexer, JobVectorIndex
+
+
+def fake_embed(texts):
+    return np.array([
+        np.frombuffer(hashlib.sha256(text.encode()).digest()[:32], dtype=np.uint8).astype(np.float32) + 1
+        for text in texts
+    ])
+
+
+def make_job(n, description=""):
+    return {"id": f"x_{n}", "title": f"Engineer {n}", "company": "Acme", "location": "Pune", "description": description}
+
+
+def make_indexer(tmp_path):
+    index = JobVectorIndex(path=str(tmp_path / "index.npz"), backend="ivf")
+    return JobIndexer(index, embed=fake_embed, save_interval=3600)
+
+
+def test_backfill_runs_after_incremental_submits(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.ingest("x", [make_job(n) for n in range(5)], now=100.0)
+    indexer = make_indexer(tmp_path)
+    # A search indexed only the jobs it found before anything queried the index
+    indexer.index_jobs([make_job(0)], [100.0])
+
+    indexer.ensure_built(store)
+
+    assert len(indexer.index) == 5
+    assert all(job_identity(make_job(n)) in indexer.index for n in range(5))
+
+
+def test_backfill_completes_an_index_saved_by_an_earlier_run(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.ingest("x", [make_job(n) for n in range(3)], now=100.0)
+    indexer = make_indexer(tmp_path)
+    indexer.index_jobs([make_job(0)], [100.0])
+    indexer.index.save()
+
+    restarted = make_indexer(tmp_path)
+    restarted.ensure_built(store)
+
+    assert len(restarted.index) == 3
+
+
+def test_upsert_reports_enriched_jobs_with_their_first_seen(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    new_jobs, changed = store.upsert("x", [make_job(1)], now=100.0)
+    assert new_jobs == [make_job(1)] and changed == []
+
+    _, changed = store.upsert("x", [{**make_job(1), "url": "u"}], now=200.0)
+    assert changed == []  # Nothing embedded changed
+
+    enriched = {**make_job(1), "description": "Full description from the detail page"}
+    new_jobs, changed = store.upsert("x", [enriched], now=300.0)
+    assert new_jobs == [] and changed == [(enriched, 100.0)]
+
+
+def test_reembedding_an_enriched_job_replaces_its_vector(tmp_path):
+    indexer = make_indexer(tmp_path)
+    card = make_job(1)
+    indexer.index_jobs([card], [100.0])
+    enriched = {**card, "description": "Full description from the detail page"}
+
+    indexer.submit([enriched], first_seen=[100.0])
+    indexer._executor.shutdown(wait=True)
+
+    expected = fake_embed([job_text(enriched)])[0]
+    hits = indexer.index.search(expected, k=1, max_age=60.0, now=150.0)
+    assert len(indexer.index) == 1
+    assert hits[0][0] == job_identity(card) and hits[0][1] > 0.999  # Kept its first-seen time too